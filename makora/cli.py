@@ -30,6 +30,17 @@ from .commands import (
     cli_jobs,
     cli_stop,
     cli_refcode,
+    cli_logs,
+    cli_top,
+    cli_grep,
+    cli_archive,
+    cli_sync,
+    cli_cache,
+    cli_history,
+    cli_gate,
+    cli_results,
+    cli_sweep,
+    cli_autotune,
 )
 from .web.auth import AuthError
 from .components.logo import print_header
@@ -59,9 +70,20 @@ def main() -> None:
     app.command("stop")(cli_stop)
     app.command("kernels")(cli_kernels)
     app.command("check")(cli_check)
+    app.command("sweep")(cli_sweep)
     app.command("refcode")(cli_refcode)
+    app.command("logs")(cli_logs)
+    app.command("top")(cli_top)
+    app.command("grep")(cli_grep)
+    app.command("archive")(cli_archive)
+    app.command("sync")(cli_sync)
+    app.command("cache")(cli_cache)
+    app.command("history")(cli_history)
     app.command("profile")(cli_profile)
     app.command("evaluate")(cli_evaluate)
+    app.command("results")(cli_results)
+    app.command("gate")(cli_gate)
+    app.command("autotune")(cli_autotune)
     app.command("expert-generate")(cli_expert_generate)
     app.command("document-search")(cli_document_search)
     app.command("install")(cli_install)
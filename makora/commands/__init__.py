@@ -26,6 +26,17 @@ from .install import cli_install
 from .profile import cli_profile
 from .expert_generate import cli_expert_generate
 from .document_search import cli_document_search
+from .logs import cli_logs
+from .top import cli_top
+from .grep import cli_grep
+from .archive import cli_archive
+from .sync import cli_sync
+from .cache import cli_cache
+from .history import cli_history
+from .gate import cli_gate
+from .results import cli_results
+from .sweep import cli_sweep
+from .autotune import cli_autotune
 
 
 __all__ = [
@@ -43,4 +54,15 @@ __all__ = [
     "cli_expert_generate",
     "cli_document_search",
     "cli_install",
+    "cli_logs",
+    "cli_top",
+    "cli_grep",
+    "cli_archive",
+    "cli_sync",
+    "cli_cache",
+    "cli_history",
+    "cli_gate",
+    "cli_results",
+    "cli_sweep",
+    "cli_autotune",
 ]
@@ -0,0 +1,128 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+import itertools as itr
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from ..utils import get_rich_console
+from ..web.conn import open_connection
+from ..web.auth import get_current_credentials
+from ..web.sessions import (
+    get_attempt_commands,
+    get_attempt_logs,
+    get_kernel_details,
+    get_session,
+    get_session_kernel_summaries,
+    get_user_sessions,
+    resolve_session,
+)
+from ..models.openapi import AgentLogEntryOut, CommandOut, KernelEvaluationDetails
+from ..models.internal import TERMINAL_STATUSES
+from ..store.archive import ArchiveWriter
+from ..components.spinner import show_spinner
+from .logs import LogCursor, fetch_new_entries
+
+
+async def cli_archive_async(session_id: str, output: Path | None, concurrency: int, url: str | None = None) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    console = get_rich_console()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with open_connection(url) as conn:
+        sessions = await get_user_sessions(conn)
+        match = await resolve_session(sessions, session_id)
+
+        if not match:
+            raise SystemExit(f"No session found matching '{session_id}'")
+
+        sid = str(match.id)
+
+        async def fetch_details(kernel_id: str) -> KernelEvaluationDetails:
+            async with semaphore:
+                return await get_kernel_details(conn, sid, kernel_id)
+
+        async def fetch_logs(attempt_id: str) -> list[AgentLogEntryOut]:
+            async def fetch_page(offset: int) -> tuple[list[AgentLogEntryOut], int]:
+                async with semaphore:
+                    page = await get_attempt_logs(conn, sid, attempt_id, offset=offset)
+                return page.items, page.total
+
+            return await fetch_new_entries(fetch_page, LogCursor())
+
+        async def fetch_commands(attempt_id: str) -> list[CommandOut]:
+            async def fetch_page(offset: int) -> tuple[list[CommandOut], int]:
+                async with semaphore:
+                    page = await get_attempt_commands(conn, sid, attempt_id, offset=offset)
+                return page.items, page.total
+
+            return await fetch_new_entries(fetch_page, LogCursor())
+
+        with show_spinner(f"Downloading session {sid[:8]}..."):
+            session, kernels = await asyncio.gather(get_session(conn, sid), get_session_kernel_summaries(conn, sid))
+            attempt_ids = [str(a.id) for a in session.generation_attempts]
+            details, logs, commands = await asyncio.gather(
+                asyncio.gather(*[fetch_details(str(k.id)) for k in itr.chain.from_iterable(kernels)]),
+                asyncio.gather(*[fetch_logs(aid) for aid in attempt_ids]),
+                asyncio.gather(*[fetch_commands(aid) for aid in attempt_ids]),
+            )
+
+    output = output or Path(f"{sid[:8]}.mkarch")
+    with ArchiveWriter(output) as writer:
+        writer.add_session(session)
+        writer.add_kernel_summaries(kernels)
+        for kernel in details:
+            writer.add_kernel_details(kernel)
+        for attempt, attempt_logs, attempt_commands in zip(session.generation_attempts, logs, commands):
+            writer.add_logs(attempt.id, attempt_logs)
+            writer.add_commands(attempt.id, attempt_commands)
+
+    size_kb = output.stat().st_size / 1024
+    console.print(
+        f"[green]Session archived to: {output}[/green] "
+        f"[dim]({len(details)} kernel(s), {len(attempt_ids)} attempt(s), {size_kb:.1f} KiB)[/dim]"
+    )
+    if session.status not in TERMINAL_STATUSES:
+        console.print("[yellow]The session is still running - the archive is a snapshot of its current state.[/yellow]")
+
+
+def cli_archive(
+    session_id: Annotated[str, typer.Argument(help="Session ID (or prefix).")],
+    output: Annotated[
+        Path | None,
+        typer.Option("-o", "--output", help="Archive file to write (default: <session>.mkarch)."),
+    ] = None,
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of concurrent downloads.")] = 8,
+    url: Annotated[
+        str | None,
+        typer.Option(
+            help="Overwrite the base URL used to communicate with the service. If "
+            "not provided will use the one controlled by MAKORA_URL env var. "
+            "Use `makora info` for its value."
+        ),
+    ] = None,
+) -> None:
+    """Save a session (kernels, refcode, attempts, timings and logs) to a single compressed archive.
+
+    The archive can be passed instead of a session ID to `makora kernels`, `makora refcode`
+    and `makora logs`, which then read it without contacting the service.
+    """
+    asyncio.run(cli_archive_async(session_id, output, concurrency, url))
@@ -0,0 +1,398 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import math
+import random
+import asyncio
+import statistics
+from enum import Enum
+from pathlib import Path
+from typing import Annotated, Any
+
+import typer
+import yaml
+from pydantic import BaseModel
+from rich.syntax import Syntax
+
+from ..utils import get_rich_console
+from ..templates import canonical_code, check_expression, format_params, parameter_grid, unique_variants
+from ..models.openapi import KernelEvaluationStatus, Unit
+from ..models.internal import TargetDevice
+from ..store.history import get_performance_history, history_guard
+from ..store.kernels import atomic_write_bytes, hash_code
+from ..web.auth import ensure_authenticated, get_current_credentials
+from ..web.conn import Connection, open_connection
+from ..web.errors import describe_error
+from ..web.evaluation import EvaluationRun, evaluate_kernel
+from ..components.spinner import show_spinner
+from ..components.strings import create_styled_table, format_device, format_speedup, format_time
+from .evaluate import describe_run_error
+
+
+class SearchStrategy(Enum):
+    grid = "grid"
+    random = "random"
+    halving = "halving"
+
+
+class ConfigResult(BaseModel):
+    values: dict[str, str]
+    speedups: list[float] = []
+    times: list[float] = []
+    unit: Unit | None = None
+    error: str | None = None
+    #: Last round of successive halving the configuration took part in
+    rung: int = 0
+
+    @property
+    def speedup(self) -> float | None:
+        return statistics.median(self.speedups) if self.speedups else None
+
+    @property
+    def optimized_time(self) -> float | None:
+        return statistics.median(self.times) if self.times else None
+
+
+class AutotuneState(BaseModel):
+    reference_hash: str
+    template_hash: str
+    device: str
+    #: Results by hash of the canonical code of each configuration
+    configs: dict[str, ConfigResult] = {}
+
+
+def load_grid(path: Path) -> dict[str, list[str]]:
+    """Read a YAML mapping of parameter names to their values.
+
+    Strings are Python expressions, so that values such as `tl.float16` can be given,
+    other values are used as they are.
+    """
+    data: Any = yaml.safe_load(path.read_text())
+    if not isinstance(data, dict) or not data:
+        raise ValueError(f"{path} has to map parameter names to lists of values")
+
+    grid: dict[str, list[str]] = {}
+    for name, values in data.items():
+        if not isinstance(name, str) or not name.isidentifier():
+            raise ValueError(f"'{name}' is not a valid parameter name")
+        if not isinstance(values, list):
+            values = [values]
+        if not values:
+            raise ValueError(f"No values given for {name}")
+        grid[name] = [check_expression(v) if isinstance(v, str) else repr(v) for v in values]
+    return grid
+
+
+def load_state(path: Path, reference_hash: str, template_hash: str, device: TargetDevice) -> AutotuneState | None:
+    """Saved state of an earlier search of the same template, reference and device, if there is one."""
+    if not path.exists():
+        return None
+    try:
+        state = AutotuneState.model_validate_json(path.read_bytes())
+    except ValueError:
+        return None
+    if (state.reference_hash, state.template_hash, state.device) != (reference_hash, template_hash, device.value):
+        return None
+    # Failures might be transient, configurations which never succeeded are tried again
+    for config in state.configs.values():
+        config.error = None
+    return state
+
+
+class Autotuner:
+    """Evaluates configurations of a template, saving every result as soon as it is known."""
+
+    def __init__(
+        self,
+        conn: Connection,
+        reference_code: str,
+        template_name: str,
+        state: AutotuneState,
+        state_path: Path,
+        device: TargetDevice,
+        concurrency: int,
+    ) -> None:
+        self.conn = conn
+        self.reference_code = reference_code
+        self.template_name = template_name
+        self.state = state
+        self.state_path = state_path
+        self.device = device
+        self.semaphore = asyncio.Semaphore(concurrency)
+        #: Number of evaluations submitted, not taken from the saved state
+        self.evaluations = 0
+
+    def save(self) -> None:
+        atomic_write_bytes(self.state_path, self.state.model_dump_json(indent=2).encode("utf-8"))
+
+    async def evaluate(self, key: str, code: str) -> None:
+        config = self.state.configs[key]
+        name = f"{self.template_name} [{format_params(config.values)}]"
+        async with self.semaphore:
+            self.evaluations += 1
+            try:
+                details = await evaluate_kernel(self.conn, self.reference_code, code, self.device, name)
+            except Exception as e:
+                error = describe_error(e)
+            else:
+                evaluation = details.evaluation
+                if evaluation is not None and evaluation.status == KernelEvaluationStatus.COMPLETED:
+                    with history_guard():
+                        get_performance_history().record_evaluation(
+                            evaluation, self.reference_code, code, name, self.device
+                        )
+                    if evaluation.speedup is not None:
+                        config.speedups.append(evaluation.speedup)
+                    if evaluation.optimized_time is not None:
+                        config.times.append(evaluation.optimized_time)
+                        config.unit = evaluation.optimized_time_unit
+                    self.save()
+                    return
+                error = describe_run_error([EvaluationRun(0, evaluation)])
+
+        # Failed repetitions of a configuration which worked before are not a reason to drop it
+        if not config.speedups:
+            config.error = error
+            self.save()
+
+    async def ensure_runs(self, codes: dict[str, str], runs: int, rung: int = 0) -> None:
+        """Evaluate configurations until each has ``runs`` results, skipping those which failed."""
+        pending = []
+        for key, code in codes.items():
+            config = self.state.configs[key]
+            config.rung = max(config.rung, rung)
+            if config.error is None:
+                pending.extend([(key, code)] * max(0, runs - len(config.speedups)))
+        await asyncio.gather(*(self.evaluate(key, code) for key, code in pending))
+
+    def ranking(self, keys: list[str]) -> list[str]:
+        """Successful configurations, those reaching later rounds first, then by their median speedup."""
+        ranked = [key for key in keys if self.state.configs[key].speedup is not None]
+        return sorted(
+            ranked, key=lambda k: (self.state.configs[k].rung, self.state.configs[k].speedup or 0.0), reverse=True
+        )
+
+    async def search(self, codes: dict[str, str], strategy: SearchStrategy, eta: int) -> list[str]:
+        keys = list(codes)
+        if strategy != SearchStrategy.halving:
+            await self.ensure_runs(codes, 1)
+            return self.ranking(keys)
+
+        # Each round evaluates the best 1/eta of the previous one eta times as often
+        pool, rung = keys, 0
+        while True:
+            await self.ensure_runs({key: codes[key] for key in pool}, eta**rung, rung)
+            ranked = self.ranking(pool)
+            if len(ranked) <= 1:
+                break
+            pool = ranked[: max(1, math.ceil(len(ranked) / eta))]
+            rung += 1
+            if len(pool) == 1:
+                self.state.configs[pool[0]].rung = rung
+                break
+        return self.ranking(keys)
+
+
+def print_autotune(state: AutotuneState, ranked: list[str], names: list[str], device: TargetDevice, top: int) -> None:
+    console = get_rich_console()
+
+    table = create_styled_table(f"Best configurations on {format_device(device)}")
+    table.add_column("#", justify="right", style="dim")
+    for name in names:
+        table.add_column(name, style="cyan", justify="right", no_wrap=True)
+    table.add_column("Solution", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Runs", justify="right")
+
+    for rank, key in enumerate(ranked[:top], start=1):
+        config = state.configs[key]
+        table.add_row(
+            str(rank),
+            *(config.values.get(name, "-") for name in names),
+            format_time(config.optimized_time, config.unit),
+            format_speedup(config.speedup),
+            str(len(config.speedups)),
+        )
+    console.print(table)
+
+
+async def cli_autotune_async(
+    template_file: Path,
+    reference_file: Path,
+    grid_file: Path,
+    device: TargetDevice,
+    strategy: SearchStrategy,
+    samples: int,
+    eta: int,
+    seed: int,
+    concurrency: int,
+    top: int,
+    state_file: Path | None,
+    restart: bool,
+    output: Path | None,
+    url: str | None = None,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    console = get_rich_console()
+    for path in (template_file, reference_file, grid_file):
+        if not path.exists():
+            typer.echo(f"Error: File not found: {path}", err=True)
+            raise typer.Exit(1)
+
+    template = template_file.read_text()
+    reference_code = reference_file.read_text()
+    try:
+        grid = load_grid(grid_file)
+        combinations = parameter_grid(grid)
+        variants = unique_variants(template, combinations)
+    except (ValueError, SyntaxError, yaml.YAMLError) as e:
+        raise typer.BadParameter(str(e), param_hint="grid") from e
+
+    distinct = len(variants)
+    if strategy == SearchStrategy.random or (strategy == SearchStrategy.halving and samples):
+        # Seeded, so that a resumed search samples the same configurations
+        variants = random.Random(seed).sample(variants, min(samples or len(variants), len(variants)))
+
+    state_path = state_file or template_file.with_name(f"{template_file.stem}.autotune.json")
+    reference_hash, template_hash = hash_code(reference_code), hash_code(template)
+    state = None if restart else load_state(state_path, reference_hash, template_hash, device)
+    resumed = state is not None and bool(state.configs)
+    if state is None:
+        state = AutotuneState(reference_hash=reference_hash, template_hash=template_hash, device=device.value)
+
+    codes: dict[str, str] = {}
+    for values, code in variants:
+        key = hash_code(canonical_code(code))
+        codes[key] = code
+        state.configs.setdefault(key, ConfigResult(values=values))
+
+    summary = f"{len(combinations)} configurations, {distinct} distinct"
+    if len(codes) < distinct:
+        summary += f", {len(codes)} sampled"
+    if resumed:
+        summary += f", resuming from {state_path}"
+    console.print(f"[dim]{summary}[/dim]")
+
+    try:
+        async with open_connection(url) as conn:
+            await ensure_authenticated(conn)
+            tuner = Autotuner(conn, reference_code, template_file.name, state, state_path, device, concurrency)
+            with show_spinner(f"Autotuning {template_file.name} on {format_device(device)}..."):
+                ranked = await tuner.search(codes, strategy, eta)
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+    tuner.save()
+
+    failed = sum(1 for key in codes if state.configs[key].error is not None)
+    console.print(f"[dim]{tuner.evaluations} evaluations submitted, {failed} configurations failed.[/dim]")
+    if not ranked:
+        errors = {state.configs[key].error for key in codes}
+        typer.echo(f"Error: No configuration could be evaluated: {'; '.join(e for e in errors if e)}", err=True)
+        raise typer.Exit(1)
+
+    print_autotune(state, ranked, list(grid), device, top)
+
+    best = state.configs[ranked[0]]
+    console.print()
+    console.print(f"[bold]Best configuration:[/bold] [cyan]{format_params(best.values)}[/cyan]")
+    runs = f"median of {len(best.speedups)} runs" if len(best.speedups) > 1 else "1 run"
+    console.print(f"  Speedup: {format_speedup(best.speedup)} ({runs})")
+    if output is not None:
+        atomic_write_bytes(output, codes[ranked[0]].encode("utf-8"))
+        console.print(f"[green]Best kernel saved to: {output}[/green]")
+    else:
+        console.print()
+        console.print(Syntax(codes[ranked[0]], "python", theme="monokai", line_numbers=False, word_wrap=False))
+
+
+def cli_autotune(
+    template_file: Annotated[
+        Path, typer.Argument(help="Path to the kernel whose top-level assignments are the tunables.")
+    ],
+    reference: Annotated[Path, typer.Option("-r", "--reference", help="Path to file containing reference code.")],
+    grid: Annotated[Path, typer.Option(help="YAML file mapping tunable names to lists of values.")],
+    device: Annotated[TargetDevice, typer.Option("-d", "--device", help="Device type.")],
+    search: Annotated[SearchStrategy, typer.Option(help="How configurations are chosen and evaluated.")] = (
+        SearchStrategy.grid
+    ),
+    samples: Annotated[
+        int,
+        typer.Option(
+            min=0, help="Number of configurations sampled by the random search, and by successive halving if not 0."
+        ),
+    ] = 16,
+    eta: Annotated[
+        int,
+        typer.Option(
+            min=2,
+            help="Successive halving keeps the best 1/eta of the configurations after every round "
+            "and evaluates them eta times as often.",
+        ),
+    ] = 3,
+    seed: Annotated[int, typer.Option(help="Seed of the random sampling of configurations.")] = 0,
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of evaluations running concurrently.")] = 4,
+    top: Annotated[int, typer.Option(min=1, help="Number of best configurations shown.")] = 10,
+    state: Annotated[
+        Path | None,
+        typer.Option(
+            help="File keeping the results of the search so that it can be resumed, "
+            "by default <template>.autotune.json next to the template."
+        ),
+    ] = None,
+    restart: Annotated[bool, typer.Option("--restart", help="Ignore the results of an earlier search.")] = False,
+    output: Annotated[
+        Path | None, typer.Option("-o", "--output", help="Save the code of the best configuration to a file.")
+    ] = None,
+    url: Annotated[
+        str | None,
+        typer.Option(
+            help="Overwrite the base URL used to communicate with the service. If "
+            "not provided will use the one controlled by MAKORA_URL env var. "
+            "Use `makora info` for its value."
+        ),
+    ] = None,
+) -> None:
+    """Find the fastest values of a kernel's tunables, such as block sizes, warps or stages.
+
+    Configurations are rendered by replacing the values of top-level assignments of the template,
+    such as `BLOCK_SIZE = 64`, and configurations rendering to equivalent code are evaluated once.
+    The grid search evaluates every configuration, the random search a sample of them, and
+    successive halving spends more evaluations on the most promising ones.
+
+    Every result is saved as soon as it is known, running the same command again resumes an
+    interrupted search without repeating evaluations.
+    """
+    asyncio.run(
+        cli_autotune_async(
+            template_file=template_file,
+            reference_file=reference,
+            grid_file=grid,
+            device=device,
+            strategy=search,
+            samples=samples,
+            eta=eta,
+            seed=seed,
+            concurrency=concurrency,
+            top=top,
+            state_file=state,
+            restart=restart,
+            output=output,
+            url=url,
+        )
+    )
@@ -0,0 +1,99 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from enum import Enum
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from ..utils import get_rich_console
+from ..store.cache import get_max_cache_bytes, get_resource_cache
+from ..store.kernels import get_kernel_store
+from ..components.strings import create_styled_table, format_size
+
+
+class CacheAction(Enum):
+    stats = "stats"
+    prune = "prune"
+    clear = "clear"
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def print_cache_stats() -> None:
+    console = get_rich_console()
+    cache = get_resource_cache()
+    stats = cache.stats()
+
+    table = create_styled_table("Cache")
+    table.add_column("Namespace", style="cyan", no_wrap=True)
+    table.add_column("Entries", justify="right")
+    table.add_column("Immutable", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Hit rate", justify="right")
+
+    for ns in stats:
+        hit_rate = ns.hit_rate
+        table.add_row(
+            ns.namespace,
+            str(ns.entries),
+            str(ns.immutable),
+            format_size(ns.size),
+            str(ns.hits),
+            str(ns.misses),
+            f"{hit_rate:.0%}" if hit_rate is not None else "-",
+        )
+
+    if stats:
+        console.print(table)
+    else:
+        console.print("[dim]The cache is empty.[/dim]")
+
+    console.print(
+        f"Total: {format_size(cache.total_size())} of {format_size(get_max_cache_bytes())} [dim]({cache.path})[/dim]"
+    )
+    store = get_kernel_store()
+    console.print(
+        f"Kernel store: {format_size(_dir_size(store.root))} [dim]({store.root}, not counted toward MAKORA_CACHE_MAX_MB)[/dim]"
+    )
+
+
+def cli_cache(
+    action: Annotated[CacheAction, typer.Argument(help="What to do with the local cache.")] = CacheAction.stats,
+    namespace: Annotated[str | None, typer.Option(help="Only clear entries of the given namespace.")] = None,
+    max_age: Annotated[
+        float,
+        typer.Option(min=0.0, help="With prune: remove non-immutable entries fetched more than this many hours ago."),
+    ] = 24.0,
+) -> None:
+    """Show statistics of the local cache, prune expired entries or clear it.
+
+    Only cached service responses count toward MAKORA_CACHE_MAX_MB, sessions mirrored by sync are never evicted.
+    """
+    console = get_rich_console()
+
+    if action == CacheAction.stats:
+        print_cache_stats()
+    elif action == CacheAction.prune:
+        removed, freed = get_resource_cache().prune(max_age * 3600, get_max_cache_bytes())
+        console.print(f"[green]Pruned {removed} entries ({format_size(freed)}).[/green]")
+    else:
+        removed, freed = get_resource_cache().clear(namespace)
+        console.print(f"[green]Removed {removed} entries ({format_size(freed)}).[/green]")
@@ -35,6 +35,7 @@ async def cli_check_async(
     url: str | None = None,
     fix: bool = False,
     interactive: bool = True,
+    use_cache: bool = True,
 ) -> None:
     console = get_rich_console()
     print_mini_header(f"Check: {file.name}")
@@ -58,6 +59,7 @@ async def cli_check_async(
             interactive=interactive,
             hint_command=hint_command,
             console=console,
+            use_cache=use_cache,
         )
 
         if validation_result is None:
@@ -101,6 +103,9 @@ def cli_check(
         ),
     ] = False,
     alone: Annotated[bool, typer.Option(help="Disables any interactivity.")] = False,
+    no_cache: Annotated[
+        bool, typer.Option("--no-cache", help="Always validate again, even if identical code was validated recently.")
+    ] = False,
 ) -> None:
     """Evaluates the given reference catching possible errors."""
     asyncio.run(
@@ -110,5 +115,6 @@ def cli_check(
             url=url,
             fix=fix,
             interactive=(not alone and sys.stdin.isatty()),
+            use_cache=not no_cache,
         )
     )
@@ -14,63 +14,81 @@
 
 
 import asyncio
+import statistics
+from enum import Enum
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, NamedTuple, TYPE_CHECKING
 
 import typer
 
-from ..models.openapi import EvaluateKernelRequest, KernelEvaluationDetails, KernelEvaluationStatus, Unit
+from ..utils import get_rich_console
+from ..models.openapi import (
+    BaselineBenchmarkResult,
+    EvalRefMode,
+    KernelEvaluation,
+    KernelEvaluationStatus,
+    TimingStats,
+    Unit,
+)
 from ..models.internal import TargetDevice
+from ..store.history import get_performance_history, history_guard
+from ..store.detached import JobKind
 from ..web.auth import ensure_authenticated, get_current_credentials
-from ..web.conn import open_connection
+from ..web.conn import Connection, open_connection
+from ..web.errors import describe_error
+from ..web.evaluation import (
+    EVALUATION_CACHE_MAX_AGE,
+    EvaluationRun,
+    evaluate_kernel,
+    evaluate_repeatedly,
+    get_cached_baselines,
+    get_cached_evaluation,
+)
+from ..components.spinner import show_spinner
+from ..components.results import ShapeOrder, print_shape_speedups
+from ..components.detached import submit_detached_jobs
+from ..components.strings import (
+    create_styled_table,
+    format_device,
+    format_ref_mode,
+    format_speedup,
+    format_speedup_estimate,
+    format_time,
+    format_time_ago,
+)
 
+if TYPE_CHECKING:
+    from ..stats import AggregatedSpeedup, SpeedupEstimate
 
-async def cli_evaluate_async(
-    reference_file: Path,
-    optimized_file: Path,
-    device: TargetDevice,
-    url: str | None = None,
-) -> None:
-    creds = get_current_credentials()
-    if creds is None:
-        raise SystemExit("You need to login first with 'makora login'")
 
-    if not reference_file.exists():
-        typer.echo(f"Error: File not found: {reference_file}", err=True)
-        raise typer.Exit(1)
-    if not optimized_file.exists():
-        typer.echo(f"Error: File not found: {optimized_file}", err=True)
-        raise typer.Exit(1)
+def _extract_error(evaluation: KernelEvaluation | None) -> str:
+    if evaluation is None:
+        return "No evaluation details returned by server."
+    for result in (
+        evaluation.orchestration_result,
+        evaluation.compilation_result,
+        evaluation.preparation_result,
+        evaluation.validation_result,
+        evaluation.benchmarking_result,
+    ):
+        if result is not None and result.error is not None:
+            return result.error.message
+    return "Evaluation did not complete successfully."
 
-    hardware_provider, hardware_model = device.to_api_device().split(":")
 
-    request = EvaluateKernelRequest(
-        reference_code=reference_file.read_text(),
-        optimized_code=optimized_file.read_text(),
-        name=optimized_file.name,
-        origin="user",
-        extras={},
-    )
+def _is_successful(evaluation: KernelEvaluation | None) -> bool:
+    return evaluation is not None and evaluation.status == KernelEvaluationStatus.COMPLETED
 
-    typer.echo("Evaluating code...")
 
-    try:
-        async with open_connection(url) as conn:
-            await ensure_authenticated(conn)
-            response = await conn.post(
-                f"kernel-evaluation/evaluation/{hardware_provider}/{hardware_model}",
-                request,
-                reply_format=KernelEvaluationDetails,
-                token=creds.token,
-            )
-    except Exception as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1) from e
+def _format_speedup(evaluation: KernelEvaluation) -> str:
+    from ..stats import estimate_evaluation_speedup
+
+    estimate = estimate_evaluation_speedup(evaluation)
+    return format_speedup_estimate(estimate) if estimate is not None else format_speedup(evaluation.speedup)
 
-    evaluation = response.evaluation
-    if evaluation is None or evaluation.status != KernelEvaluationStatus.COMPLETED:
-        typer.echo("\n✗ Evaluation failed!", err=True)
-        raise typer.Exit(1)
+
+def print_evaluation(evaluation: KernelEvaluation) -> None:
+    from ..stats import estimate_evaluation_speedup
 
     optimized_time = evaluation.optimized_time
     reference_time = evaluation.reference_time
@@ -86,14 +104,693 @@ async def cli_evaluate_async(
         typer.echo(f"  Reference time: {reference_time:.6f} {unit_value}")
     if optimized_time is not None:
         typer.echo(f"  Solution time:  {optimized_time:.6f} {unit_value}")
-    if speedup is not None:
+    estimate = estimate_evaluation_speedup(evaluation)
+    if estimate is not None:
+        typer.echo(f"  Speedup:        {format_speedup_estimate(estimate, color=False)}")
+    elif speedup is not None:
         typer.echo(f"  Speedup:        {speedup:.2f}x")
 
 
+def describe_run_error(runs: list[EvaluationRun]) -> str:
+    for run in runs:
+        if run.error is not None:
+            return describe_error(run.error)
+    return _extract_error(runs[0].evaluation if runs else None)
+
+
+def _run_times(run: EvaluationRun) -> tuple[float | None, float | None]:
+    evaluation = run.evaluation
+    assert evaluation is not None
+    return evaluation.reference_time, evaluation.optimized_time
+
+
+def _cached_note(evaluation: KernelEvaluation) -> str:
+    measured_at = evaluation.finished_at or evaluation.created_at
+    when = f" from {format_time_ago(measured_at)}" if measured_at is not None else ""
+    return f"(cached result{when}, use --no-cache to evaluate again)"
+
+
+def _median(values: list[float | None]) -> float | None:
+    present = [v for v in values if v is not None]
+    return statistics.median(present) if present else None
+
+
+def aggregate_evaluation_runs(runs: list[EvaluationRun], warmup: int) -> "AggregatedSpeedup | None":
+    from ..stats import aggregate_runs, evaluation_timings
+
+    timings = [
+        evaluation_timings(run.evaluation) if run.evaluation is not None and run.successful else None for run in runs
+    ]
+    return aggregate_runs(timings, warmup)
+
+
+def print_device_comparison(results: dict[TargetDevice, list[EvaluationRun]], warmup: int = 0) -> None:
+    console = get_rich_console()
+    repeated = any(len(runs) > 1 for runs in results.values())
+
+    table = create_styled_table("Benchmark Results")
+    table.add_column("Device", style="cyan", no_wrap=True)
+    table.add_column("Reference", justify="right")
+    table.add_column("Solution", justify="right")
+    table.add_column("Speedup", justify="right")
+    if repeated:
+        table.add_column("Runs", justify="right")
+    table.add_column("Error", style="red")
+
+    for device, runs in results.items():
+        successful = [run for run in runs if run.successful]
+        label = format_device(device)
+        if any(run.cached for run in runs):
+            label += " [dim](cached)[/dim]"
+        if not successful:
+            table.add_row(label, "-", "-", "-", *(["-"] if repeated else []), describe_run_error(runs))
+            continue
+
+        unit = successful[0].evaluation.optimized_time_unit if successful[0].evaluation else None
+        if not repeated:
+            evaluation = successful[0].evaluation
+            assert evaluation is not None
+            table.add_row(
+                label,
+                format_time(evaluation.reference_time, evaluation.reference_time_unit),
+                format_time(evaluation.optimized_time, evaluation.optimized_time_unit),
+                _format_speedup(evaluation),
+                "",
+            )
+            continue
+
+        times = [_run_times(run) for run in successful]
+        aggregated = aggregate_evaluation_runs(runs, warmup)
+        if aggregated is not None:
+            speedup = format_speedup_estimate(aggregated.estimate)
+            used = len(aggregated.run_speedups)
+        else:
+            speedup = format_speedup(_median([run.evaluation.speedup for run in successful if run.evaluation]))
+            used = len(successful)
+        table.add_row(
+            label,
+            format_time(_median([t[0] for t in times]), unit),
+            format_time(_median([t[1] for t in times]), unit),
+            speedup,
+            f"{used}/{len(runs)}",
+            "",
+        )
+
+    console.print(table)
+
+
+def print_repeated_evaluation(runs: list[EvaluationRun], warmup: int) -> None:
+    successful = [run for run in runs if run.successful]
+    first = successful[0].evaluation
+    assert first is not None
+    unit = first.optimized_time_unit or first.reference_time_unit or Unit.ms
+    times = [_run_times(run) for run in successful]
+    reference_time = _median([t[0] for t in times])
+    optimized_time = _median([t[1] for t in times])
+    aggregated = aggregate_evaluation_runs(runs, warmup)
+
+    if aggregated is not None:
+        typer.echo(
+            f"\n✓ Evaluation successful! ({len(aggregated.run_speedups)} of {len(runs)} runs pooled, "
+            f"discarded: {aggregated.warmup} warmup, {aggregated.outliers} outliers, {aggregated.failed} failed)"
+        )
+    else:
+        typer.echo(f"\n✓ Evaluation successful! ({len(successful)} of {len(runs)} runs, no timing samples to pool)")
+
+    typer.echo("\nBenchmark Results:")
+    if reference_time is not None:
+        typer.echo(f"  Reference time: {reference_time:.6f} {unit.value}")
+    if optimized_time is not None:
+        typer.echo(f"  Solution time:  {optimized_time:.6f} {unit.value}")
+
+    if aggregated is not None:
+        speedups = aggregated.run_speedups
+        typer.echo(f"  Speedup:        {format_speedup_estimate(aggregated.estimate, color=False)}")
+        typer.echo(
+            f"  Run speedups:   median {statistics.median(speedups):.2f}x, "
+            f"range {min(speedups):.2f}x–{max(speedups):.2f}x, CV {aggregated.run_cv:.1%}"
+        )
+    else:
+        speedup = _median([run.evaluation.speedup for run in successful if run.evaluation])
+        if speedup is not None:
+            typer.echo(f"  Speedup:        {speedup:.2f}x (median)")
+
+
+def print_shape_breakdown(runs: list[EvaluationRun], order: ShapeOrder = ShapeOrder.shape) -> None:
+    """Per-shape speedups of multi-shape benchmarks, the median over all runs which benchmarked the kernel itself."""
+    from ..stats import shape_timings
+
+    results = [
+        run.evaluation.benchmarking_result
+        for run in runs
+        if run.successful and run.evaluation and run.evaluation.benchmarking_result
+    ]
+    shapes = shape_timings(results)
+    if len(shapes) > 1:
+        typer.echo()
+        print_shape_speedups(shapes, order)
+
+
+class Baseline(Enum):
+    eager = "eager"
+    compiled = "compiled"
+    reduce_overhead = "reduce-overhead"
+    max_autotune = "max-autotune"
+    max_autotune_no_cudagraphs = "max-autotune-no-cudagraphs"
+
+    @property
+    def mode(self) -> EvalRefMode:
+        return EvalRefMode[self.name.upper()]
+
+
+def parse_baselines(value: str) -> list[EvalRefMode]:
+    modes = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        try:
+            modes.append(Baseline(name).mode)
+        except ValueError:
+            valid = ", ".join(baseline.value for baseline in Baseline)
+            raise typer.BadParameter(f"Unknown baseline '{name}', use any of {valid}", param_hint="baselines") from None
+    if not modes:
+        raise typer.BadParameter("No baselines given", param_hint="baselines")
+    return list(dict.fromkeys(modes))
+
+
+class BaselineComparison(NamedTuple):
+    #: Mean over shapes of the median time of the reference in that mode
+    reference_time: float | None
+    unit: Unit | None
+    speedup: float | None
+    estimate: "SpeedupEstimate | None"
+    #: Whether the timings of the reference come from an earlier evaluation
+    cached: bool
+
+
+def _median_time(timings: list[TimingStats]) -> float:
+    return statistics.mean(stats.median for stats in timings)
+
+
+def _median_speedup(reference: list[TimingStats], optimized: list[TimingStats]) -> float:
+    from ..stats import geometric_mean
+
+    return geometric_mean([ref.median / opt.median for ref, opt in zip(reference, optimized)])
+
+
+def compare_baseline(
+    runs: list[EvaluationRun],
+    mode: EvalRefMode,
+    cached: dict[EvalRefMode, BaselineBenchmarkResult],
+    warmup: int = 0,
+) -> BaselineComparison | None:
+    """Speedup of the kernel over the reference in the given mode, ``None`` if it was never benchmarked in it.
+
+    The service decides which modes it benchmarks, timings of the reference measured by an
+    earlier evaluation on the same device stand in for the modes it left out. Those were
+    measured once, so they only give a point estimate against the pooled kernel timings.
+    """
+    from ..stats import aggregate_runs, pooled_speedup, reference_timings, run_timings
+
+    # Warmup runs are discarded the same way as when pooling the runs
+    warmup = min(warmup, max(len(runs) - 1, 0))
+    successful = [
+        run.evaluation.benchmarking_result
+        for run in runs[warmup:]
+        if run.successful and run.evaluation is not None and run.evaluation.benchmarking_result is not None
+    ]
+
+    pairs: list[tuple[list[TimingStats], list[TimingStats]]] = []
+    kernels: list[list[TimingStats]] = []
+    for result in successful:
+        optimized = [timing.kernel for timing in result.user_times or []]
+        kernels.append(optimized)
+        reference = reference_timings(result, mode)
+        if reference and len(reference) == len(optimized):
+            pairs.append((reference, optimized))
+
+    if pairs:
+        aggregated = aggregate_runs([run_timings(ref, opt) for ref, opt in pairs])
+        return BaselineComparison(
+            statistics.median(_median_time(ref) for ref, _ in pairs),
+            pairs[0][0][0].unit,
+            statistics.median(_median_speedup(ref, opt) for ref, opt in pairs),
+            aggregated.estimate if aggregated is not None else None,
+            False,
+        )
+
+    if mode not in cached or not cached[mode].results:
+        return None
+    reference = [timing.kernel for timing in cached[mode].results]
+    kernels = [optimized for optimized in kernels if len(optimized) == len(reference)]
+    if not kernels:
+        return None
+    speedup = pooled_speedup(reference, kernels)
+    if speedup is None:
+        speedup = statistics.median(_median_speedup(reference, optimized) for optimized in kernels)
+    return BaselineComparison(_median_time(reference), reference[0].unit, speedup, None, True)
+
+
+def _format_comparison(comparison: BaselineComparison | None) -> str:
+    if comparison is None:
+        return "[dim]not measured[/dim]"
+    if comparison.estimate is not None:
+        speedup = format_speedup_estimate(comparison.estimate)
+    else:
+        speedup = format_speedup(comparison.speedup)
+    marker = "*" if comparison.cached else ""
+    return f"{speedup}\n[dim]{format_time(comparison.reference_time, comparison.unit)}{marker}[/dim]"
+
+
+def print_baseline_matrix(
+    results: dict[TargetDevice, list[EvaluationRun]],
+    modes: list[EvalRefMode],
+    cached: dict[TargetDevice, dict[EvalRefMode, BaselineBenchmarkResult]],
+    warmup: int = 0,
+) -> None:
+    console = get_rich_console()
+
+    table = create_styled_table("Speedup vs Baselines")
+    table.add_column("Device", style="cyan", no_wrap=True)
+    for mode in modes:
+        table.add_column(f"vs {format_ref_mode(mode)}", justify="right")
+
+    from_cache = False
+    for device, runs in results.items():
+        if not any(run.successful for run in runs):
+            table.add_row(format_device(device), *(["-"] * len(modes)))
+            continue
+        comparisons = [compare_baseline(runs, mode, cached.get(device, {}), warmup) for mode in modes]
+        from_cache = from_cache or any(c is not None and c.cached for c in comparisons)
+        table.add_row(format_device(device), *(_format_comparison(c) for c in comparisons))
+
+    console.print(table)
+    if from_cache:
+        console.print(
+            "[dim]* reference time measured by an earlier evaluation of the same reference on the device[/dim]"
+        )
+
+
+class Candidate:
+    """A candidate kernel of a tournament and its successful evaluations."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.code = path.read_text()
+        self.runs: list[KernelEvaluation] = []
+        self.error: str | None = None
+        #: Whether the first run was taken from the local cache
+        self.cached = False
+
+    @property
+    def speedup(self) -> float | None:
+        speedups = [run.speedup for run in self.runs if run.speedup is not None]
+        return statistics.median(speedups) if speedups else None
+
+    @property
+    def optimized_time(self) -> float | None:
+        times = [run.optimized_time for run in self.runs if run.optimized_time is not None]
+        return statistics.median(times) if times else None
+
+
+def collect_candidates(paths: list[Path], reference_file: Path) -> list[Path]:
+    """Expand directories into the Python files they contain, skipping the reference itself."""
+    candidates: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            candidates.extend(sorted(p for p in path.glob("*.py") if p.is_file()))
+        else:
+            candidates.append(path)
+
+    reference = reference_file.resolve()
+    return list(dict.fromkeys(p for p in candidates if p.resolve() != reference))
+
+
+async def run_tournament(
+    conn: Connection,
+    reference_code: str,
+    candidates: list[Candidate],
+    device: TargetDevice,
+    concurrency: int,
+    finalists: int = 0,
+    final_rounds: int = 3,
+    cache_max_age: float | None = None,
+) -> list[Candidate]:
+    """Evaluate all candidates once, then the ``finalists`` best ones ``final_rounds`` more times.
+
+    Returns the successful candidates, best first. Finalists are ranked by the median speedup
+    of all their runs and come before the other candidates. With ``cache_max_age``, the first
+    evaluation of a candidate can be a cached one.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def evaluate(candidate: Candidate) -> None:
+        if cache_max_age is not None and not candidate.runs:
+            cached = get_cached_evaluation(reference_code, candidate.code, device, cache_max_age, conn.base_url)
+            if cached is not None and cached.evaluation is not None:
+                candidate.runs.append(cached.evaluation)
+                candidate.cached = True
+                return
+
+        async with semaphore:
+            try:
+                response = await evaluate_kernel(conn, reference_code, candidate.code, device, candidate.path.name)
+            except Exception as e:
+                error = describe_error(e)
+            else:
+                if response.evaluation is not None and _is_successful(response.evaluation):
+                    candidate.runs.append(response.evaluation)
+                    return
+                error = _extract_error(response.evaluation)
+
+        # Failed repetitions of a finalist are not a reason to disqualify it
+        if not candidate.runs:
+            candidate.error = error
+
+    def ranking(pool: list[Candidate]) -> list[Candidate]:
+        ranked = [c for c in pool if c.speedup is not None]
+        return sorted(ranked, key=lambda c: c.speedup or 0.0, reverse=True)
+
+    await asyncio.gather(*(evaluate(c) for c in candidates))
+    ranked = ranking(candidates)
+    if finalists <= 0 or final_rounds <= 0:
+        return ranked
+
+    finals = ranked[:finalists]
+    await asyncio.gather(*(evaluate(c) for c in finals for _ in range(final_rounds)))
+    return ranking(finals) + ranked[finalists:]
+
+
+def _format_runs(candidate: Candidate) -> str:
+    if not candidate.cached:
+        return str(len(candidate.runs))
+    if len(candidate.runs) == 1:
+        return "1 [dim](cached)[/dim]"
+    return f"{len(candidate.runs)} [dim](1 cached)[/dim]"
+
+
+def print_tournament(
+    ranked: list[Candidate], failed: list[Candidate], device: TargetDevice, finalists: int = 0
+) -> None:
+    console = get_rich_console()
+
+    table = create_styled_table(f"Ranking on {format_device(device)}")
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Candidate", style="cyan", no_wrap=True)
+    table.add_column("Solution", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Runs", justify="right")
+
+    for rank, candidate in enumerate(ranked, start=1):
+        if finalists and rank == finalists + 1:
+            table.add_section()
+        unit = candidate.runs[0].optimized_time_unit
+        table.add_row(
+            str(rank),
+            str(candidate.path),
+            format_time(candidate.optimized_time, unit),
+            format_speedup(candidate.speedup),
+            _format_runs(candidate),
+        )
+
+    if ranked:
+        console.print(table)
+
+    if failed:
+        failures = create_styled_table("Failed")
+        failures.add_column("Candidate", style="cyan", no_wrap=True)
+        failures.add_column("Error", style="red")
+        for candidate in failed:
+            failures.add_row(str(candidate.path), candidate.error or "-")
+        console.print(failures)
+
+
+async def cli_tournament_async(
+    reference_file: Path,
+    candidate_files: list[Path],
+    device: TargetDevice,
+    concurrency: int,
+    finalists: int,
+    final_rounds: int,
+    cache_max_age: float | None,
+    url: str | None = None,
+) -> None:
+    console = get_rich_console()
+    candidates = [Candidate(path) for path in candidate_files]
+    reference_code = reference_file.read_text()
+
+    try:
+        async with open_connection(url) as conn:
+            await ensure_authenticated(conn)
+            with show_spinner(f"Evaluating {len(candidates)} candidates on {format_device(device)}..."):
+                ranked = await run_tournament(
+                    conn, reference_code, candidates, device, concurrency, finalists, final_rounds, cache_max_age
+                )
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+    with history_guard():
+        history = get_performance_history()
+        for candidate in candidates:
+            # A cached result was recorded when it was measured
+            for evaluation in candidate.runs[1:] if candidate.cached else candidate.runs:
+                history.record_evaluation(evaluation, reference_code, candidate.code, candidate.path.name, device)
+
+    print_tournament(ranked, [c for c in candidates if not c.runs], device, finalists)
+    if not ranked:
+        raise typer.Exit(1)
+
+    if finalists:
+        console.print(
+            f"[dim]The first {min(finalists, len(ranked))} rows are ranked by the median of {final_rounds + 1} runs.[/dim]"
+        )
+
+
+async def cli_evaluate_async(
+    reference_file: Path,
+    optimized_files: list[Path],
+    devices: list[TargetDevice],
+    concurrency: int = 4,
+    finalists: int = 0,
+    final_rounds: int = 3,
+    repeat: int = 1,
+    warmup: int = 0,
+    cache_max_age: float | None = None,
+    detach: bool = False,
+    baselines: list[EvalRefMode] | None = None,
+    sort_shapes: ShapeOrder = ShapeOrder.shape,
+    url: str | None = None,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    if not reference_file.exists():
+        typer.echo(f"Error: File not found: {reference_file}", err=True)
+        raise typer.Exit(1)
+    for optimized_file in optimized_files:
+        if not optimized_file.exists():
+            typer.echo(f"Error: File not found: {optimized_file}", err=True)
+            raise typer.Exit(1)
+
+    # The same device given twice would only be evaluated twice
+    devices = list(dict.fromkeys(devices))
+    candidates = collect_candidates(optimized_files, reference_file)
+    if not candidates:
+        typer.echo("Error: No candidate files to evaluate", err=True)
+        raise typer.Exit(1)
+
+    if detach and (len(candidates) > 1 or repeat > 1):
+        raise typer.BadParameter("Only a single candidate evaluated once can be detached", param_hint="detach")
+
+    if baselines and (len(candidates) > 1 or detach):
+        raise typer.BadParameter(
+            "Baselines can only be compared for a single candidate evaluated right away", param_hint="baselines"
+        )
+
+    if len(candidates) > 1:
+        if repeat > 1:
+            raise typer.BadParameter(
+                "Several candidates cannot be repeatedly evaluated, use --finalists instead", param_hint="repeat"
+            )
+        if len(devices) > 1:
+            raise typer.BadParameter("Several candidates can only be evaluated on a single device", param_hint="device")
+        await cli_tournament_async(
+            reference_file, candidates, devices[0], concurrency, finalists, final_rounds, cache_max_age, url
+        )
+        return
+
+    (optimized_file,) = candidates
+    reference_code = reference_file.read_text()
+    optimized_code = optimized_file.read_text()
+    if detach:
+        submit_detached_jobs(JobKind.evaluate, devices, optimized_file.name, reference_code, optimized_code, url)
+        return
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Repeated evaluations are meant to measure again
+    cached: dict[TargetDevice, list[EvaluationRun]] = {}
+    if cache_max_age is not None and repeat == 1:
+        for device in devices:
+            details = get_cached_evaluation(reference_code, optimized_code, device, cache_max_age, url)
+            if details is not None:
+                cached[device] = [EvaluationRun(0, details.evaluation, cached=True)]
+    pending = [device for device in devices if device not in cached]
+
+    # Taken before evaluating, the evaluation itself adds to them
+    cached_baselines: dict[TargetDevice, dict[EvalRefMode, BaselineBenchmarkResult]] = {}
+    if baselines and cache_max_age is not None:
+        cached_baselines = {
+            device: get_cached_baselines(reference_code, device, cache_max_age, url) for device in devices
+        }
+
+    measured: list[list[EvaluationRun]] = []
+    if pending:
+        what = "code" if repeat == 1 else f"code {repeat} times"
+        typer.echo(f"Evaluating {what}..." if len(pending) == 1 else f"Evaluating {what} on {len(pending)} devices...")
+
+        try:
+            async with open_connection(url) as conn:
+                await ensure_authenticated(conn)
+                # A failure on one device should not discard the results of the others
+                measured = await asyncio.gather(
+                    *(
+                        evaluate_repeatedly(
+                            conn,
+                            reference_code,
+                            optimized_code,
+                            device,
+                            repeat,
+                            semaphore,
+                            name=optimized_file.name,
+                        )
+                        for device in pending
+                    )
+                )
+        except Exception as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1) from e
+
+    measured_by_device = dict(zip(pending, measured))
+    results = [cached.get(device) or measured_by_device[device] for device in devices]
+
+    with history_guard():
+        history = get_performance_history()
+        for device, runs in zip(devices, results):
+            for run in runs:
+                if run.successful and not run.cached and run.evaluation is not None:
+                    history.record_evaluation(
+                        run.evaluation, reference_code, optimized_code, optimized_file.name, device
+                    )
+
+    if len(devices) > 1:
+        print_device_comparison(dict(zip(devices, results)), warmup)
+        if baselines:
+            print_baseline_matrix(dict(zip(devices, results)), baselines, cached_baselines, warmup)
+        if not any(run.successful for runs in results for run in runs):
+            raise typer.Exit(1)
+        return
+
+    (runs,) = results
+    if not any(run.successful for run in runs):
+        if any(run.error is not None for run in runs):
+            typer.echo(f"Error: {describe_run_error(runs)}", err=True)
+        else:
+            typer.echo("\n✗ Evaluation failed!", err=True)
+        raise typer.Exit(1)
+
+    if repeat == 1:
+        (run,) = runs
+        assert run.evaluation is not None
+        print_evaluation(run.evaluation)
+        if run.cached:
+            typer.echo(f"\n{_cached_note(run.evaluation)}")
+    else:
+        print_repeated_evaluation(runs, warmup)
+    print_shape_breakdown(runs, sort_shapes)
+
+    if baselines:
+        typer.echo()
+        print_baseline_matrix({devices[0]: runs}, baselines, cached_baselines, warmup)
+
+
 def cli_evaluate(
     reference_file: Annotated[Path, typer.Argument(help="Path to file containing reference code.")],
-    optimized_file: Annotated[Path, typer.Argument(help="Path to file containing optimized code.")],
-    device: Annotated[TargetDevice, typer.Option("-d", "--device", help="Device type.")],
+    optimized_files: Annotated[
+        list[Path],
+        typer.Argument(
+            help="Path to file containing optimized code. Several files or directories of candidates can be given."
+        ),
+    ],
+    device: Annotated[
+        list[TargetDevice],
+        typer.Option(
+            "-d",
+            "--device",
+            help="Device type. Can be given multiple times, all devices are then evaluated concurrently "
+            "and compared in a single table.",
+        ),
+    ],
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of evaluations running concurrently.")] = 4,
+    finalists: Annotated[
+        int,
+        typer.Option(min=0, help="With several candidates, evaluate the best ones again to rank them more reliably."),
+    ] = 0,
+    final_rounds: Annotated[int, typer.Option(min=1, help="Number of additional evaluations of each finalist.")] = 3,
+    repeat: Annotated[
+        int,
+        typer.Option(
+            min=1,
+            help="Evaluate the code this many times and pool the timings of all runs, leaving out discarded "
+            "runs, runs whose speedup is an outlier and samples the benchmark flagged as outliers.",
+        ),
+    ] = 1,
+    warmup: Annotated[
+        int,
+        typer.Option(
+            min=0,
+            help="With --repeat, number of first submitted runs to discard. Runs are evaluated concurrently, "
+            "so this does not warm anything up.",
+        ),
+    ] = 0,
+    no_cache: Annotated[
+        bool,
+        typer.Option(
+            "--no-cache",
+            help="Always evaluate again, even if identical code was evaluated recently on the same device. "
+            "Cached results are never used with --repeat.",
+        ),
+    ] = False,
+    cache_max_age: Annotated[
+        float, typer.Option(min=0.0, help="Reuse results of evaluating identical code up to this many hours old.")
+    ] = EVALUATION_CACHE_MAX_AGE / 3600,
+    baselines: Annotated[
+        str | None,
+        typer.Option(
+            help="Comma separated modes of the reference to compare against, any of eager, compiled, "
+            "reduce-overhead, max-autotune and max-autotune-no-cudagraphs. The speedups are shown as a matrix, "
+            "modes the service did not benchmark this time are taken from an earlier evaluation of the same "
+            "reference on the device."
+        ),
+    ] = None,
+    sort_shapes: Annotated[
+        ShapeOrder,
+        typer.Option(
+            help="Order of the per-shape speedups of a multi-shape benchmark: by shape, slowest first, "
+            "or lowest speedup over eager or torch.compile first."
+        ),
+    ] = ShapeOrder.shape,
+    detach: Annotated[
+        bool,
+        typer.Option(
+            "--detach",
+            help="Queue one evaluation per device for a background process which keeps running after this "
+            "command exits, use `makora results` to get the results.",
+        ),
+    ] = False,
     url: Annotated[
         str | None,
         typer.Option(
@@ -103,7 +800,24 @@ def cli_evaluate(
         ),
     ] = None,
 ) -> None:
-    """Evaluate code against a reference implementation on remote hardware."""
+    """Evaluate code against a reference implementation on remote hardware.
+
+    Several devices are compared in a single table, several candidates are ranked by their speedup.
+    """
     asyncio.run(
-        cli_evaluate_async(reference_file=reference_file, optimized_file=optimized_file, device=device, url=url)
+        cli_evaluate_async(
+            reference_file=reference_file,
+            optimized_files=optimized_files,
+            devices=device,
+            concurrency=concurrency,
+            finalists=finalists,
+            final_rounds=final_rounds,
+            repeat=repeat,
+            warmup=warmup,
+            cache_max_age=None if no_cache else cache_max_age * 3600,
+            detach=detach,
+            baselines=parse_baselines(baselines) if baselines is not None else None,
+            sort_shapes=sort_shapes,
+            url=url,
+        )
     )
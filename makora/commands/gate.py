@@ -0,0 +1,384 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import time
+import asyncio
+import xml.etree.ElementTree as ET
+from enum import Enum
+from pathlib import Path
+from typing import Annotated, TYPE_CHECKING
+
+import typer
+from pydantic import BaseModel
+
+from ..utils import get_rich_console
+from ..version import version
+from ..models.internal import TargetDevice
+from ..web.auth import ensure_authenticated, get_current_credentials
+from ..web.conn import open_connection
+from ..web.evaluation import EvaluationRun, evaluate_repeatedly
+from ..store.history import get_performance_history, history_guard
+from ..store.kernels import atomic_write_bytes, hash_code
+from ..components.spinner import show_spinner
+from ..components.strings import create_styled_table, format_device, format_speedup_estimate
+from .evaluate import aggregate_evaluation_runs, describe_run_error
+
+if TYPE_CHECKING:
+    from ..stats import AggregatedSpeedup
+
+
+class ReportFormat(Enum):
+    junit = "junit"
+    json = "json"
+
+
+class GateStatus(Enum):
+    passed = "passed"
+    regression = "regression"
+    failed = "failed"
+    no_baseline = "no baseline"
+
+
+class BaselineEntry(BaseModel):
+    speedup: float
+    low: float
+    high: float
+    code_hash: str
+    measured_at: float
+    cli_version: str
+
+
+class GateBaseline(BaseModel):
+    reference_hash: str
+    devices: dict[str, BaselineEntry] = {}
+
+
+class GateResult(BaseModel):
+    device: str
+    status: GateStatus
+    message: str
+    baseline: BaselineEntry | None = None
+    speedup: float | None = None
+    low: float | None = None
+    high: float | None = None
+    #: Relative slowdown against the baseline speedup, 0.05 is 5% slower
+    slowdown: float | None = None
+    runs: int = 0
+
+
+def parse_ratio(value: str) -> float:
+    """Parse ``3%`` or ``0.03`` as a ratio."""
+    text = value.strip()
+    try:
+        ratio = float(text[:-1]) / 100 if text.endswith("%") else float(text)
+    except ValueError:
+        raise typer.BadParameter(f"'{value}' is neither a percentage nor a ratio", param_hint="max-regression")
+    if ratio < 0:
+        raise typer.BadParameter("The maximum regression cannot be negative", param_hint="max-regression")
+    return ratio
+
+
+def judge(
+    device: TargetDevice,
+    runs: list[EvaluationRun],
+    aggregated: "AggregatedSpeedup | None",
+    baseline: BaselineEntry | None,
+    max_regression: float,
+    reference_changed: bool = False,
+) -> GateResult:
+    """Compare the pooled speedup of a device against its baseline.
+
+    Speedups rather than times are compared so that drifts of the hardware, which affect the
+    reference just as much, cancel out. A regression is significant if the speedup dropped by more
+    than ``max_regression`` and its confidence interval lies entirely below that of the baseline.
+    A baseline recorded for another reference is no baseline at all.
+    """
+    if aggregated is None:
+        if any(run.successful for run in runs):
+            message = "The evaluations returned no timing samples to compare"
+        else:
+            message = describe_run_error(runs)
+        return GateResult(device=device.value, status=GateStatus.failed, message=message)
+
+    estimate = aggregated.estimate
+    result = GateResult(
+        device=device.value,
+        status=GateStatus.passed,
+        message="",
+        baseline=baseline,
+        speedup=estimate.speedup,
+        low=estimate.low,
+        high=estimate.high,
+        runs=len(aggregated.run_speedups),
+    )
+    if baseline is None or reference_changed:
+        result.status = GateStatus.no_baseline
+        result.message = (
+            "The baseline was recorded for another reference" if reference_changed else "No baseline for this device"
+        )
+        return result
+
+    result.slowdown = baseline.speedup / estimate.speedup - 1.0
+    if result.slowdown > max_regression and estimate.high < baseline.low:
+        result.status = GateStatus.regression
+        result.message = (
+            f"Speedup dropped from {baseline.speedup:.3f}x [{baseline.low:.3f}–{baseline.high:.3f}] to "
+            f"{estimate.speedup:.3f}x [{estimate.low:.3f}–{estimate.high:.3f}], {result.slowdown:.1%} slower "
+            f"(allowed {max_regression:.1%})"
+        )
+    elif result.slowdown > max_regression:
+        result.message = f"{result.slowdown:.1%} slower, within the noise of the measurement"
+    return result
+
+
+def write_junit_report(path: Path, results: list[GateResult], duration: float) -> None:
+    failures = sum(r.status == GateStatus.regression for r in results)
+    errors = sum(r.status in (GateStatus.failed, GateStatus.no_baseline) for r in results)
+    suite = ET.Element(
+        "testsuite",
+        name="makora.gate",
+        tests=str(len(results)),
+        failures=str(failures),
+        errors=str(errors),
+        time=f"{duration:.3f}",
+    )
+    for result in results:
+        case = ET.SubElement(suite, "testcase", classname="makora.gate", name=result.device)
+        if result.status == GateStatus.regression:
+            ET.SubElement(case, "failure", message=result.message, type="regression")
+        elif result.status in (GateStatus.failed, GateStatus.no_baseline):
+            ET.SubElement(case, "error", message=result.message, type=result.status.value)
+        elif result.speedup is not None:
+            ET.SubElement(
+                case, "system-out"
+            ).text = f"speedup {result.speedup:.4f} [{result.low:.4f}, {result.high:.4f}]"
+
+    ET.indent(suite)
+    atomic_write_bytes(path, ET.tostring(suite, encoding="utf-8", xml_declaration=True))
+
+
+def write_json_report(path: Path, results: list[GateResult], max_regression: float) -> None:
+    report = {
+        "passed": all(r.status == GateStatus.passed for r in results),
+        "max_regression": max_regression,
+        "cli_version": version,
+        "results": [r.model_dump(mode="json") for r in results],
+    }
+    atomic_write_bytes(path, json.dumps(report, indent=2).encode("utf-8"))
+
+
+def print_gate_results(results: list[GateResult]) -> None:
+    console = get_rich_console()
+    devices = {device.value: device for device in TargetDevice}
+
+    table = create_styled_table("Regression Gate")
+    table.add_column("Device", style="cyan", no_wrap=True)
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("Status")
+    table.add_column("Details", style="dim")
+
+    for result in results:
+        current = "-"
+        if result.speedup is not None and result.low is not None and result.high is not None:
+            current = f"{result.speedup:.2f}x [{result.low:.2f}–{result.high:.2f}]"
+        status = {
+            GateStatus.passed: "[green]+ passed[/green]",
+            GateStatus.regression: "[red]x regression[/red]",
+            GateStatus.failed: "[red]x failed[/red]",
+            GateStatus.no_baseline: "[yellow]? no baseline[/yellow]",
+        }[result.status]
+        table.add_row(
+            format_device(devices.get(result.device, result.device)),
+            f"{result.baseline.speedup:.2f}x" if result.baseline is not None else "-",
+            current,
+            f"{-result.slowdown:+.1%}" if result.slowdown is not None else "-",
+            status,
+            result.message,
+        )
+
+    console.print(table)
+
+
+async def cli_gate_async(
+    reference_file: Path,
+    candidate_file: Path,
+    baseline_file: Path,
+    devices: list[TargetDevice],
+    max_regression: float,
+    repeat: int,
+    warmup: int,
+    concurrency: int,
+    update_baseline: bool,
+    report: Path | None,
+    report_format: ReportFormat | None,
+    url: str | None = None,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    console = get_rich_console()
+    for path in (reference_file, candidate_file):
+        if not path.exists():
+            raise SystemExit(f"File not found: {path}")
+
+    reference_code = reference_file.read_text()
+    candidate_code = candidate_file.read_text()
+    devices = list(dict.fromkeys(devices))
+
+    baseline: GateBaseline | None = None
+    if baseline_file.exists():
+        baseline = GateBaseline.model_validate_json(baseline_file.read_bytes())
+    elif not update_baseline:
+        raise SystemExit(f"Baseline {baseline_file} does not exist, create it with --update-baseline")
+
+    reference_changed = baseline is not None and baseline.reference_hash != hash_code(reference_code)
+    if reference_changed and update_baseline:
+        console.print("[yellow]Warning:[/yellow] The reference changed, the baseline is recorded again.")
+
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(concurrency)
+    async with open_connection(url) as conn:
+        await ensure_authenticated(conn)
+        with show_spinner(f"Evaluating {candidate_file.name} {repeat} times on {len(devices)} device(s)..."):
+            results = await asyncio.gather(
+                *(
+                    evaluate_repeatedly(
+                        conn, reference_code, candidate_code, device, repeat, semaphore, name=candidate_file.name
+                    )
+                    for device in devices
+                )
+            )
+    duration = time.monotonic() - started
+
+    with history_guard():
+        history = get_performance_history()
+        for device, runs in zip(devices, results):
+            for run in runs:
+                if run.successful and run.evaluation is not None:
+                    history.record_evaluation(
+                        run.evaluation, reference_code, candidate_code, candidate_file.name, device
+                    )
+
+    gate_results: list[GateResult] = []
+    aggregates: dict[TargetDevice, AggregatedSpeedup] = {}
+    for device, runs in zip(devices, results):
+        aggregated = aggregate_evaluation_runs(runs, warmup)
+        if aggregated is not None:
+            aggregates[device] = aggregated
+        entry = baseline.devices.get(device.value) if baseline is not None else None
+        gate_results.append(judge(device, runs, aggregated, entry, max_regression, reference_changed))
+
+    print_gate_results(gate_results)
+    for device, aggregated in aggregates.items():
+        console.print(
+            f"[dim]{format_device(device)}: {format_speedup_estimate(aggregated.estimate, color=False)}[/dim]"
+        )
+
+    if report is not None:
+        fmt = report_format or (ReportFormat.junit if report.suffix.lower() == ".xml" else ReportFormat.json)
+        if fmt == ReportFormat.junit:
+            write_junit_report(report, gate_results, duration)
+        else:
+            write_json_report(report, gate_results, max_regression)
+        console.print(f"[dim]Report written to {report}[/dim]")
+
+    if update_baseline:
+        if baseline is None or baseline.reference_hash != hash_code(reference_code):
+            # Speedups against another reference are meaningless
+            baseline = GateBaseline(reference_hash=hash_code(reference_code))
+        for device, aggregated in aggregates.items():
+            estimate = aggregated.estimate
+            baseline.devices[device.value] = BaselineEntry(
+                speedup=estimate.speedup,
+                low=estimate.low,
+                high=estimate.high,
+                code_hash=hash_code(candidate_code),
+                measured_at=time.time(),
+                cli_version=version,
+            )
+        atomic_write_bytes(baseline_file, baseline.model_dump_json(indent=2).encode("utf-8"))
+        console.print(f"[green]Baseline {baseline_file} updated for {len(aggregates)} device(s).[/green]")
+        if len(aggregates) < len(devices):
+            raise typer.Exit(1)
+        return
+
+    if any(r.status != GateStatus.passed for r in gate_results):
+        raise typer.Exit(1)
+
+
+def cli_gate(
+    reference: Annotated[Path, typer.Option(help="Path to file containing reference code.")],
+    candidate: Annotated[Path, typer.Option(help="Path to file containing the candidate kernel.")],
+    baseline: Annotated[Path, typer.Option(help="JSON file with the baseline speedups per device.")],
+    device: Annotated[
+        list[TargetDevice], typer.Option("-d", "--device", help="Device type. Can be given multiple times.")
+    ],
+    max_regression: Annotated[
+        str, typer.Option(help="Largest tolerated drop of the speedup, e.g. '3%' or '0.03'.")
+    ] = "3%",
+    repeat: Annotated[int, typer.Option(min=1, help="Number of evaluations per device.")] = 5,
+    warmup: Annotated[
+        int,
+        typer.Option(
+            min=0,
+            help="Number of first submitted runs to discard. Runs are evaluated concurrently, "
+            "so this does not warm anything up.",
+        ),
+    ] = 0,
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of evaluations running concurrently.")] = 4,
+    update_baseline: Annotated[
+        bool, typer.Option(help="Store the measured speedups as the new baseline instead of failing.")
+    ] = False,
+    report: Annotated[Path | None, typer.Option(help="Write a report of the gate to this file.")] = None,
+    report_format: Annotated[
+        ReportFormat | None, typer.Option(help="Format of the report, by default JUnit for .xml files, JSON otherwise.")
+    ] = None,
+    url: Annotated[
+        str | None,
+        typer.Option(
+            help="Overwrite the base URL used to communicate with the service. If "
+            "not provided will use the one controlled by MAKORA_URL env var. "
+            "Use `makora info` for its value."
+        ),
+    ] = None,
+) -> None:
+    """Fail if a kernel got significantly slower than its baseline, for use in CI.
+
+    The candidate is evaluated repeatedly and its pooled speedup over the reference is compared
+    with the baseline. A drop beyond --max-regression fails the gate only if it exceeds the
+    noise of the measurements, i.e. the confidence intervals of the baseline and of the candidate
+    do not overlap. Exits with a non-zero code on a regression, a failed evaluation or a missing
+    baseline, which includes a baseline recorded for another reference.
+    """
+    asyncio.run(
+        cli_gate_async(
+            reference_file=reference,
+            candidate_file=candidate,
+            baseline_file=baseline,
+            devices=device,
+            max_regression=parse_ratio(max_regression),
+            repeat=repeat,
+            warmup=warmup,
+            concurrency=concurrency,
+            update_baseline=update_baseline,
+            report=report,
+            report_format=report_format,
+            url=url,
+        )
+    )
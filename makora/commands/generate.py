@@ -43,6 +43,7 @@ async def cli_generate_async(
     fix: bool = False,
     instr: list[Path] | None = None,
     interactive: bool = True,
+    use_cache: bool = True,
 ) -> None:
     console = get_rich_console()
     print_mini_header(f"Generate: {file.name}")
@@ -88,6 +89,7 @@ async def cli_generate_async(
             interactive=interactive,
             hint_command=hint_command,
             console=console,
+            use_cache=use_cache,
         )
 
         if validation_result is None:
@@ -155,6 +157,9 @@ def cli_generate(
         ),
     ] = None,
     alone: Annotated[bool, typer.Option(help="Disables any interactivity.")] = False,
+    no_cache: Annotated[
+        bool, typer.Option("--no-cache", help="Always validate again, even if identical code was validated recently.")
+    ] = False,
 ) -> None:
     """Submit a new kernel generation job to the agent."""
     asyncio.run(
@@ -169,5 +174,6 @@ def cli_generate(
             fix=fix,
             instr=instr,
             interactive=(not alone and sys.stdin.isatty()),
+            use_cache=not no_cache,
         )
     )
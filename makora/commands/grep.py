@@ -0,0 +1,82 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import re
+from typing import Annotated
+
+import typer
+from rich.text import Text
+
+from ..utils import get_rich_console
+from ..store.kernels import get_kernel_store
+from ..store.search import CodeIndex, LineMatch
+
+
+def _format_line(prefix: str, match: LineMatch) -> Text:
+    text = Text(prefix, style="dim")
+    text.append(f"{match.line_number}:", style="green")
+    line = Text(match.line)
+    for start, end in match.spans:
+        line.stylize("bold red", start, end)
+    text.append_text(line)
+    return text
+
+
+def cli_grep(
+    pattern: Annotated[str, typer.Argument(help="Regular expression (Python syntax) to search for.")],
+    ignore_case: Annotated[bool, typer.Option("-i", "--ignore-case", help="Match case-insensitively.")] = False,
+    files_only: Annotated[
+        bool,
+        typer.Option("-l", "--kernels-only", help="Only print IDs of matching kernels, one per line."),
+    ] = False,
+    session: Annotated[
+        str | None, typer.Option("-s", "--session", help="Only search kernels of sessions with this ID prefix.")
+    ] = None,
+) -> None:
+    """Search code of locally stored kernels with a regular expression.
+
+    Only kernels whose code has already been downloaded are searched, for example
+    by `makora kernels SESSION KERNEL` or `makora kernels SESSION --export DIR`.
+    """
+    try:
+        # Kernels are searched as a whole, ^ and $ still match at every line
+        regex = re.compile(pattern, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+    except re.error as e:
+        raise typer.BadParameter(f"Invalid regular expression: {e}", param_hint="PATTERN") from e
+
+    console = get_rich_console()
+    index = CodeIndex(get_kernel_store())
+    try:
+        index.update()
+
+        found = False
+        for code_hash, lines in index.search(regex):
+            for kernel in index.store.kernels_by_code_hash(code_hash):
+                if session is not None and not str(kernel.session_id).startswith(session):
+                    continue
+
+                found = True
+                if files_only:
+                    typer.echo(str(kernel.kernel_id))
+                    continue
+
+                prefix = f"{str(kernel.session_id)[:8]} {str(kernel.kernel_id)[:8]} {kernel.name}:"
+                for line in lines:
+                    console.print(_format_line(prefix, line), soft_wrap=True)
+    finally:
+        index.close()
+
+    if not found:
+        raise typer.Exit(1)
@@ -0,0 +1,140 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import statistics
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Annotated
+
+import typer
+
+from ..utils import get_rich_console
+from ..models.internal import TargetDevice
+from ..store.history import Measurement, detect_regression, get_performance_history
+from ..components.strings import (
+    create_styled_table,
+    format_device,
+    format_p_value,
+    format_sparkline,
+    format_time,
+    format_time_ago,
+)
+
+
+class HistoryKind(Enum):
+    evaluate = "evaluate"
+    profile = "profile"
+    check = "check"
+
+
+_DEVICES = {device.value: device for device in TargetDevice}
+
+#: Number of most recent measurements of a series shown in its trend
+_TREND_LENGTH = 16
+
+
+def _format_change(change: float | None) -> str:
+    if change is None:
+        return "-"
+    if abs(change) < 0.005:
+        return f"[dim]{change:+.1%}[/dim]"
+    # Times going up are getting slower
+    color = "red" if change > 0 else "green"
+    return f"[{color}]{change:+.1%}[/{color}]"
+
+
+def _format_kernel(measurement: Measurement) -> str:
+    return f"{measurement.name or '-'} [dim]{measurement.code_hash[:8]}[/dim]"
+
+
+def _measured_at(measurement: Measurement) -> datetime:
+    return datetime.fromtimestamp(measurement.measured_at, timezone.utc)
+
+
+def cli_history(
+    regressions: Annotated[
+        bool, typer.Option("--regressions", help="Only show series whose latest measurement is a regression.")
+    ] = False,
+    device: Annotated[TargetDevice | None, typer.Option("-d", "--device", help="Only show the given device.")] = None,
+    kind: Annotated[HistoryKind | None, typer.Option(help="Only show results of the given command.")] = None,
+    window: Annotated[
+        int, typer.Option(min=1, help="Number of preceding measurements forming the baseline of the latest one.")
+    ] = 10,
+    min_slowdown: Annotated[
+        float, typer.Option(min=0.0, help="Smallest relative slowdown reported as a regression, 0.02 is 2%.")
+    ] = 0.02,
+    limit: Annotated[int, typer.Option(min=1, help="Maximum number of series shown.")] = 30,
+) -> None:
+    """Show the local history of evaluate, profile and check results per kernel and device.
+
+    With --regressions, exits with a non-zero code if the latest measurement of any kernel is
+    significantly slower than the preceding ones.
+    """
+    console = get_rich_console()
+    history = get_performance_history()
+    series = history.series(device, kind.value if kind is not None else None)
+
+    table = create_styled_table("Regressions" if regressions else "Performance History")
+    table.add_column("Kernel", style="cyan", no_wrap=True)
+    table.add_column("Command")
+    table.add_column("Device")
+    table.add_column("Runs", justify="right")
+    table.add_column("Latest", justify="right")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Change", justify="right")
+    if regressions:
+        table.add_column("p", justify="right")
+    table.add_column("Trend")
+    table.add_column("Measured", justify="right")
+
+    shown = 0
+    for measurements in series:
+        regression = detect_regression(measurements, window, min_slowdown)
+        if regressions and regression is None:
+            continue
+
+        timed = [m.time_ms for m in measurements if m.time_ms is not None]
+        latest = measurements[-1]
+        baseline = statistics.median(timed[-window - 1 : -1]) if len(timed) > 1 else None
+        change = timed[-1] / baseline - 1.0 if baseline else None
+
+        row = [
+            _format_kernel(latest),
+            latest.kind,
+            format_device(_DEVICES.get(latest.device, latest.device)),
+            str(len(measurements)),
+            format_time(latest.time_ms),
+            format_time(baseline),
+            _format_change(change),
+        ]
+        if regressions:
+            p_value = regression.p_value if regression is not None else None
+            row.append(format_p_value(p_value) if p_value is not None else "-")
+        row.extend([format_sparkline(timed[-_TREND_LENGTH:]), format_time_ago(_measured_at(latest))])
+        table.add_row(*row)
+
+        shown += 1
+        if shown >= limit:
+            break
+
+    if shown:
+        console.print(table)
+    elif regressions:
+        console.print("[green]No regressions found.[/green]")
+    else:
+        console.print("[dim]No results recorded yet, run 'makora evaluate', 'profile' or 'check' first.[/dim]")
+
+    if regressions and shown:
+        raise typer.Exit(1)
@@ -13,20 +13,40 @@
 # limitations under the License.
 
 
+import re
+import time
 import asyncio
+from datetime import datetime, timedelta, timezone
 from typing import Annotated
 from uuid import UUID
 
 import typer
+from rich.live import Live
 from rich.table import Table
 from rich import box
 
 from ..utils import get_rich_console
-from ..web.conn import open_connection
+from ..web.conn import Connection, open_connection
 from ..web.auth import get_current_credentials
-from ..web.sessions import fetch_session_extra, get_user_sessions, stop_job, resolve_session
-from ..models.openapi import AgentSessionSummary
-from ..models.internal import SessionExtra
+from ..web.sessions import (
+    fetch_session_extra,
+    get_user_sessions,
+    refresh_session_summary,
+    stop_job,
+    resolve_session,
+)
+from ..models.openapi import AgentSessionSummary, KernelLanguage, StepStatus
+from ..models.internal import (
+    SessionExtra,
+    SessionFilter,
+    SessionSortKey,
+    TargetDevice,
+    TERMINAL_STATUSES,
+    compile_label_pattern,
+)
+from ..store.kernels import get_kernel_store
+from ..store.mirror import describe_staleness, run_with_offline_fallback
+from ..store.prefetch import spawn_prefetcher
 from ..components.strings import format_status, format_time_ago, format_device, format_speedup
 
 
@@ -34,6 +54,7 @@ def create_jobs_table(
     sessions: list[AgentSessionSummary],
     extras: dict[UUID, SessionExtra] | None = None,
     title: str = "Jobs",
+    changed: dict[UUID, set[str]] | None = None,
 ) -> Table:
     table = Table(
         title=title,
@@ -61,14 +82,21 @@ def create_jobs_table(
             label = label[:17] + "..."
         started = format_time_ago(session.started_at)
 
+        changed_cols = changed.get(session.id, set()) if changed is not None else set()
+        if "status" in changed_cols:
+            status_display = f"[reverse]{status_display}[/reverse]"
+
         row = [session_id, status_display, label]
         if extras is not None:
             extra = extras.get(session.id, SessionExtra())
+            speedup_display = format_speedup(extra.speedup)
+            if "speedup" in changed_cols:
+                speedup_display = f"[reverse]{speedup_display}[/reverse]"
             row.append(format_device(extra.device))
-            row.append(format_speedup(extra.speedup))
+            row.append(speedup_display)
         row.append(started)
 
-        table.add_row(*row)
+        table.add_row(*row, style="bold" if changed_cols else None)
 
     return table
 
@@ -93,7 +121,38 @@ async def cli_stop_async(job_uuid: str, url: str | None = None) -> None:
             console.print(f"[yellow]Job {str(session_id)[:8]} is not running.[/yellow]")
 
 
-async def cli_jobs_async(fast: bool, url: str | None = None) -> None:
+_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhdw])$")
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_since(value: str) -> datetime:
+    """Parse either a relative duration (e.g. ``90m``, ``2h``, ``7d``) or an ISO date/time."""
+    value = value.strip()
+    m = _DURATION_RE.match(value.lower())
+    if m is not None:
+        delta = timedelta(**{_DURATION_UNITS[m.group(2)]: float(m.group(1))})
+        return datetime.now(timezone.utc) - delta
+
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise typer.BadParameter(f"{value!r} is neither a duration (like 2h, 3d) nor an ISO date") from None
+
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return dt
+
+
+def parse_label(value: str) -> str:
+    """Check that a label pattern compiles, so that an invalid regex is reported as a usage error."""
+    try:
+        compile_label_pattern(value)
+    except re.error as e:
+        raise typer.BadParameter(f"{value!r} is not a valid regular expression: {e}", param_hint="label") from None
+    return value
+
+
+async def cli_jobs_async(fast: bool, url: str | None = None, selection: SessionFilter | None = None) -> None:
     creds = get_current_credentials()
     if creds is None:
         raise SystemExit("You need to login first with 'makora login'")
@@ -101,6 +160,9 @@ async def cli_jobs_async(fast: bool, url: str | None = None) -> None:
     console = get_rich_console()
     async with open_connection(url) as conn:
         sessions = await get_user_sessions(conn)
+        if selection is not None:
+            # Narrow the selection before any per-session requests are made.
+            sessions = selection.apply(sessions)
 
         if not sessions:
             console.print("[dim]No jobs found.[/dim]")
@@ -108,17 +170,189 @@ async def cli_jobs_async(fast: bool, url: str | None = None) -> None:
 
         extras: dict[UUID, SessionExtra] | None = None
         if not fast:
-            # Fetch extras in parallel
-            tasks = [fetch_session_extra(conn, s.id) for s in sessions]
+            # Fetch extras in parallel, sessions without a best attempt have none
+            with_best = [s for s in sessions if s.best_attempt_id is not None]
+            tasks = [fetch_session_extra(conn, s.id) for s in with_best]
             results = await asyncio.gather(*tasks)
-            extras = {s.id: r for s, r in zip(sessions, results) if r is not None}
+            extras = {s.id: r for s, r in zip(with_best, results) if r is not None}
 
     table = create_jobs_table(sessions, extras)
     console.print(table)
+    spawn_prefetcher(url)
+
+
+def cli_jobs_offline(fast: bool, selection: SessionFilter | None = None) -> None:
+    console = get_rich_console()
+    records = {r.session_id: r for r in get_kernel_store().get_session_records().values() if r.summary is not None}
+    if not records:
+        raise SystemExit("No sessions have been mirrored yet, run 'makora sync' first.")
+
+    sessions = [r.summary for r in records.values() if r.summary is not None]
+    if selection is not None:
+        sessions = selection.apply(sessions)
+
+    if not sessions:
+        console.print("[dim]No jobs found.[/dim]")
+        return
+
+    extras: dict[UUID, SessionExtra] | None = None
+    if not fast:
+        extras = {s.id: extra for s in sessions if (extra := records[s.id].extra) is not None}
+
+    staleness = describe_staleness(*(records[s.id] for s in sessions))
+    console.print(create_jobs_table(sessions, extras, title=f"Jobs [dim]({staleness})[/dim]"))
+
+
+async def cli_jobs_watch_async(
+    fast: bool,
+    min_interval: float,
+    max_interval: float,
+    url: str | None = None,
+    selection: SessionFilter | None = None,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    async with open_connection(url) as conn:
+        await watch_jobs(conn, fast, min_interval, max_interval, selection)
+
+
+def get_watch_interval(running: int, quiet_ticks: int, min_interval: float, max_interval: float) -> float:
+    """Compute the delay before the next dashboard refresh.
+
+    Nothing can change once all sessions are finished, so an idle dashboard polls
+    at ``max_interval``. Otherwise the interval starts at ``min_interval`` and backs
+    off exponentially while consecutive refreshes bring no changes.
+    """
+    if running <= 0:
+        return max_interval
+    return min(max_interval, min_interval * (1.5**quiet_ticks))
+
+
+async def watch_jobs(
+    conn: Connection,
+    fast: bool,
+    min_interval: float,
+    max_interval: float,
+    selection: SessionFilter | None = None,
+) -> None:
+    console = get_rich_console()
+
+    listed: list[AgentSessionSummary] = []
+    listed_at: float | None = None
+    known: dict[UUID, AgentSessionSummary] = {}
+    extras: dict[UUID, SessionExtra] = {}
+    quiet_ticks = 0
+
+    with Live(console=console, auto_refresh=False, transient=False) as live:
+        while True:
+            if listed_at is None or time.monotonic() - listed_at >= max_interval:
+                # The full list is only needed to pick up new (or deleted) sessions
+                listed = await get_user_sessions(conn)
+                listed_at = time.monotonic()
+            else:
+                # Finished sessions cannot change, only the running ones are fetched again
+                running_ids = {s.id for s in known.values() if s.status not in TERMINAL_STATUSES}
+                to_poll = [s for s in listed if s.id in running_ids]
+                polled = await asyncio.gather(*[refresh_session_summary(conn, s) for s in to_poll])
+                updated = {s.id: s for s in polled}
+                listed = [updated.get(s.id, s) for s in listed]
+                listed = [s for s in listed if not s.deleted_at]
+
+            sessions = selection.apply(listed) if selection is not None else listed
+
+            changed: dict[UUID, set[str]] = {}
+            to_refresh: list[AgentSessionSummary] = []
+            for session in sessions:
+                prev = known.get(session.id)
+                if prev is not None and prev.status != session.status:
+                    changed.setdefault(session.id, set()).add("status")
+                # Extras are derived from the best attempt only, so they are
+                # refetched exclusively when the best attempt changes.
+                if session.best_attempt_id is not None and (
+                    prev is None or prev.best_attempt_id != session.best_attempt_id
+                ):
+                    to_refresh.append(session)
+
+            if not fast and to_refresh:
+                results = await asyncio.gather(*[fetch_session_extra(conn, s.id) for s in to_refresh])
+                for session, extra in zip(to_refresh, results):
+                    if extra is None:
+                        continue
+                    old = extras.get(session.id)
+                    if session.id in known and (old is None or old.speedup != extra.speedup):
+                        changed.setdefault(session.id, set()).add("speedup")
+                    extras[session.id] = extra
+
+            known = {s.id: s for s in sessions}
+            running = sum(1 for s in sessions if s.status not in TERMINAL_STATUSES)
+            quiet_ticks = 0 if changed else quiet_ticks + 1
+            interval = get_watch_interval(running, quiet_ticks, min_interval, max_interval)
+
+            title = f"Jobs [dim]({running} running, refreshing every {interval:.0f}s, Ctrl+C to exit)[/dim]"
+            live.update(create_jobs_table(sessions, None if fast else extras, title, changed), refresh=True)
+            await asyncio.sleep(interval)
 
 
 def cli_jobs(
     fast: Annotated[bool, typer.Option(help="Skip fetching extra data (device, speedup).")] = False,
+    watch: Annotated[
+        bool,
+        typer.Option(
+            "-w",
+            "--watch",
+            help="Keep the table on screen and update it in place as jobs progress. "
+            "Changed statuses and speedups are highlighted.",
+        ),
+    ] = False,
+    interval: Annotated[
+        float,
+        typer.Option(min=1.0, help="Shortest refresh interval (in seconds) used with --watch while jobs are running."),
+    ] = 5.0,
+    idle_interval: Annotated[
+        float,
+        typer.Option(min=1.0, help="Refresh interval (in seconds) used with --watch once all jobs have finished."),
+    ] = 60.0,
+    status: Annotated[
+        list[StepStatus] | None,
+        typer.Option(help="Only show jobs with the given status. Can be specified multiple times."),
+    ] = None,
+    device: Annotated[
+        list[TargetDevice] | None,
+        typer.Option(
+            "-d", "--device", help="Only show jobs targeting the given device. Can be specified multiple times."
+        ),
+    ] = None,
+    language: Annotated[
+        list[KernelLanguage] | None,
+        typer.Option(help="Only show jobs targeting the given language. Can be specified multiple times."),
+    ] = None,
+    since: Annotated[
+        str | None,
+        typer.Option(
+            help="Only show jobs started after the given time: a duration ago (e.g. 90m, 2h, 7d) or an ISO date."
+        ),
+    ] = None,
+    label: Annotated[
+        str | None,
+        typer.Option(help="Only show jobs whose label matches the glob pattern, or regex if written as /pattern/."),
+    ] = None,
+    sort: Annotated[
+        SessionSortKey,
+        typer.Option(help="Order of the listed jobs (by start time: newest first)."),
+    ] = SessionSortKey.started,
+    limit: Annotated[
+        int | None,
+        typer.Option("-n", "--limit", min=1, help="Show at most this many jobs (after filtering and sorting)."),
+    ] = None,
+    offline: Annotated[
+        bool,
+        typer.Option(
+            help="Show jobs from the local mirror (see `makora sync`) without contacting the service. "
+            "The mirror is also used automatically when the service cannot be reached."
+        ),
+    ] = False,
     url: Annotated[
         str | None,
         typer.Option(
@@ -129,7 +363,30 @@ def cli_jobs(
     ] = None,
 ) -> None:
     """Lists jobs created by the user."""
-    asyncio.run(cli_jobs_async(fast, url))
+    selection = SessionFilter(
+        statuses=status or None,
+        devices=device or None,
+        languages=language or None,
+        since=parse_since(since) if since else None,
+        label=parse_label(label) if label else None,
+        sort=sort,
+        limit=limit,
+    )
+
+    if offline:
+        if watch:
+            raise typer.BadParameter("--watch cannot be used together with --offline")
+        cli_jobs_offline(fast, selection)
+        return
+
+    if watch:
+        try:
+            asyncio.run(cli_jobs_watch_async(fast, interval, max(interval, idle_interval), url, selection))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    run_with_offline_fallback(cli_jobs_async(fast, url, selection), lambda: cli_jobs_offline(fast, selection))
 
 
 def cli_stop(
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import re
 import asyncio
 import textwrap
 import itertools as itr
@@ -25,20 +26,35 @@ from rich.syntax import Syntax
 from rich.table import Table
 
 from ..utils import get_rich_console
-from ..web.conn import open_connection
+from ..web.conn import Connection, open_connection
 from ..web.auth import get_current_credentials
-from ..web.sessions import get_user_sessions, get_session_kernels, resolve_session
-from ..models.openapi import EvaluatedKernel
+from ..web.sessions import (
+    find_session,
+    get_user_sessions,
+    get_session_kernel_summaries,
+    get_kernel_details,
+    resolve_session,
+)
+from ..models.openapi import AgentSessionSummary, EvalRefMode, KernelEvaluation
+from ..models.internal import KernelSummary
+from ..store.kernels import StoredKernel, atomic_write_bytes, get_kernel_store
+from ..store.archive import SessionArchive
+from ..store.sync import fetch_kernel_code
+from ..store.cache import get_default_ttl
+from ..store.mirror import describe_staleness, resolve_mirrored_session, run_with_offline_fallback
+from ..store.prefetch import spawn_prefetcher
+from ..components.results import ShapeOrder, print_shape_speedups
 from ..components.strings import (
     create_styled_table,
     format_close_miss_status,
     format_status,
     format_time,
     format_speedup,
+    format_speedup_estimate,
 )
 
 
-def create_kernels_table(kernels: list[list[EvaluatedKernel]], title: str = "Kernels") -> Table:
+def create_kernels_table(kernels: list[list[KernelSummary]], title: str = "Kernels") -> Table:
     table = create_styled_table(title)
 
     table.add_column("Attempt", justify="center")
@@ -74,13 +90,13 @@ def create_kernels_table(kernels: list[list[EvaluatedKernel]], title: str = "Ker
 
 
 async def resolve_kernel(
-    kernels: list[list[EvaluatedKernel]],
+    kernels: list[list[KernelSummary]],
     session_id: UUID,
     kernel_id: str,
-) -> EvaluatedKernel | None:
-    """Find kernel matching the given ID prefix. Returns (full_kernel_id, kernels_data)."""
+) -> KernelSummary | None:
+    """Find kernel matching the given ID prefix."""
 
-    matches: list[EvaluatedKernel] = []
+    matches: list[KernelSummary] = []
     for krn in itr.chain.from_iterable(kernels):
         if str(krn.id).startswith(kernel_id):
             matches.append(krn)
@@ -106,13 +122,13 @@ async def cli_kernels_list_async(session_id: str, url: str | None = None) -> Non
     console = get_rich_console()
 
     async with open_connection(url) as conn:
-        sessions = await get_user_sessions(conn)
-        match = await resolve_session(sessions, session_id)
+        match = await find_session(conn, session_id)
 
         if not match:
             raise SystemExit(f"No session found matching '{session_id}'")
 
-        kernels = await get_session_kernels(conn, str(match.id))
+        # Kernels of finished sessions are immutable and served from the cache
+        kernels = await get_session_kernel_summaries(conn, str(match.id), match.status, max_age=get_default_ttl())
 
     if not kernels:
         console.print("[dim]No kernels found for this session.[/dim]")
@@ -120,9 +136,68 @@ async def cli_kernels_list_async(session_id: str, url: str | None = None) -> Non
 
     table = create_kernels_table(kernels, title=f"Kernels for {str(match.id)[:8]} ({match.label})")
     console.print(table)
+    spawn_prefetcher(url)
+
+
+def _attempt_number(kernels: list[list[KernelSummary]], kernel: KernelSummary) -> int:
+    for attempt_num, attempt_kernels in enumerate(kernels):
+        if any(k.id == kernel.id for k in attempt_kernels):
+            return attempt_num + 1
+    return 0
+
+
+def _export_basename(kernel: StoredKernel) -> str:
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", kernel.name).strip("._") or "kernel"
+    return f"attempt{kernel.attempt_number:02d}_{name}_{str(kernel.kernel_id)[:8]}"
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    if path.exists() and path.read_bytes() == data:
+        return False
+    atomic_write_bytes(path, data)
+    return True
+
+
+def _write_export(out_dir: Path, kernel: StoredKernel, code: str) -> bool:
+    basename = _export_basename(kernel)
+    wrote = _write_if_changed(out_dir / f"{basename}.py", code.encode("utf-8"))
+    sidecar = kernel.model_dump_json(indent=2).encode("utf-8")
+    wrote = _write_if_changed(out_dir / f"{basename}.json", sidecar) or wrote
+    return wrote
+
+
+async def export_session_kernels(
+    conn: Connection,
+    session: AgentSessionSummary,
+    out_dir: Path,
+    concurrency: int = 8,
+) -> tuple[int, int, int]:
+    """Store all kernels of a session locally and write them (with metadata sidecars) to ``out_dir``.
+
+    Returns a tuple of: number of kernels, number of kernels downloaded and number of files written.
+    """
+    store = get_kernel_store()
+    kernels = await get_session_kernel_summaries(conn, str(session.id), session.status)
+    entries = [(attempt_num + 1, k) for attempt_num, attempt_kernels in enumerate(kernels) for k in attempt_kernels]
+    codes, downloaded = await fetch_kernel_code(conn, store, session.id, [k for _, k in entries], concurrency)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    to_write: list[tuple[StoredKernel, str]] = []
+    for attempt_number, kernel in entries:
+        code = codes.get(kernel.id)
+        if code is None:
+            continue
+        stored = StoredKernel.from_kernel(
+            kernel, session.id, attempt_number, store.put_blob(code), session.target_hardware
+        )
+        store.put_kernel(stored)
+        to_write.append((stored, code))
 
+    written = await asyncio.gather(*[asyncio.to_thread(_write_export, out_dir, k, code) for k, code in to_write])
+    return len(entries), downloaded, sum(written)
 
-async def cli_kernels_code_async(session_id: str, kernel_id: str, output: str | None, url: str | None = None) -> None:
+
+async def cli_kernels_export_async(session_id: str, out_dir: Path, concurrency: int, url: str | None = None) -> None:
     creds = get_current_credentials()
     if creds is None:
         raise SystemExit("You need to login first with 'makora login'")
@@ -136,26 +211,111 @@ async def cli_kernels_code_async(session_id: str, kernel_id: str, output: str |
         if not match:
             raise SystemExit(f"No session found matching '{session_id}'")
 
-        kernels = await get_session_kernels(conn, str(match.id))
+        total, downloaded, written = await export_session_kernels(conn, match, out_dir, concurrency)
+
+    if not total:
+        console.print("[dim]No kernels found for this session.[/dim]")
+        return
+
+    console.print(
+        f"[green]Exported {total} kernel(s) to: {out_dir}[/green] "
+        f"[dim]({downloaded} downloaded, {total - downloaded} from local store, {written} file(s) updated)[/dim]"
+    )
+
 
-        # Resolve kernel ID and get perf data from list endpoint
-        kernel = await resolve_kernel(kernels, match.id, kernel_id)
+def _is_full_id(kernel_id: str) -> bool:
+    try:
+        return str(UUID(kernel_id)) == kernel_id.lower()
+    except ValueError:
+        return False
 
-        if not kernel:
-            console.print(f"[red]No kernel found matching '{kernel_id}'[/red]")
-            if kernels:
-                console.print("\nAvailable kernels:")
-                for krn in itr.chain.from_iterable(kernels):
-                    console.print(f"  {str(krn.id)[:8]}  {krn.name}")
 
-            raise SystemExit(1)
+async def cli_kernels_code_async(
+    session_id: str,
+    kernel_id: str,
+    output: str | None,
+    url: str | None = None,
+    sort_shapes: ShapeOrder = ShapeOrder.shape,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    console = get_rich_console()
+    store = get_kernel_store()
+
+    # Kernels with a finished evaluation never change, so a kernel given by its full ID
+    # can be shown without talking to the service at all. Prefixes are always resolved by
+    # the service, the store might only know some of the kernels sharing a prefix.
+    code: str | None = None
+    evaluation: KernelEvaluation | None = None
+    local = store.get_kernel(kernel_id) if _is_full_id(kernel_id) else None
+    if (
+        local is not None
+        and str(local.session_id).startswith(session_id)
+        and local.is_final
+        and local.code_hash is not None
+    ):
+        evaluation = store.get_evaluation(local.kernel_id)
+        if evaluation is not None:
+            code = store.get_blob(local.code_hash)
+            kernel = local.to_summary()
+
+    if code is None:
+        async with open_connection(url) as conn:
+            match = await find_session(conn, session_id)
+
+            if not match:
+                raise SystemExit(f"No session found matching '{session_id}'")
+
+            kernels = await get_session_kernel_summaries(conn, str(match.id), match.status, max_age=get_default_ttl())
+
+            # Resolve kernel ID and get perf data from list endpoint
+            found = await resolve_kernel(kernels, match.id, kernel_id)
+
+            if not found:
+                console.print(f"[red]No kernel found matching '{kernel_id}'[/red]")
+                if kernels:
+                    console.print("\nAvailable kernels:")
+                    for krn in itr.chain.from_iterable(kernels):
+                        console.print(f"  {str(krn.id)[:8]}  {krn.name}")
+
+                raise SystemExit(1)
+
+            # Only the selected kernel's body is downloaded
+            details = await get_kernel_details(conn, str(match.id), str(found.id))
+
+        kernel = found
+        code = details.code
+        evaluation = details.evaluation
+        if code:
+            stored = StoredKernel.from_kernel(
+                kernel, match.id, _attempt_number(kernels, kernel), store.put_blob(code), match.target_hardware
+            )
+            store.put_kernel(stored)
+            if evaluation is not None and stored.is_final:
+                store.put_evaluation(kernel.id, evaluation)
+
+    print_kernel_code(kernel, code, output, evaluation, sort_shapes)
+
+
+def print_kernel_code(
+    kernel: KernelSummary,
+    code: str | None,
+    output: str | None,
+    evaluation: KernelEvaluation | None = None,
+    sort_shapes: ShapeOrder = ShapeOrder.shape,
+) -> None:
+    from ..stats import estimate_evaluation_speedup, shape_timings
+
+    console = get_rich_console()
 
-    if not kernel.code:
+    if not code:
         raise SystemExit("No code available for this kernel.")
 
     # Save to file if requested
     if output:
-        Path(output).write_text(kernel.code, encoding="utf-8")
+        Path(output).write_text(code, encoding="utf-8")
         console.print(f"[green]Kernel saved to: {output}[/green]")
         return
 
@@ -163,7 +323,7 @@ async def cli_kernels_code_async(session_id: str, kernel_id: str, output: str |
     lexer = "python"
 
     syntax = Syntax(
-        kernel.code,
+        code,
         lexer,
         theme="monokai",
         line_numbers=False,
@@ -190,19 +350,109 @@ async def cli_kernels_code_async(session_id: str, kernel_id: str, output: str |
         console.print(f"  Reference eager:  [dim]{ref_eager:.3f} ms[/dim]")
     if ref_compiled:
         console.print(f"  torch.compile:    [dim]{ref_compiled:.3f} ms[/dim]")
-    if speedup_eager:
+    estimate_eager = estimate_compiled = None
+    if evaluation is not None:
+        estimate_eager = estimate_evaluation_speedup(evaluation, EvalRefMode.EAGER)
+        estimate_compiled = estimate_evaluation_speedup(evaluation, EvalRefMode.COMPILED)
+
+    if estimate_eager is not None:
+        console.print(f"  vs eager:         {format_speedup_estimate(estimate_eager)}")
+    elif speedup_eager:
         console.print(f"  vs eager:         {format_speedup(speedup_eager)}")
-    if speedup_compiled:
+    if estimate_compiled is not None:
+        console.print(f"  vs torch.compile: {format_speedup_estimate(estimate_compiled)}")
+    elif speedup_compiled:
         console.print(f"  vs torch.compile: {format_speedup(speedup_compiled)}")
 
+    if evaluation is not None and evaluation.benchmarking_result is not None:
+        shapes = shape_timings([evaluation.benchmarking_result])
+        if len(shapes) > 1:
+            console.print()
+            print_shape_speedups(shapes, sort_shapes, console)
+
+
+async def cli_kernels_archive_async(
+    path: Path, kernel_id: str | None, output: str | None, sort_shapes: ShapeOrder = ShapeOrder.shape
+) -> None:
+    console = get_rich_console()
+
+    with SessionArchive(path) as archive:
+        session = archive.session()
+        kernels = archive.kernel_summaries()
+
+        if not kernel_id:
+            if not kernels:
+                console.print("[dim]No kernels found for this session.[/dim]")
+                return
+            console.print(create_kernels_table(kernels, title=f"Kernels for {str(session.id)[:8]} ({session.label})"))
+            return
+
+        found = await resolve_kernel(kernels, session.id, kernel_id)
+        if not found:
+            raise SystemExit(f"No kernel found matching '{kernel_id}'")
+
+        details = archive.kernel_details(found.id)
+
+    if details is None:
+        print_kernel_code(found, None, output)
+    else:
+        print_kernel_code(found, details.code, output, details.evaluation, sort_shapes)
+
+
+async def cli_kernels_offline_async(session_id: str, kernel_id: str | None, output: str | None) -> None:
+    console = get_rich_console()
+    store = get_kernel_store()
+    record = resolve_mirrored_session(session_id)
+    kernels = store.session_kernel_summaries(record.session_id)
+
+    if not kernel_id:
+        if not kernels:
+            console.print("[dim]No kernels found for this session.[/dim]")
+            return
+        title = f"Kernels for {str(record.session_id)[:8]} ({record.label}) [dim]({describe_staleness(record)})[/dim]"
+        console.print(create_kernels_table(kernels, title=title))
+        return
+
+    found = await resolve_kernel(kernels, record.session_id, kernel_id)
+    if not found:
+        raise SystemExit(f"No kernel found matching '{kernel_id}' in the local mirror")
+
+    stored = store.get_kernel(found.id)
+    if stored is None or stored.code_hash is None:
+        raise SystemExit(f"Code of kernel {str(found.id)[:8]} is not in the local mirror, run 'makora sync' first.")
+
+    print_kernel_code(found, store.get_blob(stored.code_hash), output)
+
 
 def cli_kernels(
-    session_id: Annotated[str, typer.Argument(help="Session ID (or prefix).")],
+    session_id: Annotated[str, typer.Argument(help="Session ID (or prefix), or a session archive file.")],
     kernel_id: Annotated[
         str | None,
         typer.Argument(help="Kernel ID (or prefix) - if provided, shows kernel code."),
     ] = None,
     output: Annotated[str | None, typer.Option("-o", "--output", help="Save kernel code to file.")] = None,
+    export: Annotated[
+        Path | None,
+        typer.Option(
+            help="Write all kernels of the session to the given directory, each with a JSON "
+            "metadata sidecar. Kernels already present in the local store are not downloaded again."
+        ),
+    ] = None,
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of concurrent downloads when exporting.")] = 8,
+    sort_shapes: Annotated[
+        ShapeOrder,
+        typer.Option(
+            help="Order of the per-shape speedups of a multi-shape kernel: by shape, slowest first, "
+            "or lowest speedup over eager or torch.compile first."
+        ),
+    ] = ShapeOrder.shape,
+    offline: Annotated[
+        bool,
+        typer.Option(
+            help="Use the local mirror (see `makora sync`) without contacting the service. "
+            "The mirror is also used automatically when the service cannot be reached."
+        ),
+    ] = False,
     url: Annotated[
         str | None,
         typer.Option(
@@ -213,7 +463,25 @@ def cli_kernels(
     ] = None,
 ) -> None:
     """List kernels for a session, or view kernel code if kernel_id is provided."""
-    if kernel_id:
-        asyncio.run(cli_kernels_code_async(session_id, kernel_id, output, url))
+    if SessionArchive.is_archive(session_id):
+        if export is not None:
+            raise typer.BadParameter("--export cannot be used with a session archive")
+        asyncio.run(cli_kernels_archive_async(Path(session_id), kernel_id, output, sort_shapes))
+    elif export is not None:
+        if kernel_id:
+            raise typer.BadParameter("--export cannot be used together with a kernel ID")
+        if offline:
+            raise typer.BadParameter("--export cannot be used together with --offline")
+        asyncio.run(cli_kernels_export_async(session_id, export, concurrency, url))
+    elif offline:
+        asyncio.run(cli_kernels_offline_async(session_id, kernel_id, output))
+    elif kernel_id:
+        run_with_offline_fallback(
+            cli_kernels_code_async(session_id, kernel_id, output, url, sort_shapes),
+            lambda: asyncio.run(cli_kernels_offline_async(session_id, kernel_id, output)),
+        )
     else:
-        asyncio.run(cli_kernels_list_async(session_id, url))
+        run_with_offline_fallback(
+            cli_kernels_list_async(session_id, url),
+            lambda: asyncio.run(cli_kernels_offline_async(session_id, None, output)),
+        )
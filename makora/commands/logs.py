@@ -0,0 +1,314 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Any, Awaitable, Callable, Sequence, TypeVar
+from uuid import UUID
+
+import typer
+from rich.console import Console
+from rich.markup import escape
+
+from ..utils import get_rich_console
+from ..web.conn import Connection, open_connection
+from ..web.auth import get_current_credentials
+from ..web.sessions import (
+    get_attempt_commands,
+    get_attempt_logs,
+    get_session,
+    get_user_sessions,
+    resolve_session,
+)
+from ..models.openapi import AgentGenerationAttempt, AgentLogEntryOut, CommandOut, LogLevel
+from ..models.internal import TERMINAL_STATUSES
+from ..store.archive import SessionArchive
+
+
+T = TypeVar("T", AgentLogEntryOut, CommandOut)
+
+
+LOG_LEVEL_ORDER = {level.value: i for i, level in enumerate(LogLevel)}
+
+LOG_LEVEL_COLORS = {
+    "DEBUG": "bright_black",
+    "INFO": "white",
+    "WARNING": "yellow",
+    "ERROR": "red",
+    "CRITICAL": "bold red",
+}
+
+
+class LogCursor:
+    """Position within an attempt's log stream.
+
+    ``offset`` is used to skip pages which have already been downloaded, while
+    ``last`` (the ``(created_at, id)`` of the newest rendered entry) guards against
+    rendering the same entry twice if the server-side ordering shifts between polls.
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.last: tuple[datetime, str] | None = None
+
+
+def _entry_key(entry: AgentLogEntryOut | CommandOut) -> tuple[datetime, str]:
+    if isinstance(entry, CommandOut):
+        return (entry.started_at, str(entry.id))
+    return (entry.created_at, str(entry.id))
+
+
+async def fetch_new_entries(
+    fetch_page: Callable[[int], Awaitable[tuple[list[T], int]]],
+    cursor: LogCursor,
+) -> list[T]:
+    """Download all entries past the cursor and advance it."""
+    new: list[T] = []
+    while True:
+        items, total = await fetch_page(cursor.offset)
+        cursor.offset += len(items)
+        for item in items:
+            if cursor.last is not None and _entry_key(item) <= cursor.last:
+                continue
+            new.append(item)
+
+        if not items or cursor.offset >= total:
+            break
+
+    new.sort(key=_entry_key)
+    if new:
+        cursor.last = _entry_key(new[-1])
+    return new
+
+
+def _format_timestamp(dt: datetime) -> str:
+    return dt.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def print_log_entry(entry: AgentLogEntryOut, attempt_number: int, console: Console) -> None:
+    level = entry.level.upper()
+    color = LOG_LEVEL_COLORS.get(level, "white")
+    retry = f".{entry.retry_number}" if entry.retry_number else ""
+    console.print(
+        f"[dim]{_format_timestamp(entry.created_at)}[/dim] "
+        f"[{color}]{level:<8}[/{color}] "
+        f"[cyan]#{attempt_number}{retry}[/cyan] "
+        f"{escape(entry.message)}",
+        highlight=False,
+    )
+    if entry.exception is not None:
+        console.print(f"    [red]{escape(entry.exception.type)}: {escape(entry.exception.message)}[/red]")
+        for line in entry.exception.traceback:
+            console.print(f"[dim]{escape(line.rstrip())}[/dim]", highlight=False)
+
+
+def print_command_entry(entry: CommandOut, attempt_number: int, console: Console) -> None:
+    elapsed = ""
+    if entry.finished_at is not None:
+        elapsed = f" [dim]({(entry.finished_at - entry.started_at).total_seconds():.1f}s)[/dim]"
+    status = (
+        "[red]x[/red]" if entry.error_message else ("[green]+[/green]" if entry.finished_at else "[yellow]*[/yellow]")
+    )
+    console.print(
+        f"[dim]{_format_timestamp(entry.started_at)}[/dim] {status} "
+        f"[cyan]#{attempt_number}[/cyan] "
+        f"{escape(entry.command_type)} [dim]{escape(entry.command_handler)}[/dim]{elapsed}",
+        highlight=False,
+    )
+    if entry.error_message:
+        console.print(f"    [red]{escape(entry.error_message)}[/red]")
+
+
+def _passes_level(entry: AgentLogEntryOut | CommandOut, min_level: int) -> bool:
+    if isinstance(entry, CommandOut):
+        return True
+    return LOG_LEVEL_ORDER.get(entry.level.upper(), len(LOG_LEVEL_ORDER)) >= min_level
+
+
+def print_entries(
+    entries: Sequence[AgentLogEntryOut | CommandOut],
+    attempt_number: int,
+    min_level: int,
+    jsonl: bool,
+    console: Console,
+) -> None:
+    for entry in entries:
+        if not _passes_level(entry, min_level):
+            continue
+        if jsonl:
+            payload: dict[str, Any] = entry.model_dump(mode="json")
+            payload["attempt_number"] = attempt_number
+            typer.echo(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        elif isinstance(entry, CommandOut):
+            print_command_entry(entry, attempt_number, console)
+        else:
+            print_log_entry(entry, attempt_number, console)
+
+
+def print_archived_logs(
+    archive: SessionArchive,
+    attempt_number: int | None,
+    level: LogLevel,
+    jsonl: bool,
+    commands: bool,
+) -> None:
+    console = get_rich_console()
+    min_level = LOG_LEVEL_ORDER[level.value]
+
+    session = archive.session()
+    attempts = sorted(session.generation_attempts, key=lambda a: a.attempt_number)
+    if attempt_number is not None:
+        attempts = [a for a in attempts if a.attempt_number == attempt_number]
+        if not attempts:
+            raise SystemExit(f"Session {str(session.id)[:8]} has no attempt number {attempt_number}")
+
+    for attempt in attempts:
+        entries = archive.commands(attempt.id) if commands else archive.logs(attempt.id)
+        print_entries(entries, attempt.attempt_number, min_level, jsonl, console)
+
+
+async def _drain_attempt(
+    conn: Connection,
+    session_id: UUID,
+    attempt: AgentGenerationAttempt,
+    cursor: LogCursor,
+    commands: bool,
+) -> list[AgentLogEntryOut] | list[CommandOut]:
+    if commands:
+
+        async def fetch_commands(offset: int) -> tuple[list[CommandOut], int]:
+            page = await get_attempt_commands(conn, str(session_id), str(attempt.id), offset=offset)
+            return page.items, page.total
+
+        return await fetch_new_entries(fetch_commands, cursor)
+
+    async def fetch_logs(offset: int) -> tuple[list[AgentLogEntryOut], int]:
+        page = await get_attempt_logs(conn, str(session_id), str(attempt.id), offset=offset)
+        return page.items, page.total
+
+    return await fetch_new_entries(fetch_logs, cursor)
+
+
+async def cli_logs_async(
+    session_id: str,
+    attempt_number: int | None,
+    follow: bool,
+    level: LogLevel,
+    jsonl: bool,
+    commands: bool,
+    interval: float,
+    url: str | None = None,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    console = get_rich_console()
+    min_level = LOG_LEVEL_ORDER[level.value]
+
+    async with open_connection(url) as conn:
+        sessions = await get_user_sessions(conn)
+        match = await resolve_session(sessions, session_id)
+
+        if not match:
+            raise SystemExit(f"No session found matching '{session_id}'")
+
+        session_uuid = match.id
+
+        async def list_attempts() -> tuple[list[AgentGenerationAttempt], bool]:
+            session = await get_session(conn, str(session_uuid))
+            attempts = sorted(session.generation_attempts, key=lambda a: a.attempt_number)
+            if attempt_number is not None:
+                attempts = [a for a in attempts if a.attempt_number == attempt_number]
+            return attempts, session.status in TERMINAL_STATUSES
+
+        attempts, session_done = await list_attempts()
+        if attempt_number is not None and not attempts:
+            raise SystemExit(f"Session {str(match.id)[:8]} has no attempt number {attempt_number}")
+
+        cursors: dict[UUID, LogCursor] = {}
+        drained: set[UUID] = set()
+
+        while True:
+            got_new = False
+            for attempt in attempts:
+                if attempt.id in drained:
+                    continue
+
+                entries = await _drain_attempt(
+                    conn, session_uuid, attempt, cursors.setdefault(attempt.id, LogCursor()), commands
+                )
+                got_new = got_new or bool(entries)
+                print_entries(entries, attempt.attempt_number, min_level, jsonl, console)
+
+                # Finished attempts will not produce more entries once drained after they finished.
+                if attempt.status in TERMINAL_STATUSES:
+                    drained.add(attempt.id)
+
+            if not follow:
+                break
+
+            if all(a.id in drained for a in attempts) and session_done:
+                break
+
+            if not got_new:
+                # Nothing arrived - the cheapest moment to check for new attempts and
+                # status changes, as the log stream itself is quiet.
+                attempts, session_done = await list_attempts()
+
+            await asyncio.sleep(interval)
+
+
+def cli_logs(
+    session_id: Annotated[str, typer.Argument(help="Session ID (or prefix), or a session archive file.")],
+    attempt: Annotated[
+        int | None,
+        typer.Option("-a", "--attempt", help="Only show logs of the attempt with the given number."),
+    ] = None,
+    follow: Annotated[
+        bool,
+        typer.Option(
+            "-f",
+            "--follow",
+            help="Keep polling for new entries (and new attempts) until the session finishes.",
+        ),
+    ] = False,
+    level: Annotated[LogLevel, typer.Option(help="Minimum log level to show.")] = LogLevel.INFO,
+    jsonl: Annotated[bool, typer.Option(help="Print raw entries as JSON lines instead of formatted text.")] = False,
+    commands: Annotated[bool, typer.Option(help="Show the agent's command log instead of its messages.")] = False,
+    interval: Annotated[float, typer.Option(min=0.5, help="Polling interval in seconds when following.")] = 2.0,
+    url: Annotated[
+        str | None,
+        typer.Option(
+            help="Overwrite the base URL used to communicate with the service. If "
+            "not provided will use the one controlled by MAKORA_URL env var. "
+            "Use `makora info` for its value."
+        ),
+    ] = None,
+) -> None:
+    """Show (and optionally follow) agent logs of a session."""
+    if SessionArchive.is_archive(session_id):
+        if follow:
+            raise typer.BadParameter("--follow cannot be used with a session archive")
+        with SessionArchive(Path(session_id)) as archive:
+            print_archived_logs(archive, attempt, level, jsonl, commands)
+        return
+
+    try:
+        asyncio.run(cli_logs_async(session_id, attempt, follow, level, jsonl, commands, interval, url))
+    except KeyboardInterrupt:
+        pass
@@ -19,15 +19,17 @@ from typing import Annotated
 
 import typer
 
-from ..models.openapi import (
-    KernelEvaluationStatus,
-    KernelProfilingDetails,
-    ProfileKernelRequest,
-    ProfilingMode,
-)
+from ..utils import get_rich_console
+from ..models.openapi import KernelEvaluationStatus, KernelProfilingDetails, ProfilingMode
 from ..models.internal import TargetDevice
+from ..store.history import get_performance_history, history_guard
+from ..store.detached import JobKind
+from ..store.artifacts import MANIFEST_NAME, ProfileManifest, write_profile_artifacts
 from ..web.auth import ensure_authenticated, get_current_credentials
 from ..web.conn import open_connection
+from ..web.evaluation import EVALUATION_CACHE_MAX_AGE, get_cached_profile, profile_kernel
+from ..components.detached import submit_detached_jobs
+from ..components.strings import create_styled_table, format_size, format_time_ago
 
 
 def _extract_error(details: KernelProfilingDetails) -> str:
@@ -43,47 +45,7 @@ def _extract_error(details: KernelProfilingDetails) -> str:
     return "Profiling did not complete successfully."
 
 
-async def cli_profile_async(
-    reference_file: Path, optimized_file: Path, device: TargetDevice, url: str | None = None
-) -> None:
-    creds = get_current_credentials()
-    if creds is None:
-        raise SystemExit("You need to login first with 'makora login'")
-
-    if not reference_file.exists():
-        typer.echo(f"Error: File not found: {reference_file}", err=True)
-        raise typer.Exit(1)
-
-    if not optimized_file.exists():
-        typer.echo(f"Error: File not found: {optimized_file}", err=True)
-        raise typer.Exit(1)
-
-    hardware_provider, hardware_model = device.to_api_device().split(":")
-
-    request = ProfileKernelRequest(
-        reference_code=reference_file.read_text(),
-        optimized_code=optimized_file.read_text(),
-        name=optimized_file.name,
-        origin="user",
-        extras={},
-        mode=ProfilingMode.full,
-    )
-
-    typer.echo("Profiling code...")
-
-    try:
-        async with open_connection(url) as conn:
-            await ensure_authenticated(conn)
-            response = await conn.post(
-                f"kernel-evaluation/profile/{hardware_provider}/{hardware_model}",
-                request,
-                reply_format=KernelProfilingDetails,
-                token=creds.token,
-            )
-    except Exception as e:
-        typer.echo(f"Error: {e}", err=True)
-        raise typer.Exit(1) from e
-
+def print_profile(response: KernelProfilingDetails) -> None:
     run = response.kernel_profiling_run
     if run is None or run.status != KernelEvaluationStatus.COMPLETED:
         typer.echo("\nProfiling failed!", err=True)
@@ -117,10 +79,122 @@ async def cli_profile_async(
         typer.echo()
 
 
+def print_artifacts(manifest: ProfileManifest, out_dir: Path) -> None:
+    console = get_rich_console()
+
+    table = create_styled_table(f"Profile artifacts in {out_dir}")
+    table.add_column("Kernel", justify="right", style="cyan")
+    table.add_column("File")
+    table.add_column("Format", style="dim")
+    table.add_column("Size", justify="right")
+    for kernel in manifest.kernels:
+        for artifact in kernel.artifacts:
+            table.add_row(str(kernel.kernel), artifact.path, artifact.format, format_size(artifact.size))
+    console.print(table)
+    console.print(
+        f"[green]Wrote {manifest.artifact_count} artifact(s) of {len(manifest.kernels)} kernel(s), "
+        f"indexed by {out_dir / MANIFEST_NAME}[/green]"
+    )
+
+
+async def cli_profile_async(
+    reference_file: Path,
+    optimized_file: Path,
+    device: TargetDevice,
+    cache_max_age: float | None = None,
+    detach: bool = False,
+    output: Path | None = None,
+    url: str | None = None,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    if not reference_file.exists():
+        typer.echo(f"Error: File not found: {reference_file}", err=True)
+        raise typer.Exit(1)
+
+    if not optimized_file.exists():
+        typer.echo(f"Error: File not found: {optimized_file}", err=True)
+        raise typer.Exit(1)
+
+    reference_code = reference_file.read_text()
+    optimized_code = optimized_file.read_text()
+    mode = ProfilingMode.full
+
+    if detach:
+        if output is not None:
+            raise typer.BadParameter("Detached profiles are only stored for `makora results`", param_hint="output")
+        submit_detached_jobs(JobKind.profile, [device], optimized_file.name, reference_code, optimized_code, url)
+        return
+
+    response = None
+    if cache_max_age is not None:
+        response = get_cached_profile(reference_code, optimized_code, device, mode, cache_max_age, url)
+
+    cached = response is not None
+    if response is None:
+        typer.echo("Profiling code...")
+
+        try:
+            async with open_connection(url) as conn:
+                await ensure_authenticated(conn)
+                response = await profile_kernel(
+                    conn, reference_code, optimized_code, device, mode, name=optimized_file.name
+                )
+        except Exception as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1) from e
+
+    run = response.kernel_profiling_run
+    if run is not None and run.status == KernelEvaluationStatus.COMPLETED:
+        if cached:
+            when = format_time_ago(run.finished_at or response.created_at)
+            typer.echo(f"Using cached profile from {when}, use --no-cache to profile again.")
+        else:
+            with history_guard():
+                get_performance_history().record_profile(
+                    run, reference_code, optimized_code, optimized_file.name, device
+                )
+
+        if output is not None:
+            try:
+                manifest = write_profile_artifacts(response, output)
+            except OSError as e:
+                typer.echo(f"Error: Could not write the profile to {output}: {e}", err=True)
+                raise typer.Exit(1) from e
+            print_artifacts(manifest, output)
+            return
+
+    print_profile(response)
+
+
 def cli_profile(
     reference_file: Annotated[Path, typer.Argument(help="Path to file containing reference code.")],
     optimized_file: Annotated[Path, typer.Argument(help="Path to file containing optimized code.")],
     device: Annotated[TargetDevice, typer.Option("-d", "--device", help="Device type.")],
+    no_cache: Annotated[
+        bool, typer.Option("--no-cache", help="Always profile again, even if identical code was profiled recently.")
+    ] = False,
+    cache_max_age: Annotated[
+        float, typer.Option(min=0.0, help="Reuse profiles of identical code up to this many hours old.")
+    ] = EVALUATION_CACHE_MAX_AGE / 3600,
+    output: Annotated[
+        Path | None,
+        typer.Option(
+            "-o",
+            "--output",
+            help="Write every field of every profiled kernel to a separate file in this directory instead of "
+            "printing the profile, with a manifest.json indexing them.",
+        ),
+    ] = None,
+    detach: Annotated[
+        bool,
+        typer.Option(
+            "--detach",
+            help="Profile in a background process and return immediately, use `makora results` to get the profile.",
+        ),
+    ] = False,
     url: Annotated[
         str | None,
         typer.Option(
@@ -130,5 +204,24 @@ def cli_profile(
         ),
     ] = None,
 ) -> None:
-    """Profile code using the remote Makora evaluator."""
-    asyncio.run(cli_profile_async(reference_file=reference_file, optimized_file=optimized_file, device=device, url=url))
+    """Profile code using the remote Makora evaluator.
+
+    Profiles of identical code on the same device are reused from the local cache, unless
+    --no-cache is given. With --detach, the profile is requested by a background process which keeps
+    running after this command exits.
+
+    With --output, metrics are written as JSON and CSV, the torch profiler trace as returned by
+    the service, marked as chrome-trace in the manifest if Perfetto can open it, and every report
+    and source listing to its own file.
+    """
+    asyncio.run(
+        cli_profile_async(
+            reference_file=reference_file,
+            optimized_file=optimized_file,
+            device=device,
+            cache_max_age=None if no_cache else cache_max_age * 3600,
+            detach=detach,
+            output=output,
+            url=url,
+        )
+    )
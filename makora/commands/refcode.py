@@ -13,7 +13,6 @@
 # limitations under the License.
 
 
-import asyncio
 from pathlib import Path
 from typing import Annotated
 
@@ -23,26 +22,44 @@ from rich.syntax import Syntax
 from ..utils import get_rich_console
 from ..web.conn import open_connection
 from ..web.auth import get_current_credentials
-from ..web.sessions import get_user_sessions, get_session, resolve_session
+from ..web.sessions import find_cached_refcode, find_session, get_session_refcode
+from ..store.archive import SessionArchive
+from ..store.kernels import get_kernel_store
+from ..store.mirror import resolve_mirrored_session, run_with_offline_fallback
 
 
-async def cli_refcode_async(session_id: str, output: str | None, url: str | None) -> None:
+async def fetch_refcode(session_id: str, url: str | None) -> str | None:
+    # Refcode never changes, so a cached one is served without contacting the service at all
+    if (code := find_cached_refcode(session_id)) is not None:
+        return code
+
     creds = get_current_credentials()
     if creds is None:
         raise SystemExit("You need to login first with 'makora login'")
 
-    console = get_rich_console()
-
     async with open_connection(url) as conn:
-        sessions = await get_user_sessions(conn)
-        match = await resolve_session(sessions, session_id)
+        match = await find_session(conn, session_id)
 
         if not match:
             raise SystemExit(f"No session found matching '{session_id}'")
 
-        session = await get_session(conn, str(match.id))
+        return await get_session_refcode(conn, str(match.id))
+
+
+async def cli_refcode_async(session_id: str, output: str | None, url: str | None) -> None:
+    print_refcode(await fetch_refcode(session_id, url), output)
+
+
+def cli_refcode_offline(session_id: str, output: str | None) -> None:
+    record = resolve_mirrored_session(session_id)
+    if record.refcode_hash is None:
+        raise SystemExit("Refcode of this session is not in the local mirror, run 'makora sync' first.")
+    print_refcode(get_kernel_store().get_blob(record.refcode_hash), output)
+
+
+def print_refcode(code: str | None, output: str | None) -> None:
+    console = get_rich_console()
 
-    code = session.request.problem_description_code.code
     if not code:
         raise SystemExit("No refcode available for this session.")
 
@@ -62,8 +79,15 @@ async def cli_refcode_async(session_id: str, output: str | None, url: str | None
 
 
 def cli_refcode(
-    session_id: Annotated[str, typer.Argument(help="Session ID (or prefix).")],
+    session_id: Annotated[str, typer.Argument(help="Session ID (or prefix), or a session archive file.")],
     output: Annotated[str | None, typer.Option("-o", "--output", help="Save refcode to a file.")] = None,
+    offline: Annotated[
+        bool,
+        typer.Option(
+            help="Use the local mirror (see `makora sync`) without contacting the service. "
+            "The mirror is also used automatically when the service cannot be reached."
+        ),
+    ] = False,
     url: Annotated[
         str | None,
         typer.Option(
@@ -74,4 +98,15 @@ def cli_refcode(
     ] = None,
 ) -> None:
     """Show the original refcode submitted for a session."""
-    asyncio.run(cli_refcode_async(session_id, output, url))
+    if SessionArchive.is_archive(session_id):
+        with SessionArchive(Path(session_id)) as archive:
+            print_refcode(archive.refcode(), output)
+        return
+
+    if offline:
+        cli_refcode_offline(session_id, output)
+        return
+
+    run_with_offline_fallback(
+        cli_refcode_async(session_id, output, url), lambda: cli_refcode_offline(session_id, output)
+    )
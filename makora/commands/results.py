@@ -0,0 +1,131 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import time
+from datetime import datetime, timezone
+from typing import Annotated
+
+import typer
+
+from ..utils import get_rich_console
+from ..models.openapi import KernelEvaluationDetails, KernelProfilingDetails
+from ..store.detached import DetachedJob, JobStatus, get_job_registry
+from ..web.evaluation import EvaluationRun
+from ..components.strings import create_styled_table, format_device, format_time_ago
+from .evaluate import describe_run_error, print_evaluation, print_shape_breakdown
+from .profile import print_profile
+
+
+_STATUS_STYLES = {
+    JobStatus.queued: "dim",
+    JobStatus.running: "yellow",
+    JobStatus.completed: "green",
+    JobStatus.failed: "red",
+}
+
+
+def _format_status(job: DetachedJob) -> str:
+    style = _STATUS_STYLES[job.status]
+    return f"[{style}]{job.status.value}[/{style}]"
+
+
+def _format_duration(job: DetachedJob) -> str:
+    if job.started_at is None:
+        return "-"
+    seconds = (job.finished_at or time.time()) - job.started_at
+    return f"{seconds:.0f}s" if seconds < 120 else f"{seconds / 60:.0f}m"
+
+
+def print_jobs(jobs: list[DetachedJob]) -> None:
+    console = get_rich_console()
+    if not jobs:
+        console.print("[dim]No detached jobs, submit one with 'makora evaluate --detach' or 'profile --detach'.[/dim]")
+        return
+
+    table = create_styled_table("Detached Jobs")
+    table.add_column("ID", style="cyan", no_wrap=True)
+    table.add_column("Command")
+    table.add_column("Device")
+    table.add_column("Kernel")
+    table.add_column("Status")
+    table.add_column("Submitted", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Error", style="red")
+
+    for job in jobs:
+        table.add_row(
+            job.id[:8],
+            job.kind.value,
+            format_device(job.device),
+            job.name or "-",
+            _format_status(job),
+            format_time_ago(datetime.fromtimestamp(job.submitted_at, timezone.utc)),
+            _format_duration(job),
+            job.error or "",
+        )
+    console.print(table)
+
+
+def print_job_result(job: DetachedJob, result: KernelEvaluationDetails | KernelProfilingDetails | None) -> None:
+    typer.echo(f"{job.kind.value.capitalize()} job {job.id[:8]} of {job.name or '-'} on {format_device(job.device)}")
+
+    if result is None:
+        if job.status == JobStatus.failed:
+            typer.echo(f"\nError: {job.error}", err=True)
+            raise typer.Exit(1)
+        typer.echo(f"\nThe job is {job.status.value}, try again later.")
+        return
+
+    if isinstance(result, KernelProfilingDetails):
+        print_profile(result)
+        return
+
+    run = EvaluationRun(0, result.evaluation)
+    if not run.successful or result.evaluation is None:
+        typer.echo("\n✗ Evaluation failed!", err=True)
+        typer.echo(f"\nError: {describe_run_error([run])}", err=True)
+        raise typer.Exit(1)
+    print_evaluation(result.evaluation)
+    print_shape_breakdown([run])
+
+
+def cli_results(
+    job_id: Annotated[
+        str | None, typer.Argument(help="ID, or a unique prefix of it, of the job whose result should be shown.")
+    ] = None,
+    clear: Annotated[bool, typer.Option("--clear", help="Remove finished jobs and their results.")] = False,
+) -> None:
+    """List jobs submitted with `evaluate --detach` and `profile --detach`, or show the result of one."""
+    registry = get_job_registry()
+
+    if clear:
+        removed = registry.remove_finished()
+        typer.echo(f"Removed {removed} finished job(s).")
+        return
+
+    if job_id is None:
+        print_jobs(registry.list_jobs())
+        return
+
+    matches = registry.find(job_id)
+    if not matches:
+        typer.echo(f"Error: No detached job with ID {job_id}", err=True)
+        raise typer.Exit(1)
+    if len(matches) > 1:
+        typer.echo(f"Error: {len(matches)} detached jobs match {job_id}, give more of the ID", err=True)
+        raise typer.Exit(1)
+
+    (job,) = matches
+    print_job_result(job, registry.read_result(job))
@@ -0,0 +1,248 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+from pathlib import Path
+from typing import Annotated, NamedTuple
+
+import typer
+
+from ..utils import get_rich_console
+from ..templates import format_params, parameter_grid, parse_param, unique_variants
+from ..models.openapi import ProblemValidationTaskStatus, StepStatus
+from ..models.internal import TargetDevice
+from ..store.history import get_performance_history, history_guard
+from ..store.kernels import atomic_write_bytes
+from ..web.auth import ensure_authenticated, get_current_credentials
+from ..web.conn import Connection, open_connection
+from ..web.errors import describe_error
+from ..web.problems import get_cached_validation, submit_and_poll_validation
+from ..components.results import get_last_error
+from ..components.spinner import show_spinner
+from ..components.strings import create_styled_table, format_device, format_sparkline, format_time
+
+
+class SweepResult(NamedTuple):
+    values: dict[str, str]
+    code: str
+    status: ProblemValidationTaskStatus | None = None
+    error: str | None = None
+    #: Whether the result was taken from the local cache rather than validated now
+    cached: bool = False
+
+    @property
+    def successful(self) -> bool:
+        return self.status is not None and self.status.status == StepStatus.completed
+
+    @property
+    def reference_time(self) -> float | None:
+        result = self.status.benchmarking_result if self.status is not None else None
+        return result.ref_time if result is not None and result.benchmarked else None
+
+
+def _extract_error(status: ProblemValidationTaskStatus) -> str:
+    last = get_last_error(status.error_logs)
+    if last is not None and last.message:
+        return last.message
+    if status.compilation_result and status.compilation_result.compilation_error:
+        return status.compilation_result.compilation_error
+    if status.preparation_result and status.preparation_result.preparation_error:
+        return status.preparation_result.preparation_error
+    if status.benchmarking_result and status.benchmarking_result.benchmarking_error:
+        return status.benchmarking_result.benchmarking_error
+    return f"Validation {status.status.value if status.status else 'failed'}"
+
+
+def variant_label(problem_file: Path, values: dict[str, str]) -> str:
+    return f"{problem_file.name} [{format_params(values)}]"
+
+
+async def run_sweep(
+    conn: Connection,
+    problem_file: Path,
+    variants: list[tuple[dict[str, str], str]],
+    device: TargetDevice,
+    concurrency: int,
+    use_cache: bool = True,
+) -> list[SweepResult]:
+    """Validate all variants of a problem, with at most ``concurrency`` validations in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def validate(values: dict[str, str], code: str) -> SweepResult:
+        label = variant_label(problem_file, values)
+        if use_cache:
+            cached = get_cached_validation(code, label, device, url=conn.base_url)
+            if cached is not None:
+                return SweepResult(values, code, cached, cached=True)
+
+        async with semaphore:
+            try:
+                status = await submit_and_poll_validation(conn, code, label, device)
+            except Exception as e:
+                return SweepResult(values, code, error=describe_error(e))
+
+        if status.status != StepStatus.completed:
+            return SweepResult(values, code, status, _extract_error(status))
+        return SweepResult(values, code, status)
+
+    return list(await asyncio.gather(*(validate(values, code) for values, code in variants)))
+
+
+def print_sweep(results: list[SweepResult], names: list[str], device: TargetDevice) -> None:
+    console = get_rich_console()
+
+    table = create_styled_table(f"Reference times on {format_device(device)}")
+    for name in names:
+        table.add_column(name, style="cyan", justify="right", no_wrap=True)
+    table.add_column("Eager", justify="right")
+    table.add_column("torch.compile", justify="right")
+    table.add_column("Relative", justify="right")
+    table.add_column("Error", style="red")
+
+    # Scaling is relative to the first variant which could be timed
+    base = next((r.reference_time for r in results if r.reference_time), None)
+    for result in results:
+        params = [result.values[name] for name in names]
+        if not result.successful or result.status is None or result.status.benchmarking_result is None:
+            table.add_row(*params, "-", "-", "-", result.error or "-")
+            continue
+
+        benchmark = result.status.benchmarking_result
+        time = result.reference_time
+        relative = f"{time / base:.2f}x" if time is not None and base else "-"
+        eager = format_time(time, benchmark.ref_time_unit)
+        if result.cached:
+            eager += " [dim](cached)[/dim]"
+        table.add_row(
+            *params,
+            eager,
+            format_time(benchmark.ref_compiled_time, benchmark.ref_compiled_time_unit),
+            relative,
+            "",
+        )
+
+    console.print(table)
+    times = [r.reference_time for r in results if r.reference_time is not None]
+    if len(times) > 1:
+        console.print(f"[dim]Eager time over the variants:[/dim] {format_sparkline(times)}")
+
+
+async def cli_sweep_async(
+    problem_file: Path,
+    params: list[str],
+    device: TargetDevice,
+    concurrency: int,
+    max_variants: int,
+    save: Path | None = None,
+    use_cache: bool = True,
+    url: str | None = None,
+) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    if not problem_file.exists():
+        typer.echo(f"Error: File not found: {problem_file}", err=True)
+        raise typer.Exit(1)
+
+    grid: dict[str, list[str]] = {}
+    try:
+        for spec in params:
+            name, choices = parse_param(spec)
+            grid.setdefault(name, []).extend(choices)
+        code = problem_file.read_text()
+        variants = unique_variants(code, parameter_grid(grid))
+    except (ValueError, SyntaxError) as e:
+        raise typer.BadParameter(str(e), param_hint="param") from e
+
+    if len(variants) > max_variants:
+        raise typer.BadParameter(
+            f"{len(variants)} variants exceed the limit of {max_variants}, raise --max-variants to sweep them all",
+            param_hint="param",
+        )
+
+    if save is not None:
+        save.mkdir(parents=True, exist_ok=True)
+        for values, variant in variants:
+            suffix = "_".join(f"{name}{value}" for name, value in values.items())
+            safe = "".join(c if c.isalnum() or c in "-_." else "-" for c in suffix)
+            atomic_write_bytes(save / f"{problem_file.stem}_{safe}.py", variant.encode("utf-8"))
+
+    try:
+        async with open_connection(url) as conn:
+            await ensure_authenticated(conn)
+            with show_spinner(f"Validating {len(variants)} variants on {format_device(device)}..."):
+                results = await run_sweep(conn, problem_file, variants, device, concurrency, use_cache)
+    except Exception as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+    with history_guard():
+        history = get_performance_history()
+        for result in results:
+            if result.successful and not result.cached and result.status is not None:
+                history.record_validation(result.status, device)
+
+    print_sweep(results, list(grid), device)
+    if save is not None:
+        get_rich_console().print(f"[green]Variants saved to: {save}[/green]")
+    if not any(result.successful for result in results):
+        raise typer.Exit(1)
+
+
+def cli_sweep(
+    problem_file: Annotated[Path, typer.Argument(help="Path to the problem file to sweep.")],
+    param: Annotated[
+        list[str],
+        typer.Option(
+            "-p",
+            "--param",
+            help="NAME=VALUE[,VALUE...] replacing the value assigned to NAME at the top level of the problem. "
+            "Values are Python expressions. Can be given multiple times, all combinations are validated.",
+        ),
+    ],
+    device: Annotated[TargetDevice, typer.Option("-d", "--device", help="Device type.")],
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of validations running concurrently.")] = 4,
+    max_variants: Annotated[int, typer.Option(min=1, help="Refuse sweeps with more variants than that.")] = 64,
+    save: Annotated[Path | None, typer.Option(help="Also write every variant to a file in this directory.")] = None,
+    no_cache: Annotated[
+        bool, typer.Option("--no-cache", help="Always validate again, even if identical code was validated recently.")
+    ] = False,
+    url: Annotated[
+        str | None,
+        typer.Option(
+            help="Overwrite the base URL used to communicate with the service. If "
+            "not provided will use the one controlled by MAKORA_URL env var. "
+            "Use `makora info` for its value."
+        ),
+    ] = None,
+) -> None:
+    """Validate variants of a problem across input shapes and compare the reference times.
+
+    Variants are rendered by replacing the values of top-level assignments, such as `M = 1024`,
+    with every combination of the given values. Equivalent variants are validated only once.
+    """
+    asyncio.run(
+        cli_sweep_async(
+            problem_file=problem_file,
+            params=param,
+            device=device,
+            concurrency=concurrency,
+            max_variants=max_variants,
+            save=save,
+            use_cache=not no_cache,
+            url=url,
+        )
+    )
@@ -0,0 +1,73 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+from typing import Annotated
+
+import typer
+
+from ..utils import get_rich_console
+from ..web.conn import open_connection
+from ..web.auth import get_current_credentials, service_scope
+from ..web.sessions import get_user_sessions
+from ..store.kernels import get_kernel_store
+from ..store.sync import sync_sessions
+from ..components.spinner import show_spinner
+
+
+async def cli_sync_async(concurrency: int, force: bool, url: str | None = None) -> None:
+    creds = get_current_credentials()
+    if creds is None:
+        raise SystemExit("You need to login first with 'makora login'")
+
+    console = get_rich_console()
+    store = get_kernel_store()
+
+    async with open_connection(url) as conn:
+        with show_spinner("Mirroring sessions..."):
+            sessions = await get_user_sessions(conn)
+            refreshed = await sync_sessions(conn, store, sessions, concurrency, force=force, mirror=True)
+        scope = service_scope(conn.base_url)
+
+    # Sessions deleted since the last sync should not be shown offline either,
+    # sessions mirrored from other services (or accounts) are left alone.
+    remote_ids = {s.id for s in sessions}
+    removed = [sid for sid in store.get_session_records(scope) if sid not in remote_ids]
+    store.remove_sessions(removed)
+
+    console.print(
+        f"[green]Mirrored {len(sessions)} session(s).[/green] "
+        f"[dim]({len(refreshed)} updated, {len(sessions) - len(refreshed)} unchanged, {len(removed)} removed)[/dim]"
+    )
+
+
+def cli_sync(
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of sessions synced concurrently.")] = 8,
+    force: Annotated[bool, typer.Option(help="Refresh all sessions, even those which cannot have changed.")] = False,
+    url: Annotated[
+        str | None,
+        typer.Option(
+            help="Overwrite the base URL used to communicate with the service. If "
+            "not provided will use the one controlled by MAKORA_URL env var. "
+            "Use `makora info` for its value."
+        ),
+    ] = None,
+) -> None:
+    """Mirror sessions, kernels and refcodes locally for use with --offline.
+
+    Only sessions which might have changed since the previous sync are downloaded again,
+    and kernels whose code is already stored locally are not downloaded again.
+    """
+    asyncio.run(cli_sync_async(concurrency, force, url))
@@ -0,0 +1,158 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+import heapq
+from enum import Enum
+from typing import Annotated, Iterable
+
+import typer
+from rich.table import Table
+
+from ..utils import get_rich_console
+from ..web.conn import open_connection
+from ..web.auth import get_current_credentials
+from ..web.sessions import get_user_sessions
+from ..models.openapi import Unit
+from ..models.internal import TargetDevice
+from ..store.kernels import LeaderboardRow, get_kernel_store
+from ..store.sync import sync_sessions
+from ..components.spinner import show_spinner
+from ..components.strings import create_styled_table, format_device, format_speedup, format_time
+
+
+class SpeedupMetric(Enum):
+    compiled = "compiled"
+    eager = "eager"
+
+    def column(self) -> str:
+        return "speed_up_compiled" if self == SpeedupMetric.compiled else "speed_up_eager"
+
+
+def select_top_k(rows: Iterable[LeaderboardRow], k: int) -> dict[tuple[str, str], list[LeaderboardRow]]:
+    """Keep the ``k`` fastest kernels per (problem, device) in a single pass.
+
+    Only a min-heap of size ``k`` is kept for each group, so memory does not grow
+    with the number of kernels.
+    """
+    heaps: dict[tuple[str, str], list[tuple[float, str, LeaderboardRow]]] = {}
+    for row in rows:
+        heap = heaps.setdefault((row.refcode_hash, row.device), [])
+        item = (row.speedup, row.kernel_id, row)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+
+    return {key: [row for *_, row in sorted(heap, key=lambda i: i[:2], reverse=True)] for key, heap in heaps.items()}
+
+
+def _device_label(device: str) -> str:
+    try:
+        return format_device(TargetDevice.from_api_name(device))
+    except NotImplementedError:
+        return format_device(device)
+
+
+def create_top_table(groups: dict[tuple[str, str], list[LeaderboardRow]], title: str) -> Table:
+    table = create_styled_table(title)
+    table.add_column("Problem", style="cyan", no_wrap=True)
+    table.add_column("Label", no_wrap=True, max_width=12)
+    table.add_column("Device", no_wrap=True)
+    table.add_column("#", justify="right")
+    table.add_column("Kernel ID", style="cyan", no_wrap=True)
+    table.add_column("Session", no_wrap=True)
+    table.add_column("Time", justify="right", no_wrap=True)
+    table.add_column("Speedup", justify="right", no_wrap=True)
+
+    ordered = sorted(groups.items(), key=lambda kv: kv[1][0].speedup, reverse=True)
+    for group_idx, ((refcode_hash, device), rows) in enumerate(ordered):
+        for rank, row in enumerate(rows, 1):
+            first = rank == 1
+            table.add_row(
+                refcode_hash[:8] if first else "",
+                row.label if first else "",
+                _device_label(device) if first else "",
+                str(rank),
+                row.kernel_id[:8],
+                row.session_id[:8],
+                format_time(row.time, Unit(row.time_unit) if row.time_unit else None),
+                format_speedup(row.speedup),
+                end_section=rank == len(rows) and group_idx != len(ordered) - 1,
+            )
+
+    return table
+
+
+async def cli_top_async(
+    k: int,
+    metric: SpeedupMetric,
+    devices: list[TargetDevice] | None,
+    refresh: bool,
+    concurrency: int,
+    url: str | None = None,
+) -> None:
+    console = get_rich_console()
+    store = get_kernel_store()
+
+    if refresh:
+        creds = get_current_credentials()
+        if creds is None:
+            raise SystemExit("You need to login first with 'makora login'")
+
+        async with open_connection(url) as conn:
+            with show_spinner("Refreshing local kernel index..."):
+                sessions = await get_user_sessions(conn)
+                refreshed = await sync_sessions(conn, store, sessions, concurrency)
+
+        console.print(f"[dim]Refreshed {len(refreshed)} of {len(sessions)} session(s).[/dim]")
+
+    rows = store.iter_leaderboard_rows(metric.column())
+    if devices:
+        api_devices = {d.to_api_device() for d in devices}
+        rows = (r for r in rows if r.device in api_devices)
+
+    groups = select_top_k(rows, k)
+    if not groups:
+        console.print("[dim]No evaluated kernels found in the local cache.[/dim]")
+        return
+
+    metric_label = "torch.compile" if metric == SpeedupMetric.compiled else "eager"
+    console.print(create_top_table(groups, title=f"Top {k} kernels per problem and device (vs {metric_label})"))
+
+
+def cli_top(
+    k: Annotated[int, typer.Option("-k", "--top", min=1, help="Number of kernels to show per problem and device.")] = 3,
+    metric: Annotated[SpeedupMetric, typer.Option(help="Reference used to rank kernels.")] = SpeedupMetric.compiled,
+    device: Annotated[
+        list[TargetDevice] | None,
+        typer.Option("-d", "--device", help="Only show results for the given device. Can be specified multiple times."),
+    ] = None,
+    refresh: Annotated[
+        bool,
+        typer.Option(help="Refresh the local cache for sessions that changed since the last run before ranking."),
+    ] = True,
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of sessions refreshed concurrently.")] = 8,
+    url: Annotated[
+        str | None,
+        typer.Option(
+            help="Overwrite the base URL used to communicate with the service. If "
+            "not provided will use the one controlled by MAKORA_URL env var. "
+            "Use `makora info` for its value."
+        ),
+    ] = None,
+) -> None:
+    """Show the fastest kernels per problem and device across all sessions."""
+    asyncio.run(cli_top_async(k, metric, device or None, refresh, concurrency, url))
@@ -0,0 +1,47 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import typer
+
+from ..models.internal import TargetDevice
+from ..store.detached import JobKind, QueueFull, get_job_registry, spawn_worker
+from .strings import format_device
+
+
+def submit_detached_jobs(
+    kind: JobKind,
+    devices: list[TargetDevice],
+    name: str,
+    reference_code: str,
+    optimized_code: str,
+    url: str | None = None,
+) -> None:
+    """Queue one job per device for the background worker and tell the user how to get the results."""
+    registry = get_job_registry()
+    try:
+        jobs = [registry.submit(kind, device, name, reference_code, optimized_code, url) for device in devices]
+    except QueueFull as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+    if not spawn_worker():
+        typer.echo("Warning: Could not start a background process, jobs will run with the next detached command.")
+
+    for job in jobs:
+        typer.echo(f"Submitted {kind.value} job {job.id[:8]} on {format_device(job.device)}.")
+    if len(jobs) == 1:
+        typer.echo(f"Use 'makora results {jobs[0].id[:8]}' to get the result.")
+    else:
+        typer.echo("Use 'makora results' to see their status and 'makora results <id>' to get a result.")
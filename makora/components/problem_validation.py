@@ -19,7 +19,8 @@ from rich.console import Console
 
 from ..utils import get_rich_console
 from ..web.conn import Connection
-from ..web.problems import submit_and_poll_validation
+from ..web.problems import get_cached_validation, submit_and_poll_validation
+from ..store.history import get_performance_history, history_guard
 from ..models.internal import TargetDevice
 from ..models.openapi import StepStatus
 from ..components.spinner import show_spinner
@@ -44,29 +45,38 @@ async def validate_problem(
     interactive: bool,
     hint_command: str | None = None,
     console: Console | None = None,
+    use_cache: bool = True,
 ) -> tuple[UUID, str, bool] | None:
     if console is None:
         console = get_rich_console()
 
     revalidating = False
     while True:
-        spinner_message = "Re-testing fixed code..." if revalidating else "Validating problem..."
-        with show_spinner(spinner_message) as spinner:
-
-            def on_progress(step: str) -> None:
-                if spinner is None:
-                    return
-                label = STEP_TO_SPINNER_LABEL.get(step, f"{step}...")
-                spinner.update(f"[cyan]{label}[/cyan]")
-
-            status = await submit_and_poll_validation(
-                conn,
-                code,
-                label,
-                target_device=device,
-                fix=fix,
-                on_progress=on_progress,
-            )
+        cached = get_cached_validation(code, label, device, fix, url=conn.base_url) if use_cache else None
+        if cached is not None:
+            console.print("[dim]Identical code was validated recently, reusing its result.[/dim]")
+            status = cached
+        else:
+            spinner_message = "Re-testing fixed code..." if revalidating else "Validating problem..."
+            with show_spinner(spinner_message) as spinner:
+
+                def on_progress(step: str) -> None:
+                    if spinner is None:
+                        return
+                    label = STEP_TO_SPINNER_LABEL.get(step, f"{step}...")
+                    spinner.update(f"[cyan]{label}[/cyan]")
+
+                status = await submit_and_poll_validation(
+                    conn,
+                    code,
+                    label,
+                    target_device=device,
+                    fix=fix,
+                    on_progress=on_progress,
+                )
+            if status.status == StepStatus.completed:
+                with history_guard():
+                    get_performance_history().record_validation(status, device)
 
         print_validation_result(status, show_benchmark=True)
 
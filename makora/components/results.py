@@ -14,6 +14,8 @@
 
 
 import textwrap
+from enum import Enum
+from typing import TYPE_CHECKING
 
 from rich.console import Console
 from rich.panel import Panel
@@ -23,11 +25,15 @@ from rich import box
 from ..utils import get_rich_console
 from ..models.openapi import (
     AppEvaluationEvaluationStepBenchmarkingResult,
+    EvalRefMode,
     LogMessage,
     ProblemValidationTaskStatus,
     StepStatus,
 )
-from .strings import format_status, format_time, create_styled_table
+from .strings import format_ref_mode, format_speedup, format_status, format_time, create_styled_table
+
+if TYPE_CHECKING:
+    from ..stats import ShapeTiming
 
 
 def create_logs_table(
@@ -69,6 +75,8 @@ def create_benchmark_table(
     result: AppEvaluationEvaluationStepBenchmarkingResult,
     title: str = "Benchmark Results",
 ) -> Table | None:
+    from ..stats import geometric_mean
+
     if not result.benchmarked:
         return None
 
@@ -84,12 +92,94 @@ def create_benchmark_table(
         if isinstance(result.optimized_time, list):
             for i, t in enumerate(result.optimized_time):
                 table.add_row(f"Optimized (shape {i + 1})", format_time(t, result.optimized_time_unit))
+            # The reference is only timed as a whole, per-shape speedups cannot be told here
+            if len(result.optimized_time) > 1 and all(t > 0 for t in result.optimized_time):
+                table.add_row(
+                    "Optimized (geomean)",
+                    format_time(geometric_mean(result.optimized_time), result.optimized_time_unit),
+                )
         else:
             table.add_row("Optimized", format_time(result.optimized_time, result.optimized_time_unit))
 
     return table
 
 
+class ShapeOrder(Enum):
+    shape = "shape"
+    time = "time"
+    eager = "eager"
+    compiled = "compiled"
+
+
+#: Reference modes the per-shape speedups are shown against, the last available one decides the worst shape
+SHAPE_REFERENCE_MODES = (EvalRefMode.EAGER, EvalRefMode.COMPILED)
+
+
+def _sort_shapes(shapes: list["ShapeTiming"], order: ShapeOrder) -> list["ShapeTiming"]:
+    if order == ShapeOrder.time:
+        return sorted(shapes, key=lambda s: s.optimized, reverse=True)
+    if order in (ShapeOrder.eager, ShapeOrder.compiled):
+        mode = EvalRefMode.EAGER if order == ShapeOrder.eager else EvalRefMode.COMPILED
+        # Worst shapes first, shapes without that reference last
+        return sorted(shapes, key=lambda s: (s.speedup(mode) is None, s.speedup(mode) or 0.0))
+    return sorted(shapes, key=lambda s: s.shape)
+
+
+def create_shape_table(
+    shapes: list["ShapeTiming"],
+    order: ShapeOrder = ShapeOrder.shape,
+    title: str = "Per-Shape Speedups",
+) -> Table | None:
+    """Times and speedups of every shape, with the geometric mean over all shapes and the worst shape marked."""
+    from ..stats import geometric_mean
+
+    if not shapes:
+        return None
+    modes = [mode for mode in SHAPE_REFERENCE_MODES if all(mode in s.reference for s in shapes)]
+
+    table = create_styled_table(title)
+    table.add_column("Shape", style="cyan", no_wrap=True)
+    table.add_column("Solution", justify="right")
+    for mode in modes:
+        table.add_column(format_ref_mode(mode), justify="right")
+        table.add_column(f"vs {format_ref_mode(mode)}", justify="right")
+
+    worst = min(shapes, key=lambda s: s.speedup(modes[-1]) or 0.0) if modes else None
+    for shape in _sort_shapes(shapes, order):
+        label = str(shape.shape)
+        if shape is worst and len(shapes) > 1:
+            label += " [red](worst)[/red]"
+        row = [label, format_time(shape.optimized, shape.unit)]
+        for mode in modes:
+            row.extend([format_time(shape.reference.get(mode), shape.unit), format_speedup(shape.speedup(mode))])
+        table.add_row(*row)
+
+    table.add_section()
+    row = ["Geomean", format_time(geometric_mean([s.optimized for s in shapes]), shapes[0].unit)]
+    for mode in modes:
+        speedups = [s.speedup(mode) for s in shapes]
+        row.extend(["", format_speedup(geometric_mean([v for v in speedups if v is not None]))])
+    table.add_row(*row, style="bold")
+
+    return table
+
+
+def print_shape_speedups(
+    shapes: list["ShapeTiming"],
+    order: ShapeOrder = ShapeOrder.shape,
+    console: Console | None = None,
+) -> None:
+    """Print the per-shape breakdown, only worth it for benchmarks of several shapes."""
+    if len(shapes) < 2:
+        return
+
+    if console is None:
+        console = get_rich_console()
+    table = create_shape_table(shapes, order)
+    if table:
+        console.print(table)
+
+
 def print_benchmark_result(
     result: AppEvaluationEvaluationStepBenchmarkingResult | None,
     console: Console | None = None,
@@ -14,13 +14,18 @@
 
 
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 from rich.table import Table
 from rich import box
+from rich.markup import escape
 
-from ..models.openapi import StepStatus, KernelEvaluationStatus, Unit
+from ..models.openapi import EvalRefMode, StepStatus, KernelEvaluationStatus, Unit
 from ..models.internal import TargetDevice
 
+if TYPE_CHECKING:
+    from ..stats import SpeedupEstimate
+
 
 STATUS_COLORS = {
     "in_progress": "yellow",
@@ -46,6 +51,8 @@ STATUS_LABELS = {
     "cancelled": "cancelled",
 }
 
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
 
 DEVICE_LABELS = {
     TargetDevice.H100: "NVIDIA H100",
@@ -60,6 +67,15 @@ DEVICE_LABELS = {
 }
 
 
+REF_MODE_LABELS = {
+    EvalRefMode.EAGER: "eager",
+    EvalRefMode.COMPILED: "torch.compile",
+    EvalRefMode.REDUCE_OVERHEAD: "reduce-overhead",
+    EvalRefMode.MAX_AUTOTUNE: "max-autotune",
+    EvalRefMode.MAX_AUTOTUNE_NO_CUDAGRAPHS: "max-autotune-no-cudagraphs",
+}
+
+
 def format_status(status: StepStatus | KernelEvaluationStatus | str | None) -> str:
     if isinstance(status, (StepStatus, KernelEvaluationStatus)):
         status_str = status.value.lower()
@@ -101,6 +117,10 @@ def format_device(device: TargetDevice | str | None) -> str:
     return device or "-"
 
 
+def format_ref_mode(mode: EvalRefMode) -> str:
+    return REF_MODE_LABELS.get(mode, mode.value.lower())
+
+
 def format_time(value: float | None, unit: Unit | None = None) -> str:
     if value is None:
         return "-"
@@ -121,6 +141,50 @@ def format_speedup(ratio: float | None) -> str:
             return f"[red]{slowdown:.2f}x slower[/red]"
 
 
+def format_p_value(p_value: float) -> str:
+    if p_value < 0.01:
+        return "p<0.01"
+    if p_value < 0.05:
+        return "p<0.05"
+    return f"p={p_value:.2f}"
+
+
+def format_speedup_estimate(estimate: "SpeedupEstimate", color: bool = True) -> str:
+    text = f"{estimate.speedup:.2f}x [{estimate.low:.2f}–{estimate.high:.2f}], {format_p_value(estimate.p_value)}"
+    if color:
+        # Only a significant difference is worth highlighting
+        if estimate.p_value >= 0.05:
+            text = f"[dim]{escape(text)}[/dim]"
+        elif estimate.speedup >= 1.0:
+            text = f"[green]{escape(text)}[/green]"
+        else:
+            text = f"[red]{escape(text)}[/red]"
+    if estimate.noisy:
+        noisy = f"noisy, CV {estimate.max_cv:.0%}"
+        text += f" [yellow]({noisy})[/yellow]" if color else f" ({noisy})"
+    return text
+
+
+def format_sparkline(values: list[float]) -> str:
+    """Render values as a line of block characters, from the lowest to the highest."""
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    span = high - low
+    if span == 0:
+        return SPARK_CHARS[len(SPARK_CHARS) // 2] * len(values)
+    return "".join(SPARK_CHARS[round((v - low) / span * (len(SPARK_CHARS) - 1))] for v in values)
+
+
+def format_size(num_bytes: int) -> str:
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
 def create_styled_table(title: str | None = None) -> Table:
     """Create a table with consistent styling."""
     return Table(
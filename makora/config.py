@@ -14,10 +14,20 @@
 
 """Configuration management for Makora CLI."""
 
+from pathlib import Path
+
 from .utils import EnvVar
 
 
 GENERATE_BASE_URL = EnvVar("MAKORA_URL", "https://generate.makora.com")
+DATA_DIR = EnvVar("MAKORA_DATA_DIR", "~/.makora")
+CACHE_TTL = EnvVar("MAKORA_CACHE_TTL", "15")
+CACHE_MAX_MB = EnvVar("MAKORA_CACHE_MAX_MB", "256")
+CACHE_COMPRESSION = EnvVar("MAKORA_CACHE_COMPRESSION", "auto")
+PREFETCH_SESSIONS = EnvVar("MAKORA_PREFETCH", "0")
+PREFETCH_MAX_REQUESTS = EnvVar("MAKORA_PREFETCH_MAX_REQUESTS", "50")
+PREFETCH_MAX_MB = EnvVar("MAKORA_PREFETCH_MAX_MB", "20")
+DETACHED_CONCURRENCY = EnvVar("MAKORA_DETACHED_CONCURRENCY", "2")
 
 
 def _normalize_generate_api_url(url: str) -> str:
@@ -30,3 +40,10 @@ def _normalize_generate_api_url(url: str) -> str:
 def get_generate_base_url(url: str | None = None) -> str:
     """Get normalized base URL for Generate API requests."""
     return _normalize_generate_api_url(url or GENERATE_BASE_URL.value)
+
+
+def get_data_dir(*parts: str) -> Path:
+    """Get (and create if missing) a directory for locally stored data."""
+    path = Path(DATA_DIR.value).expanduser().resolve().joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -13,11 +13,15 @@
 # limitations under the License.
 
 
+import re
+import fnmatch
+from datetime import datetime
 from enum import Enum
+from uuid import UUID
 
 from pydantic import BaseModel
 
-from .openapi import KernelLanguage
+from .openapi import AgentSessionSummary, KernelEvaluationStatus, KernelLanguage, StepStatus, Unit
 
 
 class TargetDevice(Enum):
@@ -108,6 +112,118 @@ class TargetDevice(Enum):
                 raise NotImplementedError()
 
 
+class KernelSummary(BaseModel):
+    """Listing view of ``EvaluatedKernel`` - all of its fields except ``code``.
+
+    Unknown fields are ignored during validation, so decoding a kernels payload
+    into this model never materializes the (potentially large) kernel sources.
+    """
+
+    id: UUID
+    attempt_id: UUID | None
+    name: str
+    time: float | None = None
+    time_unit: Unit | None = None
+    evaluation_status: KernelEvaluationStatus | None = KernelEvaluationStatus.NOT_STARTED
+    reference_eager: float | None = None
+    reference_eager_unit: Unit | None = None
+    reference_compile: float | None = None
+    reference_compile_unit: Unit | None = None
+    speed_up_eager: float | None = None
+    speed_up_compiled: float | None = None
+    is_close_miss: bool | None = None
+    best_atol: float | None = None
+    best_rtol: float | None = None
+    created_at: datetime
+
+
+class AttemptKernelSummaries(BaseModel):
+    id: UUID
+    attempt_number: int
+    status: StepStatus
+    started_at: datetime
+    kernels: list[KernelSummary]
+
+
+class SessionKernelSummaries(BaseModel):
+    session_id: UUID
+    attempts: list[AttemptKernelSummaries]
+    total_attempts: int
+    best_time: float | None = None
+    best_speedup_eager: float | None = None
+    best_speedup_compiled: float | None = None
+
+
 class SessionExtra(BaseModel):
     speedup: float | None = None
     device: TargetDevice | None = None
+
+
+TERMINAL_STATUSES = frozenset({StepStatus.completed, StepStatus.failed, StepStatus.cancelled})
+
+
+class SessionSortKey(Enum):
+    started = "started"
+    status = "status"
+    label = "label"
+    device = "device"
+    language = "language"
+
+
+def compile_label_pattern(label: str) -> "re.Pattern[str]":
+    """Compile a ``SessionFilter.label`` pattern, raises :class:`re.error` for an invalid regex."""
+    if len(label) > 1 and label.startswith("/") and label.endswith("/"):
+        return re.compile(label[1:-1])
+    return re.compile("^" + fnmatch.translate(label), re.IGNORECASE)
+
+
+class SessionFilter(BaseModel):
+    """Client-side selection of sessions, evaluated purely on summary fields.
+
+    A ``label`` pattern wrapped in slashes (``/pattern/``) is treated as a regular
+    expression (searched, not anchored), anything else as a case-insensitive glob.
+    """
+
+    statuses: list[StepStatus] | None = None
+    devices: list[TargetDevice] | None = None
+    languages: list[KernelLanguage] | None = None
+    since: datetime | None = None
+    label: str | None = None
+    sort: SessionSortKey | None = None
+    limit: int | None = None
+
+    def _label_matcher(self) -> "re.Pattern[str] | None":
+        return compile_label_pattern(self.label) if self.label else None
+
+    def matches(self, session: AgentSessionSummary, label_re: "re.Pattern[str] | None" = None) -> bool:
+        if self.statuses and session.status not in self.statuses:
+            return False
+        if self.devices and session.target_hardware not in {d.to_api_device() for d in self.devices}:
+            return False
+        if self.languages and session.target_language not in self.languages:
+            return False
+        if self.since is not None and session.started_at < self.since:
+            return False
+        if label_re is not None and not label_re.search(session.label or ""):
+            return False
+        return True
+
+    def apply(self, sessions: list[AgentSessionSummary]) -> list[AgentSessionSummary]:
+        label_re = self._label_matcher()
+        ret = [s for s in sessions if self.matches(s, label_re)]
+
+        match self.sort:
+            case SessionSortKey.started:
+                ret.sort(key=lambda s: s.started_at, reverse=True)
+            case SessionSortKey.status:
+                ret.sort(key=lambda s: s.status.value if isinstance(s.status, StepStatus) else str(s.status))
+            case SessionSortKey.label:
+                ret.sort(key=lambda s: (s.label or "").lower())
+            case SessionSortKey.device:
+                ret.sort(key=lambda s: s.target_hardware)
+            case SessionSortKey.language:
+                ret.sort(key=lambda s: s.target_language.value)
+
+        if self.limit is not None:
+            ret = ret[: self.limit]
+        return ret
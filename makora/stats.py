@@ -0,0 +1,362 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Statistics of benchmark timings.
+
+The speedup of a kernel is estimated from the individual timing samples of the
+reference and the kernel (``TimingStats.all_values``), per benchmarked shape. The
+speedup of a shape is the ratio of the median times, the overall speedup is the
+geometric mean over all shapes. Its confidence interval is obtained by bootstrap
+resampling of every shape, and the significance of the difference by a Mann-Whitney
+U test of the samples normalized by the reference median of their shape.
+"""
+
+import math
+import statistics
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .models.openapi import (
+    AppEvaluationEvaluationBenchmarkingResult,
+    EvalRefMode,
+    KernelEvaluation,
+    TimingStats,
+    Unit,
+)
+
+
+#: Timings whose coefficient of variation exceeds that are considered too noisy to trust
+NOISY_CV = 0.05
+
+#: Reference modes the speedup reported by the service is computed against, in order of preference
+REFERENCE_MODES = (EvalRefMode.COMPILED, EvalRefMode.EAGER)
+
+Samples = npt.NDArray[np.float64]
+
+
+class SpeedupEstimate(NamedTuple):
+    speedup: float
+    low: float
+    high: float
+    confidence: float
+    p_value: float
+    #: Highest coefficient of variation of any of the sample vectors
+    max_cv: float
+
+    @property
+    def noisy(self) -> bool:
+        return self.max_cv > NOISY_CV
+
+
+def geometric_mean(values: Sequence[float]) -> float:
+    return math.exp(sum(math.log(v) for v in values) / len(values))
+
+
+def coefficient_of_variation(samples: Samples) -> float:
+    mean = float(np.mean(samples))
+    if len(samples) < 2 or mean == 0.0:
+        return 0.0
+    return float(np.std(samples, ddof=1)) / mean
+
+
+def _rankdata(values: Samples) -> Samples:
+    """Ranks starting at 1, tied values get the average of their ranks."""
+    sorter = np.argsort(values, kind="mergesort")
+    inverse = np.empty_like(sorter)
+    inverse[sorter] = np.arange(len(values))
+    ordered = values[sorter]
+    distinct = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+    dense = np.cumsum(distinct)[inverse]
+    bounds = np.concatenate((np.nonzero(distinct)[0], [len(values)]))
+    ranks: Samples = 0.5 * (bounds[dense] + bounds[dense - 1] + 1)
+    return ranks
+
+
+def mann_whitney_u(a: Samples, b: Samples) -> float:
+    """Two-sided p-value of the Mann-Whitney U test, using the normal approximation with tie correction."""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    pooled = np.concatenate((a, b))
+    n = n1 + n2
+    u1 = float(np.sum(_rankdata(pooled)[:n1])) - n1 * (n1 + 1) / 2
+    _, ties = np.unique(pooled, return_counts=True)
+    tie_term = float(np.sum(ties.astype(np.float64) ** 3 - ties)) / (n * (n - 1)) if n > 1 else 0.0
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0.0:
+        return 1.0
+
+    z = max(abs(u1 - n1 * n2 / 2) - 0.5, 0.0) / sigma
+    return math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_speedup(
+    reference: Sequence[Samples],
+    optimized: Sequence[Samples],
+    confidence: float = 0.95,
+    resamples: int = 10_000,
+    seed: int | None = 0,
+) -> tuple[float, float, float]:
+    """Speedup over all shapes and its bootstrap percentile confidence interval.
+
+    Returns the point estimate and the lower and upper bounds of the interval.
+    """
+    rng = np.random.default_rng(seed)
+    log_point = 0.0
+    log_resampled = np.zeros(resamples)
+    for ref, opt in zip(reference, optimized, strict=True):
+        log_point += math.log(float(np.median(ref)) / float(np.median(opt)))
+        # All resamples of a shape at once, a (resamples, n) matrix per sample vector
+        ref_medians = np.median(ref[rng.integers(0, len(ref), (resamples, len(ref)))], axis=1)
+        opt_medians = np.median(opt[rng.integers(0, len(opt), (resamples, len(opt)))], axis=1)
+        log_resampled += np.log(ref_medians / opt_medians)
+
+    shapes = len(reference)
+    alpha = (1.0 - confidence) / 2
+    low, high = np.quantile(log_resampled / shapes, [alpha, 1.0 - alpha])
+    return math.exp(log_point / shapes), math.exp(float(low)), math.exp(float(high))
+
+
+def timing_samples(stats: TimingStats) -> Samples | None:
+    if not stats.all_values:
+        return None
+    return np.asarray(stats.all_values, dtype=np.float64)
+
+
+def inlier_samples(stats: TimingStats) -> Samples | None:
+    """Samples without the values the benchmark itself flagged as outliers."""
+    samples = timing_samples(stats)
+    if samples is None or not stats.outliers:
+        return samples
+    inliers = samples[~np.isin(samples, stats.outliers)]
+    return inliers if len(inliers) else samples
+
+
+def outlier_indices(values: Sequence[float]) -> set[int]:
+    """Indices of values outside of Tukey's fences (1.5 IQR beyond the quartiles)."""
+    if len(values) < 4:
+        return set()
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    return {i for i, value in enumerate(values) if not low <= value <= high}
+
+
+def estimate_speedup(
+    reference: Sequence[TimingStats],
+    optimized: Sequence[TimingStats],
+    confidence: float = 0.95,
+    resamples: int = 10_000,
+) -> SpeedupEstimate | None:
+    """Estimate the speedup from per-shape timings, ``None`` if the samples are not available."""
+    if not reference or len(reference) != len(optimized):
+        return None
+
+    ref_samples = [timing_samples(stats) for stats in reference]
+    opt_samples = [timing_samples(stats) for stats in optimized]
+    refs = [s for s in ref_samples if s is not None]
+    opts = [s for s in opt_samples if s is not None]
+    if len(refs) != len(reference) or len(opts) != len(optimized):
+        return None
+
+    return estimate_samples_speedup(refs, opts, confidence, resamples)
+
+
+def estimate_samples_speedup(
+    refs: Sequence[Samples],
+    opts: Sequence[Samples],
+    confidence: float = 0.95,
+    resamples: int = 10_000,
+) -> SpeedupEstimate:
+    """Estimate the speedup from per-shape sample vectors of the reference and the kernel."""
+    speedup, low, high = bootstrap_speedup(refs, opts, confidence, resamples)
+
+    # Shapes can differ in their times by orders of magnitude, compare relative to the reference
+    scales = [float(np.median(ref)) for ref in refs]
+    p_value = mann_whitney_u(
+        np.concatenate([ref / scale for ref, scale in zip(refs, scales)]),
+        np.concatenate([opt / scale for opt, scale in zip(opts, scales)]),
+    )
+    max_cv = max(coefficient_of_variation(s) for s in [*refs, *opts])
+    return SpeedupEstimate(speedup, low, high, confidence, p_value, max_cv)
+
+
+def reference_timings(
+    result: AppEvaluationEvaluationBenchmarkingResult, mode: EvalRefMode | None = None
+) -> list[TimingStats] | None:
+    """Per-shape timings of the reference in the given mode, or the preferred available mode."""
+    baselines = {baseline.mode: baseline for baseline in result.ref_times or []}
+    modes = (mode,) if mode is not None else REFERENCE_MODES
+    for candidate in modes:
+        if candidate in baselines:
+            return [timing.kernel for timing in baselines[candidate].results]
+    return None
+
+
+def estimate_evaluation_speedup(
+    evaluation: KernelEvaluation, mode: EvalRefMode | None = None
+) -> SpeedupEstimate | None:
+    """Estimate the speedup of an evaluated kernel over the reference, ``None`` without timing samples."""
+    result = evaluation.benchmarking_result
+    if result is None or not result.user_times:
+        return None
+
+    reference = reference_timings(result, mode)
+    if reference is None:
+        return None
+    return estimate_speedup(reference, [timing.kernel for timing in result.user_times])
+
+
+class RunTimings(NamedTuple):
+    """Per-shape samples of the reference and the kernel of a single evaluation."""
+
+    reference: list[Samples]
+    optimized: list[Samples]
+
+    @property
+    def speedup(self) -> float:
+        return geometric_mean(
+            [float(np.median(ref)) / float(np.median(opt)) for ref, opt in zip(self.reference, self.optimized)]
+        )
+
+
+def evaluation_timings(evaluation: KernelEvaluation, mode: EvalRefMode | None = None) -> RunTimings | None:
+    """Samples of an evaluation without the outliers flagged by the benchmark."""
+    result = evaluation.benchmarking_result
+    if result is None or not result.user_times:
+        return None
+
+    reference = reference_timings(result, mode)
+    if reference is None:
+        return None
+    return run_timings(reference, [timing.kernel for timing in result.user_times])
+
+
+def run_timings(reference: Sequence[TimingStats], optimized: Sequence[TimingStats]) -> RunTimings | None:
+    """Samples of per-shape timings without the outliers flagged by the benchmark."""
+    if not reference or len(reference) != len(optimized):
+        return None
+
+    refs = [inlier_samples(stats) for stats in reference]
+    opts = [inlier_samples(stats) for stats in optimized]
+    if any(s is None for s in refs) or any(s is None for s in opts):
+        return None
+    return RunTimings([s for s in refs if s is not None], [s for s in opts if s is not None])
+
+
+def pooled_speedup(reference: Sequence[TimingStats], runs: Sequence[Sequence[TimingStats]]) -> float | None:
+    """Speedup over a reference measured once, of the per-shape timings of the kernel pooled over runs.
+
+    Without samples of the reference taken alongside those of the kernel, no interval or
+    significance can be given, only the ratio of the medians.
+    """
+    if not reference or not runs or any(len(run) != len(reference) for run in runs):
+        return None
+
+    ratios = []
+    for shape, ref in enumerate(reference):
+        ref_samples = inlier_samples(ref)
+        opt_samples = [inlier_samples(run[shape]) for run in runs]
+        if ref_samples is None or any(s is None for s in opt_samples):
+            return None
+        pooled = np.concatenate([s for s in opt_samples if s is not None])
+        ratios.append(float(np.median(ref_samples)) / float(np.median(pooled)))
+    return geometric_mean(ratios)
+
+
+class AggregatedSpeedup(NamedTuple):
+    estimate: SpeedupEstimate
+    #: Speedups of the individual runs which were pooled
+    run_speedups: list[float]
+    #: Number of runs discarded as warmup, as outliers and because they failed
+    warmup: int
+    outliers: int
+    failed: int
+
+    @property
+    def run_cv(self) -> float:
+        return coefficient_of_variation(np.asarray(self.run_speedups, dtype=np.float64))
+
+
+def aggregate_runs(runs: Sequence[RunTimings | None], warmup: int = 0) -> AggregatedSpeedup | None:
+    """Pool the samples of repeated evaluations, given in the order they were submitted.
+
+    The first ``warmup`` submitted runs are discarded, as well as runs whose speedup is an outlier
+    among all runs. ``None`` stands for a run which failed or had no samples.
+    """
+    warmup = min(warmup, max(len(runs) - 1, 0))
+    candidates = [run for run in runs[warmup:] if run is not None]
+    failed = sum(run is None for run in runs[warmup:])
+    if not candidates:
+        return None
+
+    outliers = outlier_indices([run.speedup for run in candidates])
+    used = [run for i, run in enumerate(candidates) if i not in outliers]
+    shapes = {len(run.reference) for run in used}
+    if len(shapes) != 1:
+        return None
+
+    refs = [np.concatenate([run.reference[shape] for run in used]) for shape in range(shapes.pop())]
+    opts = [np.concatenate([run.optimized[shape] for run in used]) for shape in range(len(refs))]
+    return AggregatedSpeedup(
+        estimate_samples_speedup(refs, opts),
+        [run.speedup for run in used],
+        warmup,
+        len(outliers),
+        failed,
+    )
+
+
+class ShapeTiming(NamedTuple):
+    """Median times of the kernel and of the reference in every benchmarked mode, for one input shape."""
+
+    #: Position of the shape in the benchmark, starting at 1
+    shape: int
+    optimized: float
+    reference: dict[EvalRefMode, float]
+    unit: Unit | None
+
+    def speedup(self, mode: EvalRefMode) -> float | None:
+        reference = self.reference.get(mode)
+        return reference / self.optimized if reference is not None else None
+
+
+def shape_timings(results: Sequence[AppEvaluationEvaluationBenchmarkingResult]) -> list[ShapeTiming]:
+    """Per-shape times, the median over all given benchmarks of the same code.
+
+    Empty if there are no timings of the kernel, or the benchmarks do not agree on the number of shapes.
+    """
+    user_times = [result.user_times for result in results if result.user_times]
+    counts = {len(times) for times in user_times}
+    if len(counts) != 1:
+        return []
+    (count,) = counts
+
+    timings = []
+    for shape in range(count):
+        reference: dict[EvalRefMode, float] = {}
+        for mode in EvalRefMode:
+            values = [
+                baseline.results[shape].kernel.median
+                for result in results
+                for baseline in result.ref_times or []
+                if baseline.mode == mode and len(baseline.results) == count
+            ]
+            if values:
+                reference[mode] = statistics.median(values)
+        optimized = statistics.median(times[shape].kernel.median for times in user_times)
+        timings.append(ShapeTiming(shape + 1, optimized, reference, user_times[0][shape].kernel.unit))
+    return timings
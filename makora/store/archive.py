@@ -0,0 +1,205 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-file archives of a session.
+
+Layout::
+
+    MAGIC | entry 0 | entry 1 | ... | index | trailer
+
+Every entry is compressed on its own, and the (also compressed) JSON index maps
+entry names to their ``(offset, length)``. The fixed-size trailer points to the
+index, so a reader only needs to map the file and decompress the entries it
+actually uses.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from types import TracebackType
+from typing import NamedTuple, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter
+
+from ..models.openapi import AgentLogEntryOut, AgentSession, CommandOut, KernelEvaluationDetails
+from ..models.internal import KernelSummary
+
+
+M = TypeVar("M", bound=BaseModel)
+
+ARCHIVE_MAGIC = b"MKRARCH1"
+_TRAILER = struct.Struct("<QQ8s")
+
+_kernel_summaries = TypeAdapter(list[list[KernelSummary]])
+_log_entries = TypeAdapter(list[AgentLogEntryOut])
+_command_entries = TypeAdapter(list[CommandOut])
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class ArchiveEntry(NamedTuple):
+    offset: int
+    length: int
+
+
+class ArchiveWriter:
+    """Write an archive to a temporary file, moved into place only when closed successfully."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(ARCHIVE_MAGIC)
+        self._index: dict[str, ArchiveEntry] = {}
+
+    def add(self, name: str, data: bytes) -> None:
+        if name in self._index:
+            raise ArchiveError(f"Duplicated archive entry: {name!r}")
+        compressed = zlib.compress(data, 9)
+        self._index[name] = ArchiveEntry(self._file.tell(), len(compressed))
+        self._file.write(compressed)
+
+    def add_text(self, name: str, text: str) -> None:
+        self.add(name, text.encode("utf-8"))
+
+    def add_model(self, name: str, model: BaseModel) -> None:
+        # Generated models default some enum fields to plain strings, which pydantic warns about
+        self.add(name, model.model_dump_json(warnings=False).encode("utf-8"))
+
+    def add_session(self, session: AgentSession) -> None:
+        self.add_model("session.json", session)
+        if session.request.problem_description_code.code:
+            self.add_text("refcode.py", session.request.problem_description_code.code)
+
+    def add_kernel_summaries(self, kernels: list[list[KernelSummary]]) -> None:
+        self.add("kernels.json", _kernel_summaries.dump_json(kernels))
+
+    def add_kernel_details(self, details: KernelEvaluationDetails) -> None:
+        self.add_model(f"kernels/{details.id}.json", details)
+
+    def add_logs(self, attempt_id: UUID, entries: list[AgentLogEntryOut]) -> None:
+        self.add(f"logs/{attempt_id}.json", _log_entries.dump_json(entries))
+
+    def add_commands(self, attempt_id: UUID, entries: list[CommandOut]) -> None:
+        self.add(f"commands/{attempt_id}.json", _command_entries.dump_json(entries))
+
+    def close(self) -> None:
+        index = zlib.compress(json.dumps({k: list(v) for k, v in self._index.items()}).encode("utf-8"), 9)
+        offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(_TRAILER.pack(offset, len(index), ARCHIVE_MAGIC))
+        self._file.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        Path(self._tmp).unlink(missing_ok=True)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class SessionArchive:
+    """Read-only, memory-mapped view of an archive."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < len(ARCHIVE_MAGIC) + _TRAILER.size:
+                raise ArchiveError(f"Not a session archive: {path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        offset, length, magic = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        if self._map[: len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC or magic != ARCHIVE_MAGIC:
+            self._map.close()
+            raise ArchiveError(f"Not a session archive: {path}")
+
+        raw_index = json.loads(zlib.decompress(self._map[offset : offset + length]))
+        self._index = {name: ArchiveEntry(*entry) for name, entry in raw_index.items()}
+
+    @staticmethod
+    def is_archive(path: str | Path) -> bool:
+        path = Path(path)
+        if not path.is_file():
+            return False
+        with open(path, "rb") as f:
+            return f.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "SessionArchive":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def names(self) -> list[str]:
+        return list(self._index)
+
+    def read(self, name: str) -> bytes:
+        entry = self._index.get(name)
+        if entry is None:
+            raise KeyError(name)
+        return zlib.decompress(self._map[entry.offset : entry.offset + entry.length])
+
+    def read_model(self, name: str, model: type[M]) -> M:
+        return model.model_validate_json(self.read(name))
+
+    def session(self) -> AgentSession:
+        return self.read_model("session.json", AgentSession)
+
+    def refcode(self) -> str | None:
+        if "refcode.py" not in self:
+            return None
+        return self.read("refcode.py").decode("utf-8")
+
+    def kernel_summaries(self) -> list[list[KernelSummary]]:
+        return _kernel_summaries.validate_json(self.read("kernels.json"))
+
+    def kernel_details(self, kernel_id: UUID | str) -> KernelEvaluationDetails | None:
+        name = f"kernels/{kernel_id}.json"
+        if name not in self:
+            return None
+        return self.read_model(name, KernelEvaluationDetails)
+
+    def logs(self, attempt_id: UUID | str) -> list[AgentLogEntryOut]:
+        name = f"logs/{attempt_id}.json"
+        return _log_entries.validate_json(self.read(name)) if name in self else []
+
+    def commands(self, attempt_id: UUID | str) -> list[CommandOut]:
+        name = f"commands/{attempt_id}.json"
+        return _command_entries.validate_json(self.read(name)) if name in self else []
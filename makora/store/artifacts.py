@@ -0,0 +1,194 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export of profiles as separate files.
+
+Every field of every profiled kernel is written to its own file in a directory per
+kernel, and ``manifest.json`` indexes all of them. Metrics are written as JSON and
+CSV, with an additional CSV of the metrics of all kernels. The torch profiler trace
+is written as the service returns it, labelled as a Chrome trace, which Perfetto and
+``chrome://tracing`` open, only if it has the shape of one. Texts are written to their
+files as they are, reports of several megabytes are never copied into further
+strings, and no file is ever left half-written.
+"""
+
+import csv
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from pydantic import BaseModel
+
+from ..version import version
+from ..models.openapi import KernelProfile, KernelProfilingDetails
+from .kernels import atomic_open
+
+
+MANIFEST_NAME = "manifest.json"
+
+#: Text fields of a kernel profile, with the file they are written to and the format of their content
+_TEXT_ARTIFACTS = (
+    ("details_page_text", "details.txt", "text"),
+    ("details_page_all_text", "details_all.txt", "text"),
+    ("source_page_text", "source_page.txt", "text"),
+    ("nsys_report_text", "nsys_report.txt", "text"),
+    ("source_sass_code", "source.sass", "sass"),
+    ("source_cuda_code", "source.cu", "cuda"),
+    ("annotated_source_file", "annotated_source.txt", "text"),
+)
+
+
+class Artifact(BaseModel):
+    #: Field of the kernel profile the file was written from
+    field: str
+    #: Path relative to the directory of the manifest
+    path: str
+    format: str
+    size: int
+
+
+class KernelArtifacts(BaseModel):
+    kernel: int
+    artifacts: list[Artifact] = []
+
+
+class ProfileManifest(BaseModel):
+    profile_id: str
+    name: str
+    target_hardware: str | None = None
+    profiled_at: datetime | None = None
+    exported_at: datetime
+    cli_version: str
+    #: CSV of the metrics of all kernels, one row per kernel and metric
+    metrics: str | None = None
+    kernels: list[KernelArtifacts] = []
+
+    @property
+    def artifact_count(self) -> int:
+        return sum(len(kernel.artifacts) for kernel in self.kernels) + (self.metrics is not None)
+
+
+def _metric_value(value: Any) -> Any:
+    return value if isinstance(value, (str, int, float, bool)) or value is None else json.dumps(value)
+
+
+#: Number of leading characters of a trace inspected to tell its format
+_TRACE_HEAD = 1 << 16
+
+
+def _trace_format(trace: str) -> str:
+    """``chrome-trace`` for a JSON object with ``traceEvents`` or an array of events, ``json`` or ``text`` otherwise.
+
+    Traces can be many megabytes, so only their beginning and end are inspected instead of parsing them.
+    """
+    head = trace[:_TRACE_HEAD].lstrip()
+    tail = trace[-64:].rstrip()
+    if not (head.startswith("{") and tail.endswith("}")) and not (head.startswith("[") and tail.endswith("]")):
+        return "text"
+    if head.startswith("{") and '"traceEvents"' in head:
+        return "chrome-trace"
+    if head.startswith("[") and head[1:].lstrip().startswith("{") and '"ph"' in head:
+        return "chrome-trace"
+    return "json"
+
+
+class _Writer:
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = out_dir
+
+    def write(self, relative: str, field: str, format: str, fill: Callable[[TextIO], Any]) -> Artifact:
+        path = self.out_dir / relative
+        with atomic_open(path) as f:
+            fill(f)
+        return Artifact(field=field, path=relative, format=format, size=path.stat().st_size)
+
+    def write_text(self, relative: str, field: str, format: str, text: str) -> Artifact:
+        return self.write(relative, field, format, lambda f: f.write(text))
+
+
+def _write_metrics_csv(f: TextIO, rows: list[tuple[Any, ...]], header: tuple[str, ...]) -> None:
+    writer = csv.writer(f)
+    writer.writerow(header)
+    writer.writerows(rows)
+
+
+def _write_kernel(writer: _Writer, index: int, kernel: KernelProfile) -> KernelArtifacts:
+    prefix = f"kernel_{index:02d}"
+    result = KernelArtifacts(kernel=index)
+
+    if kernel.raw_metrics:
+        metrics = kernel.raw_metrics
+        result.artifacts.append(
+            writer.write(
+                f"{prefix}/metrics.json",
+                "raw_metrics",
+                "json",
+                lambda f: json.dump(metrics, f, indent=2, sort_keys=True, default=str),
+            )
+        )
+        rows = [(name, _metric_value(value)) for name, value in sorted(metrics.items())]
+        result.artifacts.append(
+            writer.write(
+                f"{prefix}/metrics.csv",
+                "raw_metrics",
+                "csv",
+                lambda f: _write_metrics_csv(f, rows, ("metric", "value")),
+            )
+        )
+
+    for field, filename, format in _TEXT_ARTIFACTS:
+        text = getattr(kernel, field)
+        if text:
+            result.artifacts.append(writer.write_text(f"{prefix}/{filename}", field, format, text))
+
+    if kernel.torch_trace:
+        format = _trace_format(kernel.torch_trace)
+        filename = "torch_trace.txt" if format == "text" else "torch_trace.json"
+        result.artifacts.append(writer.write_text(f"{prefix}/{filename}", "torch_trace", format, kernel.torch_trace))
+
+    return result
+
+
+def write_profile_artifacts(details: KernelProfilingDetails, out_dir: Path) -> ProfileManifest:
+    """Write all fields of all profiled kernels to ``out_dir``, the manifest last."""
+    run = details.kernel_profiling_run
+    kernels = run.profiling_result.kernel_info if run is not None and run.profiling_result is not None else None
+    writer = _Writer(out_dir)
+
+    manifest = ProfileManifest(
+        profile_id=str(details.id),
+        name=details.name,
+        target_hardware=run.target_hardware if run is not None else None,
+        profiled_at=(run.finished_at if run is not None else None) or details.created_at,
+        exported_at=datetime.now(timezone.utc),
+        cli_version=version,
+    )
+    for index, kernel in enumerate(kernels or [], start=1):
+        manifest.kernels.append(_write_kernel(writer, index, kernel))
+
+    rows = [
+        (index, name, _metric_value(value))
+        for index, kernel in enumerate(kernels or [], start=1)
+        for name, value in sorted((kernel.raw_metrics or {}).items())
+    ]
+    if rows:
+        writer.write(
+            "metrics.csv", "raw_metrics", "csv", lambda f: _write_metrics_csv(f, rows, ("kernel", "metric", "value"))
+        )
+        manifest.metrics = "metrics.csv"
+
+    with atomic_open(out_dir / MANIFEST_NAME) as f:
+        f.write(manifest.model_dump_json(indent=2))
+    return manifest
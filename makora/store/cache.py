@@ -0,0 +1,332 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local cache of service responses.
+
+Entries are either immutable - e.g. the refcode of a session, or the kernels of a
+session which already finished - and are then served for as long as they are kept,
+or they expire after a time to live chosen by the reader.
+
+All namespaces share a single SQLite database, which makes every update atomic and
+serializes concurrently running CLI processes (on all platforms). Reads never write:
+hit counts and access times are collected in memory and written once, when the
+process exits or before entries are evicted. Larger payloads
+are compressed with zstd when available (Python 3.14+ or the ``zstandard`` package),
+with gzip otherwise. Once the total size exceeds ``MAKORA_CACHE_MAX_MB``, the least
+recently used entries are evicted. The kernel store filled by ``makora sync`` is not
+part of the cache and does not count toward that budget.
+"""
+
+import gzip
+import time
+import atexit
+import sqlite3
+import importlib
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import NamedTuple
+
+import typer
+
+from ..config import CACHE_COMPRESSION, CACHE_MAX_MB, CACHE_TTL, get_data_dir
+
+
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    data BLOB NOT NULL,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    immutable INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_DROP = """
+DROP TABLE IF EXISTS entries;
+DROP TABLE IF EXISTS stats;
+"""
+
+#: Payloads smaller than that are not worth compressing
+_MIN_COMPRESSED_SIZE = 512
+#: Seconds to wait for other processes writing to the cache
+_TIMEOUT = 30.0
+_FLUSH_TIMEOUT = 1.0
+#: Access times are only updated for entries not accessed for that long, which is precise enough for LRU
+_TOUCH_INTERVAL = 60.0
+
+_CODECS = ("auto", "zstd", "gzip", "none")
+
+
+@lru_cache(maxsize=1, typed=False)
+def _load_zstd() -> ModuleType | None:
+    for name in ("compression.zstd", "zstandard"):
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=1, typed=False)
+def _get_codec() -> str:
+    codec = CACHE_COMPRESSION.value.lower() or "auto"
+    if codec not in _CODECS:
+        typer.echo(
+            f"Warning: Unknown MAKORA_CACHE_COMPRESSION '{CACHE_COMPRESSION.value}', "
+            f"use any of {', '.join(_CODECS)}. Falling back to auto.",
+            err=True,
+        )
+        codec = "auto"
+    if codec == "auto":
+        return "zstd" if _load_zstd() is not None else "gzip"
+    if codec == "zstd" and _load_zstd() is None:
+        return "gzip"
+    return codec
+
+
+def _compress(data: bytes) -> tuple[bytes, str]:
+    codec = _get_codec() if len(data) >= _MIN_COMPRESSED_SIZE else "none"
+    if codec == "zstd":
+        zstd = _load_zstd()
+        assert zstd is not None
+        return zstd.compress(data), codec
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6), codec
+    return data, "none"
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        zstd = _load_zstd()
+        if zstd is None:
+            raise ValueError("Cache entry is compressed with zstd which is not available")
+        result: bytes = zstd.decompress(data)
+        return result
+    if codec == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+def get_default_ttl() -> float:
+    try:
+        return max(0.0, float(CACHE_TTL.value))
+    except ValueError:
+        return 0.0
+
+
+def get_max_cache_bytes() -> int:
+    try:
+        return int(float(CACHE_MAX_MB.value) * 2**20)
+    except ValueError:
+        return 256 * 2**20
+
+
+class NamespaceStats(NamedTuple):
+    namespace: str
+    entries: int
+    immutable: int
+    size: int
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float | None:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+class CacheNamespace:
+    """View of a single namespace of a :class:`ResourceCache`."""
+
+    def __init__(self, cache: "ResourceCache", name: str) -> None:
+        self.cache = cache
+        self.name = name
+
+    def get(self, key: str, max_age: float | None = None) -> bytes | None:
+        return self.cache.get(self.name, key, max_age)
+
+    def put(self, key: str, data: bytes, immutable: bool = False) -> None:
+        self.cache.put(self.name, key, data, immutable)
+
+    def find_keys(self, key_prefix: str) -> list[str]:
+        return self.cache.find_keys(self.name, key_prefix)
+
+
+class ResourceCache:
+    def __init__(self, path: Path, max_bytes: int | None = None) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        # Other CLI processes might be writing at the same time, wait for them rather than fail
+        self.db = sqlite3.connect(path, timeout=_TIMEOUT)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        (version,) = self.db.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            self.db.executescript(_DROP)
+            self.db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+        #: Hits and misses per namespace, and access times of entries, not written yet
+        self._counts: dict[str, list[int]] = {}
+        self._accessed: dict[tuple[str, str], float] = {}
+        atexit.register(self.flush)
+
+    def close(self) -> None:
+        self.flush()
+        atexit.unregister(self.flush)
+        self.db.close()
+
+    def namespace(self, name: str) -> CacheNamespace:
+        return CacheNamespace(self, name)
+
+    def flush(self) -> None:
+        """Write the collected hit counts and access times, dropping them if the database stays locked."""
+        if not self._counts and not self._accessed:
+            return
+        counts = [(namespace, hits, misses) for namespace, (hits, misses) in self._counts.items()]
+        accessed = [(at, namespace, key) for (namespace, key), at in self._accessed.items()]
+        self._counts, self._accessed = {}, {}
+        # Waiting is not worth it for statistics, unlike for the entries themselves
+        self.db.execute(f"PRAGMA busy_timeout = {int(_FLUSH_TIMEOUT * 1000)}")
+        try:
+            with self.db:
+                self.db.executemany(
+                    "INSERT INTO stats (namespace, hits, misses) VALUES (?, ?, ?) ON CONFLICT (namespace) "
+                    "DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+                    counts,
+                )
+                self.db.executemany(
+                    "UPDATE entries SET accessed_at = MAX(accessed_at, ?) WHERE namespace = ? AND key = ?", accessed
+                )
+        except sqlite3.Error:
+            pass
+        finally:
+            self.db.execute(f"PRAGMA busy_timeout = {int(_TIMEOUT * 1000)}")
+
+    def get(self, namespace: str, key: str, max_age: float | None = None) -> bytes | None:
+        """Get a cached entry if it is immutable, or younger than ``max_age`` seconds."""
+        row = self.db.execute(
+            "SELECT data, codec, immutable, fetched_at, accessed_at FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+
+        now = time.time()
+        fresh = row is not None and (row[2] or (max_age is not None and now - row[3] <= max_age))
+        self._counts.setdefault(namespace, [0, 0])[0 if fresh else 1] += 1
+
+        if not fresh:
+            return None
+        if now - row[4] > _TOUCH_INTERVAL:
+            self._accessed[(namespace, key)] = now
+        return _decompress(bytes(row[0]), row[1])
+
+    def put(self, namespace: str, key: str, data: bytes, immutable: bool = False) -> None:
+        stored, codec = _compress(data)
+        now = time.time()
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(namespace, key, data, codec, size, immutable, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (namespace, key, stored, codec, len(stored), int(immutable), now, now),
+            )
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def find_keys(self, namespace: str, key_prefix: str) -> list[str]:
+        escaped = key_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        cur = self.db.execute(
+            "SELECT key FROM entries WHERE namespace = ? AND key LIKE ? ESCAPE '\\'", (namespace, escaped + "%")
+        )
+        return [row[0] for row in cur]
+
+    def total_size(self) -> int:
+        (size,) = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        assert isinstance(size, int)
+        return size
+
+    def evict(self, max_bytes: int) -> tuple[int, int]:
+        """Remove least recently used entries until the cache fits in ``max_bytes``.
+
+        Returns the number of removed entries and freed bytes.
+        """
+        self.flush()
+        excess = self.total_size() - max_bytes
+        if excess <= 0:
+            return 0, 0
+
+        victims: list[tuple[str, str]] = []
+        freed = 0
+        cur = self.db.execute("SELECT namespace, key, size FROM entries ORDER BY accessed_at")
+        for namespace, key, size in cur:
+            if freed >= excess:
+                break
+            victims.append((namespace, key))
+            freed += size
+
+        with self.db:
+            self.db.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+        return len(victims), freed
+
+    def prune(self, max_age: float, max_bytes: int) -> tuple[int, int]:
+        """Remove mutable entries older than ``max_age`` seconds, then evict down to ``max_bytes``."""
+        with self.db:
+            (count, size) = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE NOT immutable AND fetched_at < ?",
+                (time.time() - max_age,),
+            ).fetchone()
+            self.db.execute("DELETE FROM entries WHERE NOT immutable AND fetched_at < ?", (time.time() - max_age,))
+        evicted, freed = self.evict(max_bytes)
+        self.db.execute("VACUUM")
+        return count + evicted, size + freed
+
+    def clear(self, namespace: str | None = None) -> tuple[int, int]:
+        self.flush()
+        where, params = ("WHERE namespace = ?", (namespace,)) if namespace is not None else ("", ())
+        with self.db:
+            (count, size) = self.db.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries {where}", params
+            ).fetchone()
+            self.db.execute(f"DELETE FROM entries {where}", params)
+            self.db.execute(f"DELETE FROM stats {where}", params)
+        self.db.execute("VACUUM")
+        return count, size
+
+    def stats(self) -> list[NamespaceStats]:
+        self.flush()
+        cur = self.db.execute(
+            "SELECT n.namespace, COUNT(e.key), COALESCE(SUM(e.immutable), 0), COALESCE(SUM(e.size), 0), "
+            "COALESCE(s.hits, 0), COALESCE(s.misses, 0) "
+            "FROM (SELECT namespace FROM entries UNION SELECT namespace FROM stats) n "
+            "LEFT JOIN entries e ON e.namespace = n.namespace "
+            "LEFT JOIN stats s ON s.namespace = n.namespace "
+            "GROUP BY n.namespace ORDER BY n.namespace"
+        )
+        return [NamespaceStats(*row) for row in cur]
+
+
+@lru_cache(maxsize=1, typed=False)
+def get_resource_cache() -> ResourceCache:
+    return ResourceCache(get_data_dir("cache") / "cache.sqlite3", get_max_cache_bytes())
@@ -0,0 +1,375 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Evaluations and profiles running detached from the CLI.
+
+``evaluate --detach`` and ``profile --detach`` only record a job in a local registry
+and spawn a ``python -m makora.store.detached`` worker process, which keeps running
+after the CLI exits. The worker submits queued jobs with a bounded concurrency
+(``MAKORA_DETACHED_CONCURRENCY``) and stores every response on disk, from where
+``makora results`` reads it. At most one worker runs at a time; a worker which stops
+sending heartbeats is considered dead and its running jobs are queued again.
+"""
+
+import os
+import time
+import uuid
+import sqlite3
+import asyncio
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from ..utils import spawn_detached
+from ..config import DETACHED_CONCURRENCY, get_data_dir
+from ..models.openapi import KernelEvaluationDetails, KernelEvaluationStatus, KernelProfilingDetails, ProfilingMode
+from ..models.internal import TargetDevice
+from ..web.conn import open_connection
+from ..web.errors import describe_error
+from ..web.evaluation import evaluate_kernel, profile_kernel
+from .history import get_performance_history, history_guard
+from .kernels import atomic_write_bytes
+
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    device TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT,
+    reference_code TEXT NOT NULL,
+    optimized_code TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at);
+CREATE TABLE IF NOT EXISTS worker (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pid INTEGER NOT NULL,
+    heartbeat REAL NOT NULL
+);
+"""
+
+_DROP = """
+DROP TABLE IF EXISTS jobs;
+DROP TABLE IF EXISTS worker;
+"""
+
+#: How often a worker signals it is alive, and after how long without a signal it is considered dead
+_HEARTBEAT_INTERVAL = 5.0
+_HEARTBEAT_TIMEOUT = 30.0
+
+#: Submissions are refused once that many jobs are waiting
+MAX_QUEUED_JOBS = 50
+
+
+class JobKind(Enum):
+    evaluate = "evaluate"
+    profile = "profile"
+
+
+class JobStatus(Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class DetachedJob(BaseModel):
+    id: str
+    kind: JobKind
+    device: TargetDevice
+    name: str
+    url: str | None = None
+    status: JobStatus
+    error: str | None = None
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.completed, JobStatus.failed)
+
+
+_JOB_COLUMNS = "id, kind, device, name, url, status, error, submitted_at, started_at, finished_at"
+
+
+def get_detached_concurrency() -> int:
+    try:
+        return max(1, int(DETACHED_CONCURRENCY.value))
+    except ValueError:
+        return 2
+
+
+class JobRegistry:
+    def __init__(self, path: Path, results_dir: Path) -> None:
+        self.path = path
+        self.results_dir = results_dir
+        # Submitting CLI processes and the worker access the registry concurrently
+        self.db = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        (version,) = self.db.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            self.db.executescript(_DROP)
+            self.db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _job(self, row: tuple[Any, ...]) -> DetachedJob:
+        return DetachedJob.model_validate(dict(zip(_JOB_COLUMNS.split(", "), row)))
+
+    def submit(
+        self,
+        kind: JobKind,
+        device: TargetDevice,
+        name: str,
+        reference_code: str,
+        optimized_code: str,
+        url: str | None = None,
+    ) -> DetachedJob:
+        job_id = uuid.uuid4().hex
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            (queued,) = self.db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (JobStatus.queued.value,)
+            ).fetchone()
+            if queued >= MAX_QUEUED_JOBS:
+                raise QueueFull(f"There are already {queued} detached jobs waiting, try again later")
+            self.db.execute(
+                "INSERT INTO jobs (id, kind, device, name, url, reference_code, optimized_code, status, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind.value,
+                    device.value,
+                    name,
+                    url,
+                    reference_code,
+                    optimized_code,
+                    JobStatus.queued.value,
+                    time.time(),
+                ),
+            )
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str) -> DetachedJob | None:
+        row = self.db.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row is not None else None
+
+    def find(self, prefix: str) -> list[DetachedJob]:
+        cur = self.db.execute(f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id LIKE ?", (prefix.lower() + "%",))
+        return [self._job(row) for row in cur]
+
+    def list_jobs(self) -> list[DetachedJob]:
+        cur = self.db.execute(f"SELECT {_JOB_COLUMNS} FROM jobs ORDER BY submitted_at DESC")
+        return [self._job(row) for row in cur]
+
+    def codes(self, job_id: str) -> tuple[str, str]:
+        reference_code, optimized_code = self.db.execute(
+            "SELECT reference_code, optimized_code FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return reference_code, optimized_code
+
+    def has_queued(self) -> bool:
+        row = self.db.execute("SELECT 1 FROM jobs WHERE status = ? LIMIT 1", (JobStatus.queued.value,)).fetchone()
+        return row is not None
+
+    def claim(self, count: int) -> list[DetachedJob]:
+        """Mark up to ``count`` of the oldest queued jobs as running and return them."""
+        if count <= 0:
+            return []
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            ids = [
+                row[0]
+                for row in self.db.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY submitted_at LIMIT ?",
+                    (JobStatus.queued.value, count),
+                )
+            ]
+            self.db.executemany(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                [(JobStatus.running.value, time.time(), job_id) for job_id in ids],
+            )
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        return [job for job in map(self.get, ids) if job is not None]
+
+    def finish(self, job_id: str, status: JobStatus, error: str | None = None, response: bytes | None = None) -> None:
+        if response is not None:
+            atomic_write_bytes(self.result_path(job_id), response)
+        self.db.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+            (status.value, error, time.time(), job_id),
+        )
+
+    def result_path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.json"
+
+    def read_result(self, job: DetachedJob) -> KernelEvaluationDetails | KernelProfilingDetails | None:
+        path = self.result_path(job.id)
+        if not path.exists():
+            return None
+        if job.kind == JobKind.evaluate:
+            return KernelEvaluationDetails.model_validate_json(path.read_bytes())
+        return KernelProfilingDetails.model_validate_json(path.read_bytes())
+
+    def remove_finished(self) -> int:
+        finished = [
+            row[0]
+            for row in self.db.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?)", (JobStatus.completed.value, JobStatus.failed.value)
+            )
+        ]
+        for job_id in finished:
+            self.result_path(job_id).unlink(missing_ok=True)
+        self.db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in finished])
+        return len(finished)
+
+    def acquire_worker(self, pid: int) -> bool:
+        """Become the only worker, unless another one is alive. Jobs of a dead worker are queued again."""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute("SELECT pid, heartbeat FROM worker WHERE id = 1").fetchone()
+            if row is not None and row[0] != pid and time.time() - row[1] < _HEARTBEAT_TIMEOUT:
+                self.db.execute("ROLLBACK")
+                return False
+            self.db.execute("INSERT OR REPLACE INTO worker (id, pid, heartbeat) VALUES (1, ?, ?)", (pid, time.time()))
+            self.db.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (JobStatus.queued.value, JobStatus.running.value),
+            )
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+        return True
+
+    def heartbeat(self, pid: int) -> bool:
+        """Refresh the worker's heartbeat, returns False if another worker has taken over in the meantime."""
+        cur = self.db.execute("UPDATE worker SET heartbeat = ? WHERE id = 1 AND pid = ?", (time.time(), pid))
+        return cur.rowcount == 1
+
+    def release_worker(self, pid: int) -> None:
+        self.db.execute("DELETE FROM worker WHERE id = 1 AND pid = ?", (pid,))
+
+
+@lru_cache(maxsize=1, typed=False)
+def get_job_registry() -> JobRegistry:
+    return JobRegistry(get_data_dir() / "detached.sqlite3", get_data_dir("results"))
+
+
+def spawn_worker() -> bool:
+    """Start a detached worker, which exits right away if another one is already running."""
+    return spawn_detached("makora.store.detached", dict(os.environ))
+
+
+async def run_job(registry: JobRegistry, job: DetachedJob) -> None:
+    reference_code, optimized_code = registry.codes(job.id)
+    try:
+        async with open_connection(job.url) as conn:
+            if job.kind == JobKind.evaluate:
+                evaluation = await evaluate_kernel(conn, reference_code, optimized_code, job.device, job.name)
+                successful = (
+                    evaluation.evaluation is not None
+                    and evaluation.evaluation.status == KernelEvaluationStatus.COMPLETED
+                )
+                response = evaluation.model_dump_json(warnings=False).encode("utf-8")
+                if successful and evaluation.evaluation is not None:
+                    with history_guard():
+                        get_performance_history().record_evaluation(
+                            evaluation.evaluation, reference_code, optimized_code, job.name, job.device
+                        )
+            else:
+                profile = await profile_kernel(
+                    conn, reference_code, optimized_code, job.device, ProfilingMode.full, job.name
+                )
+                run = profile.kernel_profiling_run
+                successful = run is not None and run.status == KernelEvaluationStatus.COMPLETED
+                response = profile.model_dump_json(warnings=False).encode("utf-8")
+                if successful and run is not None:
+                    with history_guard():
+                        get_performance_history().record_profile(
+                            run, reference_code, optimized_code, job.name, job.device
+                        )
+    except Exception as e:
+        registry.finish(job.id, JobStatus.failed, describe_error(e))
+        return
+
+    registry.finish(
+        job.id,
+        JobStatus.completed if successful else JobStatus.failed,
+        None if successful else f"{job.kind.value.capitalize()} did not complete successfully",
+        response,
+    )
+
+
+async def run_worker(registry: JobRegistry, pid: int, concurrency: int) -> None:
+    running: set[asyncio.Task[None]] = set()
+    while True:
+        if not registry.heartbeat(pid):
+            # Our jobs were queued again by the new worker, which now owns them
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            return
+        for job in registry.claim(concurrency - len(running)):
+            running.add(asyncio.create_task(run_job(registry, job)))
+        if not running:
+            return
+        # Wake up regularly to keep the heartbeat fresh while requests are in flight
+        _, pending = await asyncio.wait(running, timeout=_HEARTBEAT_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+        running = set(pending)
+
+
+def main() -> None:
+    registry = get_job_registry()
+    pid = os.getpid()
+    # Jobs submitted right before the lock is released would be left behind without the second check
+    while registry.acquire_worker(pid):
+        try:
+            asyncio.run(run_worker(registry, pid, get_detached_concurrency()))
+        finally:
+            registry.release_worker(pid)
+        if not registry.has_queued():
+            break
+
+
+if __name__ == "__main__":
+    main()
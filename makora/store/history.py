@@ -0,0 +1,295 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local history of benchmark results.
+
+Every successful ``evaluate``, ``profile`` and ``check`` is recorded with the hashes
+of the measured and the reference code, the device, the times converted to
+milliseconds and, when available, the individual timing samples. Measurements of
+the same code, reference, device and command form a series, whose latest measurement
+is compared against the preceding ones to detect regressions.
+"""
+
+import json
+import time
+import sqlite3
+import statistics
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+
+import typer
+
+from ..config import get_data_dir
+from ..version import version
+from ..models.openapi import KernelEvaluation, KernelProfilingRun, ProblemValidationTaskStatus, Unit
+from ..models.internal import TargetDevice
+from .kernels import hash_code
+
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    code_hash TEXT NOT NULL,
+    ref_hash TEXT NOT NULL,
+    device TEXT NOT NULL,
+    time_ms REAL,
+    reference_time_ms REAL,
+    speedup REAL,
+    samples TEXT,
+    measured_at REAL NOT NULL,
+    cli_version TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS measurements_series ON measurements (code_hash, ref_hash, device, kind, measured_at);
+"""
+
+_DROP = """
+DROP TABLE IF EXISTS measurements;
+"""
+
+_UNIT_TO_MS = {
+    Unit.s: 1e3,
+    Unit.ms: 1.0,
+    Unit.us: 1e-3,
+    Unit.ns: 1e-6,
+}
+
+#: Nsight Compute metric with the duration of a profiled kernel, in nanoseconds
+_DURATION_METRIC = "gpu__time_duration.sum"
+
+
+def to_ms(value: float | None, unit: Unit | None) -> float | None:
+    """Convert a time to milliseconds, ``None`` for times in cycles which cannot be converted."""
+    if value is None:
+        return None
+    factor = _UNIT_TO_MS.get(unit or Unit.ms)
+    return value * factor if factor is not None else None
+
+
+class Measurement(NamedTuple):
+    id: int
+    kind: str
+    name: str
+    code_hash: str
+    ref_hash: str
+    device: str
+    #: Time of the measured code, for ``check`` the reference itself
+    time_ms: float | None
+    reference_time_ms: float | None
+    speedup: float | None
+    #: Per-shape timing samples of the measured code, in milliseconds
+    samples: list[list[float]] | None
+    measured_at: float
+    cli_version: str
+
+    @property
+    def series_key(self) -> tuple[str, str, str, str]:
+        return self.kind, self.code_hash, self.ref_hash, self.device
+
+
+class Regression(NamedTuple):
+    latest: Measurement
+    baseline_ms: float
+    #: Relative slowdown of the latest measurement, 0.05 is 5% slower
+    slowdown: float
+    p_value: float | None
+
+
+def detect_regression(series: list[Measurement], window: int = 10, min_slowdown: float = 0.02) -> Regression | None:
+    """Whether the latest measurement of a series is significantly slower than the ``window`` preceding ones.
+
+    With timing samples, the samples of the latest measurement are tested against the pooled
+    samples of the baseline. Without, the latest time has to exceed the baseline median by more
+    than three (scaled) median absolute deviations of the baseline.
+    """
+    import numpy as np
+
+    from ..stats import estimate_samples_speedup
+
+    timed = [m for m in series if m.time_ms is not None]
+    if len(timed) < 2:
+        return None
+
+    latest = timed[-1]
+    baseline = timed[-window - 1 : -1]
+    assert latest.time_ms is not None
+    baseline_ms = statistics.median(m.time_ms for m in baseline if m.time_ms is not None)
+    slowdown = latest.time_ms / baseline_ms - 1.0
+    if slowdown <= min_slowdown:
+        return None
+
+    sampled = [m for m in baseline if m.samples and latest.samples and len(m.samples) == len(latest.samples)]
+    if latest.samples and sampled:
+        refs = [
+            np.concatenate([np.asarray(m.samples[shape]) for m in sampled if m.samples])
+            for shape in range(len(latest.samples))
+        ]
+        opts = [np.asarray(samples) for samples in latest.samples]
+        estimate = estimate_samples_speedup(refs, opts)
+        if estimate.p_value < 0.05 and estimate.high < 1.0:
+            return Regression(latest, baseline_ms, slowdown, estimate.p_value)
+        return None
+
+    if len(baseline) < 3:
+        return None
+    times = [m.time_ms for m in baseline if m.time_ms is not None]
+    mad = 1.4826 * statistics.median(abs(t - baseline_ms) for t in times)
+    # Identical baseline times would make any difference significant
+    if latest.time_ms > baseline_ms + 3 * max(mad, 0.01 * baseline_ms):
+        return Regression(latest, baseline_ms, slowdown, None)
+    return None
+
+
+class PerformanceHistory:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30.0)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        (ver,) = self.db.execute("PRAGMA user_version").fetchone()
+        if ver != _SCHEMA_VERSION:
+            self.db.executescript(_DROP)
+            self.db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        code: str,
+        reference_code: str,
+        device: TargetDevice,
+        time_ms: float | None,
+        reference_time_ms: float | None = None,
+        speedup: float | None = None,
+        samples: list[list[float]] | None = None,
+    ) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT INTO measurements (kind, name, code_hash, ref_hash, device, time_ms, reference_time_ms, "
+                "speedup, samples, measured_at, cli_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    name,
+                    hash_code(code),
+                    hash_code(reference_code),
+                    device.value,
+                    time_ms,
+                    reference_time_ms,
+                    speedup,
+                    json.dumps(samples) if samples is not None else None,
+                    time.time(),
+                    version,
+                ),
+            )
+
+    def record_evaluation(
+        self, evaluation: KernelEvaluation, reference_code: str, code: str, name: str, device: TargetDevice
+    ) -> None:
+        from ..stats import inlier_samples
+
+        samples: list[list[float]] | None = None
+        result = evaluation.benchmarking_result
+        if result is not None and result.user_times:
+            samples = []
+            for timing in result.user_times:
+                values = inlier_samples(timing.kernel)
+                factor = _UNIT_TO_MS.get(timing.kernel.unit or evaluation.optimized_time_unit or Unit.ms)
+                if values is None or factor is None:
+                    samples = None
+                    break
+                samples.append((values * factor).tolist())
+
+        self.record(
+            "evaluate",
+            name,
+            code,
+            reference_code,
+            device,
+            to_ms(evaluation.optimized_time, evaluation.optimized_time_unit),
+            to_ms(evaluation.reference_time, evaluation.reference_time_unit),
+            evaluation.speedup,
+            samples,
+        )
+
+    def record_profile(
+        self, run: KernelProfilingRun, reference_code: str, code: str, name: str, device: TargetDevice
+    ) -> None:
+        durations = []
+        kernels = run.profiling_result.kernel_info if run.profiling_result is not None else None
+        for kernel in kernels or []:
+            value = (kernel.raw_metrics or {}).get(_DURATION_METRIC)
+            if isinstance(value, (int, float)):
+                durations.append(float(value))
+
+        time_ms = to_ms(sum(durations), Unit.ns) if durations else None
+        self.record("profile", name, code, reference_code, device, time_ms)
+
+    def record_validation(self, status: ProblemValidationTaskStatus, device: TargetDevice) -> None:
+        result = status.benchmarking_result
+        if result is None or not result.benchmarked:
+            return
+
+        code = status.request.problem_description_code.code
+        time_ms = to_ms(result.ref_time, result.ref_time_unit)
+        self.record("check", status.request.problem_name, code, code, device, time_ms, time_ms)
+
+    def _measurement(self, row: tuple[Any, ...]) -> Measurement:
+        values = list(row)
+        values[9] = json.loads(values[9]) if values[9] is not None else None
+        return Measurement(*values)
+
+    def series(self, device: TargetDevice | None = None, kind: str | None = None) -> list[list[Measurement]]:
+        """All series, each oldest first, the most recently measured series first."""
+        conditions, params = [], []
+        if device is not None:
+            conditions.append("device = ?")
+            params.append(device.value)
+        if kind is not None:
+            conditions.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cur = self.db.execute(
+            "SELECT id, kind, name, code_hash, ref_hash, device, time_ms, reference_time_ms, speedup, samples, "
+            f"measured_at, cli_version FROM measurements {where} ORDER BY measured_at, id",
+            params,
+        )
+        grouped: dict[tuple[str, str, str, str], list[Measurement]] = {}
+        for row in cur:
+            measurement = self._measurement(row)
+            grouped.setdefault(measurement.series_key, []).append(measurement)
+
+        return sorted(grouped.values(), key=lambda s: s[-1].measured_at, reverse=True)
+
+
+@lru_cache(maxsize=1, typed=False)
+def get_performance_history() -> PerformanceHistory:
+    return PerformanceHistory(get_data_dir() / "history.sqlite3")
+
+
+@contextmanager
+def history_guard() -> Iterator[None]:
+    """Warn rather than fail if results cannot be recorded, they were obtained at a cost already."""
+    try:
+        yield
+    except sqlite3.Error as e:
+        typer.echo(f"Warning: Could not record the results in the local history: {e}", err=True)
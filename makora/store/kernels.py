@@ -0,0 +1,483 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-addressed local store of kernel code.
+
+Kernel bodies are kept as blobs named after the SHA-256 of their code, so identical
+kernels produced by different attempts (or sessions) are stored once. A SQLite index
+maps kernel IDs to their blob and the metadata shown by listing commands. The index
+only caches what the service returns and is rebuilt whenever its schema changes.
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, TextIO
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from ..config import get_data_dir
+from ..models.openapi import (
+    AgentSessionSummary,
+    EvaluatedKernel,
+    KernelEvaluation,
+    KernelEvaluationStatus,
+    StepStatus,
+    Unit,
+)
+from ..models.internal import KernelSummary, SessionExtra, TERMINAL_STATUSES
+
+
+_SCHEMA_VERSION = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    device TEXT NOT NULL,
+    language TEXT NOT NULL,
+    status TEXT,
+    best_attempt_id TEXT,
+    refcode_hash TEXT,
+    started_at TEXT NOT NULL,
+    synced_at TEXT NOT NULL,
+    mirrored INTEGER NOT NULL DEFAULT 0,
+    summary TEXT,
+    extra TEXT,
+    scope TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS kernels (
+    kernel_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    attempt_id TEXT,
+    attempt_number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    code_hash TEXT,
+    evaluation_status TEXT,
+    time REAL,
+    time_unit TEXT,
+    reference_eager REAL,
+    reference_compile REAL,
+    speed_up_eager REAL,
+    speed_up_compiled REAL,
+    is_close_miss INTEGER,
+    best_atol REAL,
+    best_rtol REAL,
+    device TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS kernels_session ON kernels (session_id);
+CREATE INDEX IF NOT EXISTS kernels_code_hash ON kernels (code_hash);
+CREATE TABLE IF NOT EXISTS evaluations (
+    kernel_id TEXT PRIMARY KEY,
+    evaluation TEXT NOT NULL
+);
+"""
+
+_DROP = """
+DROP TABLE IF EXISTS sessions;
+DROP TABLE IF EXISTS kernels;
+DROP TABLE IF EXISTS evaluations;
+"""
+
+
+FINAL_KERNEL_STATUSES = frozenset({KernelEvaluationStatus.COMPLETED, KernelEvaluationStatus.FAILED})
+
+
+def hash_code(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def atomic_open(path: Path) -> Iterator[TextIO]:
+    """Open a text file which replaces ``path`` once closed, so that readers never observe a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` so that readers never observe a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class StoredKernel(BaseModel):
+    kernel_id: UUID
+    session_id: UUID
+    attempt_id: UUID | None
+    attempt_number: int
+    name: str
+    code_hash: str | None = None
+    evaluation_status: KernelEvaluationStatus | None = None
+    time: float | None = None
+    time_unit: Unit | None = None
+    reference_eager: float | None = None
+    reference_compile: float | None = None
+    speed_up_eager: float | None = None
+    speed_up_compiled: float | None = None
+    is_close_miss: bool | None = None
+    best_atol: float | None = None
+    best_rtol: float | None = None
+    device: str | None = None
+    created_at: datetime
+
+    @classmethod
+    def from_kernel(
+        cls,
+        kernel: KernelSummary | EvaluatedKernel,
+        session_id: UUID,
+        attempt_number: int,
+        code_hash: str | None,
+        device: str | None,
+    ) -> "StoredKernel":
+        return cls(
+            kernel_id=kernel.id,
+            session_id=session_id,
+            attempt_id=kernel.attempt_id,
+            attempt_number=attempt_number,
+            name=kernel.name,
+            code_hash=code_hash,
+            evaluation_status=kernel.evaluation_status,
+            time=kernel.time,
+            time_unit=kernel.time_unit,
+            reference_eager=kernel.reference_eager,
+            reference_compile=kernel.reference_compile,
+            speed_up_eager=kernel.speed_up_eager,
+            speed_up_compiled=kernel.speed_up_compiled,
+            is_close_miss=kernel.is_close_miss,
+            best_atol=kernel.best_atol,
+            best_rtol=kernel.best_rtol,
+            device=device,
+            created_at=kernel.created_at,
+        )
+
+    def to_summary(self) -> KernelSummary:
+        return KernelSummary(
+            id=self.kernel_id,
+            attempt_id=self.attempt_id,
+            name=self.name,
+            time=self.time,
+            time_unit=self.time_unit,
+            evaluation_status=self.evaluation_status,
+            reference_eager=self.reference_eager,
+            reference_compile=self.reference_compile,
+            speed_up_eager=self.speed_up_eager,
+            speed_up_compiled=self.speed_up_compiled,
+            is_close_miss=self.is_close_miss,
+            best_atol=self.best_atol,
+            best_rtol=self.best_rtol,
+            created_at=self.created_at,
+        )
+
+    @property
+    def is_final(self) -> bool:
+        """Whether the evaluation finished, i.e., nothing about the kernel can change anymore."""
+        return self.evaluation_status in FINAL_KERNEL_STATUSES
+
+
+class SessionRecord(BaseModel):
+    """What the store knows about a session, used to tell which sessions changed since the last sync."""
+
+    session_id: UUID
+    label: str
+    device: str
+    language: str
+    status: StepStatus | None = None
+    best_attempt_id: UUID | None = None
+    refcode_hash: str | None = None
+    started_at: datetime
+    synced_at: datetime
+    #: Whether code of all kernels and the session's extra were stored as well
+    mirrored: bool = False
+    summary: AgentSessionSummary | None = None
+    extra: SessionExtra | None = None
+    #: Service and account the session was synced from, see :func:`~makora.web.auth.service_scope`
+    scope: str = ""
+
+    @classmethod
+    def from_summary(
+        cls,
+        session: AgentSessionSummary,
+        refcode_hash: str | None,
+        extra: SessionExtra | None = None,
+        mirrored: bool = False,
+        scope: str = "",
+    ) -> "SessionRecord":
+        return cls(
+            session_id=session.id,
+            label=session.label,
+            device=session.target_hardware,
+            language=session.target_language.value,
+            status=session.status,
+            best_attempt_id=session.best_attempt_id,
+            refcode_hash=refcode_hash,
+            started_at=session.started_at,
+            synced_at=datetime.now(timezone.utc),
+            mirrored=mirrored,
+            summary=session,
+            extra=extra,
+            scope=scope,
+        )
+
+    def is_up_to_date(self, session: AgentSessionSummary, mirror: bool = False) -> bool:
+        """Whether nothing could have changed in the session since it was last synced.
+
+        With ``mirror``, a session is also out of date if its kernels' code was not stored yet.
+        """
+        return (
+            self.status == session.status
+            and self.best_attempt_id == session.best_attempt_id
+            and session.status in TERMINAL_STATUSES
+            and (self.mirrored or not mirror)
+        )
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class LeaderboardRow(NamedTuple):
+    kernel_id: str
+    session_id: str
+    name: str
+    speedup: float
+    time: float | None
+    time_unit: str | None
+    device: str
+    refcode_hash: str
+    label: str
+
+
+_COLUMNS = tuple(StoredKernel.model_fields)
+_SESSION_COLUMNS = tuple(SessionRecord.model_fields)
+_SESSION_JSON_COLUMNS = frozenset({"summary", "extra"})
+
+
+def _session_from_row(row: tuple[object, ...]) -> SessionRecord:
+    data = dict(zip(_SESSION_COLUMNS, row))
+    for column in _SESSION_JSON_COLUMNS:
+        if isinstance(value := data[column], str):
+            data[column] = json.loads(value)
+    return SessionRecord.model_validate(data)
+
+
+class KernelStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.blobs_dir = root / "blobs"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(root / "index.sqlite3")
+        (version,) = self.db.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            self.db.executescript(_DROP)
+            self.db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _blob_path(self, code_hash: str) -> Path:
+        return self.blobs_dir / code_hash[:2] / code_hash
+
+    def has_blob(self, code_hash: str) -> bool:
+        return self._blob_path(code_hash).exists()
+
+    def put_blob(self, code: str) -> str:
+        code_hash = hash_code(code)
+        path = self._blob_path(code_hash)
+        if not path.exists():
+            atomic_write_bytes(path, code.encode("utf-8"))
+        return code_hash
+
+    def get_blob(self, code_hash: str) -> str | None:
+        try:
+            return self._blob_path(code_hash).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def put_kernels(self, kernels: Iterable[StoredKernel]) -> None:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        # Metadata-only updates (without code_hash) must not forget an already stored blob.
+        updates = ", ".join(
+            f"{c} = COALESCE(excluded.{c}, kernels.{c})" if c == "code_hash" else f"{c} = excluded.{c}"
+            for c in _COLUMNS
+            if c != "kernel_id"
+        )
+        rows = []
+        for kernel in kernels:
+            row = kernel.model_dump(mode="json")
+            rows.append(tuple(row[c] for c in _COLUMNS))
+
+        with self.db:
+            self.db.executemany(
+                f"INSERT INTO kernels ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (kernel_id) DO UPDATE SET {updates}",
+                rows,
+            )
+
+    def put_kernel(self, kernel: StoredKernel) -> None:
+        self.put_kernels([kernel])
+
+    def put_evaluation(self, kernel_id: UUID | str, evaluation: KernelEvaluation) -> None:
+        """Store the full evaluation of a kernel, kept apart from the metadata read by listings."""
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO evaluations (kernel_id, evaluation) VALUES (?, ?)",
+                (str(kernel_id), evaluation.model_dump_json()),
+            )
+
+    def get_evaluation(self, kernel_id: UUID | str) -> KernelEvaluation | None:
+        row = self.db.execute("SELECT evaluation FROM evaluations WHERE kernel_id = ?", (str(kernel_id),)).fetchone()
+        return KernelEvaluation.model_validate_json(row[0]) if row is not None else None
+
+    def get_session_record(self, session_id: UUID | str) -> SessionRecord | None:
+        cur = self.db.execute(
+            f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions WHERE session_id = ?", (str(session_id),)
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return _session_from_row(row)
+
+    def get_session_records(self, scope: str | None = None) -> dict[UUID, SessionRecord]:
+        """Stored sessions, only those synced from the given service scope if one is provided."""
+        if scope is None:
+            cur = self.db.execute(f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions")
+        else:
+            cur = self.db.execute(f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions WHERE scope = ?", (scope,))
+        records = (_session_from_row(row) for row in cur)
+        return {r.session_id: r for r in records}
+
+    def find_session_records(self, session_id_prefix: str) -> list[SessionRecord]:
+        cur = self.db.execute(
+            f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions WHERE session_id LIKE ? ESCAPE '\\'",
+            (_like_prefix(session_id_prefix),),
+        )
+        return [_session_from_row(row) for row in cur]
+
+    def remove_sessions(self, session_ids: Iterable[UUID | str]) -> None:
+        """Forget sessions (and their kernels), blobs are kept as they might be shared."""
+        ids = [(str(sid),) for sid in session_ids]
+        with self.db:
+            self.db.executemany(
+                "DELETE FROM evaluations WHERE kernel_id IN (SELECT kernel_id FROM kernels WHERE session_id = ?)", ids
+            )
+            self.db.executemany("DELETE FROM kernels WHERE session_id = ?", ids)
+            self.db.executemany("DELETE FROM sessions WHERE session_id = ?", ids)
+
+    def put_session_record(self, record: SessionRecord) -> None:
+        row = record.model_dump(mode="json", warnings=False)
+        for column in _SESSION_JSON_COLUMNS:
+            if row[column] is not None:
+                row[column] = json.dumps(row[column])
+        placeholders = ", ".join("?" for _ in _SESSION_COLUMNS)
+        with self.db:
+            self.db.execute(
+                f"INSERT OR REPLACE INTO sessions ({', '.join(_SESSION_COLUMNS)}) VALUES ({placeholders})",
+                tuple(row[c] for c in _SESSION_COLUMNS),
+            )
+
+    def iter_leaderboard_rows(self, metric: str = "speed_up_compiled") -> Iterator[LeaderboardRow]:
+        """Stream successfully evaluated kernels joined with their session's problem and device."""
+        if metric not in {"speed_up_compiled", "speed_up_eager"}:
+            raise ValueError(f"Unsupported metric: {metric!r}")
+
+        cur = self.db.execute(
+            f"SELECT k.kernel_id, k.session_id, k.name, k.{metric}, k.time, k.time_unit, "
+            "s.device, s.refcode_hash, s.label "
+            "FROM kernels k JOIN sessions s ON k.session_id = s.session_id "
+            f"WHERE k.{metric} IS NOT NULL AND s.refcode_hash IS NOT NULL "
+            "AND k.evaluation_status = ? AND NOT COALESCE(k.is_close_miss, 0)",
+            (KernelEvaluationStatus.COMPLETED.value,),
+        )
+        cur.arraysize = 1024
+        while rows := cur.fetchmany():
+            for row in rows:
+                yield LeaderboardRow(*row)
+
+    def _from_rows(self, rows: Iterator[tuple[object, ...]]) -> Iterator[StoredKernel]:
+        for row in rows:
+            yield StoredKernel.model_validate(dict(zip(_COLUMNS, row)))
+
+    def get_kernel(self, kernel_id: UUID | str) -> StoredKernel | None:
+        cur = self.db.execute(f"SELECT {', '.join(_COLUMNS)} FROM kernels WHERE kernel_id = ?", (str(kernel_id),))
+        return next(self._from_rows(cur), None)
+
+    def find_kernels(self, kernel_id_prefix: str, session_id_prefix: str = "") -> list[StoredKernel]:
+        cur = self.db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM kernels "
+            "WHERE kernel_id LIKE ? ESCAPE '\\' AND session_id LIKE ? ESCAPE '\\'",
+            (_like_prefix(kernel_id_prefix), _like_prefix(session_id_prefix)),
+        )
+        return list(self._from_rows(cur))
+
+    def session_kernels(self, session_id: UUID | str) -> list[StoredKernel]:
+        cur = self.db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM kernels WHERE session_id = ? ORDER BY attempt_number, created_at",
+            (str(session_id),),
+        )
+        return list(self._from_rows(cur))
+
+    def session_kernel_summaries(self, session_id: UUID | str) -> list[list[KernelSummary]]:
+        """Kernels of a session grouped by attempt, like :func:`~makora.web.sessions.get_session_kernel_summaries`."""
+        attempts: dict[int, list[KernelSummary]] = {}
+        for kernel in self.session_kernels(session_id):
+            attempts.setdefault(kernel.attempt_number, []).append(kernel.to_summary())
+        return [attempts[n] for n in sorted(attempts)]
+
+    def iter_kernels(self) -> Iterator[StoredKernel]:
+        cur = self.db.execute(f"SELECT {', '.join(_COLUMNS)} FROM kernels")
+        return self._from_rows(cur)
+
+    def kernels_by_code_hash(self, code_hash: str) -> list[StoredKernel]:
+        cur = self.db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM kernels WHERE code_hash = ? ORDER BY session_id, attempt_number",
+            (code_hash,),
+        )
+        return list(self._from_rows(cur))
+
+    def kernel_code_hashes(self) -> set[str]:
+        cur = self.db.execute("SELECT DISTINCT code_hash FROM kernels WHERE code_hash IS NOT NULL")
+        return {row[0] for row in cur}
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+@lru_cache(maxsize=1, typed=False)
+def get_kernel_store() -> KernelStore:
+    return KernelStore(get_data_dir("kernels"))
@@ -0,0 +1,62 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Serving read-only commands from sessions mirrored by ``makora sync``."""
+
+import asyncio
+import textwrap
+from typing import Any, Callable, Coroutine
+
+from ..utils import get_rich_console
+from ..web.errors import is_unavailable_error
+from ..components.strings import format_time_ago
+from .kernels import SessionRecord, get_kernel_store
+
+
+def resolve_mirrored_session(session_id: str) -> SessionRecord:
+    """Find the mirrored session matching the given ID prefix."""
+    matches = get_kernel_store().find_session_records(session_id)
+    if not matches:
+        raise SystemExit(f"No session matching '{session_id}' in the local mirror, run 'makora sync' first.")
+    elif len(matches) > 1:
+        session_list = [" * " + str(r.session_id) for r in matches]
+        session_block = textwrap.indent("\n".join(session_list), "    ")
+        raise ValueError(f"Session ID prefix: {session_id!r} is matching more than one session:\n" + session_block)
+
+    return matches[0]
+
+
+def describe_staleness(*records: SessionRecord) -> str:
+    """Tell how old the mirrored data is, based on the least recently synced of ``records``."""
+    if not records:
+        return "offline"
+    oldest = min(records, key=lambda r: r.synced_at)
+    desc = f"offline, synced {format_time_ago(oldest.synced_at)}"
+    running = sum(1 for r in records if not r.is_terminal)
+    if running:
+        desc += f", {running} session(s) were still running" if len(records) > 1 else ", session was still running"
+    return desc
+
+
+def run_with_offline_fallback(online: Coroutine[Any, Any, None], offline: Callable[[], None]) -> None:
+    """Run ``online``, falling back to ``offline`` if the service cannot be reached but a mirror exists."""
+    try:
+        asyncio.run(online)
+    except Exception as e:
+        if not is_unavailable_error(e) or not get_kernel_store().get_session_records():
+            raise
+        get_rich_console().print(
+            f"[yellow]Could not reach the service ({type(e).__name__}), using the local mirror instead.[/yellow]"
+        )
+        offline()
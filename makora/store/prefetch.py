@@ -0,0 +1,196 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Opt-in background warming of the local mirror.
+
+Listing commands spawn a detached ``python -m makora.store.prefetch`` process (when
+``MAKORA_PREFETCH`` is set to a positive number of sessions), which mirrors the
+running and most recent sessions so that the usual follow-up commands (``kernels``,
+``refcode``) find their data locally. Every run is bounded by a number of requests
+and downloaded bytes, and at most one prefetcher runs at a time. The byte budget is
+checked before every request, so the last response can exceed it.
+"""
+
+import os
+import time
+import asyncio
+from pathlib import Path
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from ..utils import spawn_detached
+from ..config import PREFETCH_MAX_MB, PREFETCH_MAX_REQUESTS, PREFETCH_SESSIONS, get_data_dir
+from ..web.conn import Connection, open_connection
+from ..web.auth import get_current_credentials, service_scope
+from ..web.sessions import get_user_sessions
+from ..models.openapi import AgentSessionSummary
+from ..models.internal import TERMINAL_STATUSES
+from .kernels import get_kernel_store
+from .sync import sync_session
+
+
+T = TypeVar("T", bound=BaseModel)
+
+#: Minimum time between the starts of two prefetcher runs
+_MIN_INTERVAL = 60.0
+#: The running prefetcher touches its lock this often, a lock not touched for longer is stale
+_HEARTBEAT_INTERVAL = 5.0
+_HEARTBEAT_TIMEOUT = 30.0
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class BudgetedConnection(Connection):
+    """Connection which refuses to make requests once its request or byte budget is used up.
+
+    Responses are always read completely, a single response can therefore take more than
+    what is left of the byte budget.
+    """
+
+    def __init__(self, base_url: str, max_requests: int, max_bytes: int) -> None:
+        super().__init__(base_url)
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+
+    def _check_budget(self) -> None:
+        if self.requests_made >= self.max_requests or self.bytes_received >= self.max_bytes:
+            raise BudgetExhausted()
+
+    async def get(self, endpoint: str, reply_format: type[T], token: str | None = None) -> T:
+        self._check_budget()
+        return await super().get(endpoint, reply_format, token)
+
+    async def post(
+        self,
+        endpoint: str,
+        *payload: BaseModel,
+        reply_format: type[T],
+        token: str | None = None,
+        json: bool = True,
+    ) -> T:
+        self._check_budget()
+        return await super().post(endpoint, *payload, reply_format=reply_format, token=token, json=json)
+
+
+def get_prefetch_count() -> int:
+    try:
+        return max(0, int(PREFETCH_SESSIONS.value or "0"))
+    except ValueError:
+        return 0
+
+
+def select_sessions(sessions: list[AgentSessionSummary], count: int) -> list[AgentSessionSummary]:
+    """Pick sessions most likely to be looked at next: running ones first, then the most recent."""
+    return sorted(sessions, key=lambda s: (s.status in TERMINAL_STATUSES, -s.started_at.timestamp()))[:count]
+
+
+def spawn_prefetcher(url: str | None = None) -> None:
+    """Start a detached prefetcher process if prefetching is enabled, never blocks or fails the caller."""
+    if get_prefetch_count() <= 0:
+        return
+
+    env = dict(os.environ)
+    if url is not None:
+        env["MAKORA_URL"] = url
+
+    spawn_detached("makora.store.prefetch", env)
+
+
+def _lock_path() -> Path:
+    return get_data_dir() / "prefetch.lock"
+
+
+def _acquire_lock() -> bool:
+    """Take the lock held for the whole run, unless another prefetcher holds it or one started recently."""
+    lock = _lock_path()
+    last_run = get_data_dir() / "prefetch.last"
+    try:
+        if time.time() - last_run.stat().st_mtime < _MIN_INTERVAL:
+            return False
+    except FileNotFoundError:
+        pass
+
+    try:
+        if time.time() - lock.stat().st_mtime < _HEARTBEAT_TIMEOUT:
+            return False
+        # The prefetcher holding it died without releasing it
+        lock.unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+
+    try:
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    os.write(fd, str(os.getpid()).encode())
+    os.close(fd)
+    last_run.touch()
+    return True
+
+
+def _release_lock() -> None:
+    lock = _lock_path()
+    try:
+        if lock.read_text().strip() == str(os.getpid()):
+            lock.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def _heartbeat() -> None:
+    while True:
+        await asyncio.sleep(_HEARTBEAT_INTERVAL)
+        _lock_path().touch()
+
+
+async def prefetch(count: int, max_requests: int, max_bytes: int) -> None:
+    if get_current_credentials() is None:
+        return
+
+    store = get_kernel_store()
+    base = open_connection()
+    heartbeat = asyncio.create_task(_heartbeat())
+    try:
+        async with BudgetedConnection(base.base_url, max_requests, max_bytes) as conn:
+            sessions = select_sessions(await get_user_sessions(conn), count)
+            records = store.get_session_records(service_scope(conn.base_url))
+            for session in sessions:
+                record = records.get(session.id)
+                if record is not None and record.is_up_to_date(session, mirror=True):
+                    continue
+                # One session at a time, keeping the footprint of the background process small
+                await sync_session(conn, store, session, mirror=True, concurrency=2)
+    finally:
+        heartbeat.cancel()
+
+
+def main() -> None:
+    if get_prefetch_count() <= 0 or not _acquire_lock():
+        return
+
+    try:
+        asyncio.run(
+            prefetch(get_prefetch_count(), int(PREFETCH_MAX_REQUESTS.value), int(float(PREFETCH_MAX_MB.value) * 2**20))
+        )
+    except BudgetExhausted:
+        pass
+    finally:
+        _release_lock()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Regex search over locally stored kernel code.
+
+Code blobs are indexed in a SQLite FTS5 table using its trigram tokenizer. A regex
+is answered by first extracting literal strings every match has to contain, using
+them to ask the index for candidate blobs and only then running the regex itself.
+Patterns without usable literals (or SQLite builds without FTS5) fall back to
+scanning all stored kernels.
+"""
+
+import re
+import bisect
+import sqlite3
+from typing import Any, Iterator, NamedTuple
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined,unused-ignore]
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from .kernels import KernelStore
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS indexed (code_hash TEXT PRIMARY KEY);
+CREATE VIRTUAL TABLE IF NOT EXISTS code_fts USING fts5(code_hash UNINDEXED, code, tokenize = 'trigram');
+"""
+
+_MIN_LITERAL = 3
+
+
+class LineMatch(NamedTuple):
+    line_number: int
+    line: str
+    spans: list[tuple[int, int]]
+
+
+def _collect_literals(parsed: Any, runs: list[str], current: list[str]) -> None:
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+
+        # Anything else breaks the current run of consecutive literals
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+        if op is sre_parse.SUBPATTERN:
+            _collect_literals(av[-1], runs, current)
+            if current:
+                runs.append("".join(current))
+                current.clear()
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            # At least one repetition is required, so its literals must be present too
+            _collect_literals(av[2], runs, current)
+            if current:
+                runs.append("".join(current))
+                current.clear()
+
+
+def required_literals(pattern: str) -> list[str]:
+    """Extract literal substrings which have to appear in any text matched by ``pattern``."""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+
+    runs: list[str] = []
+    current: list[str] = []
+    _collect_literals(parsed, runs, current)
+    if current:
+        runs.append("".join(current))
+    return [r for r in runs if len(r) >= _MIN_LITERAL]
+
+
+def _fts_phrase(literal: str) -> str:
+    return '"' + literal.replace('"', '""') + '"'
+
+
+class CodeIndex:
+    def __init__(self, store: KernelStore) -> None:
+        self.store = store
+        self.db = sqlite3.connect(store.root / "search.sqlite3")
+        try:
+            self.db.executescript(_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer (added in 3.34)
+            self.has_fts = False
+
+    def close(self) -> None:
+        self.db.close()
+
+    def update(self) -> int:
+        """Index kernel blobs added to the store since the last update, returns their number."""
+        if not self.has_fts:
+            return 0
+
+        indexed = {row[0] for row in self.db.execute("SELECT code_hash FROM indexed")}
+        new = 0
+        with self.db:
+            for code_hash in self.store.kernel_code_hashes() - indexed:
+                code = self.store.get_blob(code_hash)
+                if code is None:
+                    continue
+                self.db.execute("INSERT INTO code_fts (code_hash, code) VALUES (?, ?)", (code_hash, code))
+                self.db.execute("INSERT INTO indexed (code_hash) VALUES (?)", (code_hash,))
+                new += 1
+        return new
+
+    def candidates(self, pattern: str) -> set[str]:
+        literals = required_literals(pattern)
+        if not self.has_fts or not literals:
+            return self.store.kernel_code_hashes()
+
+        query = " AND ".join(_fts_phrase(literal) for literal in literals)
+        cur = self.db.execute("SELECT code_hash FROM code_fts WHERE code_fts MATCH ?", (query,))
+        return {row[0] for row in cur}
+
+    def search(self, regex: "re.Pattern[str]") -> Iterator[tuple[str, list[LineMatch]]]:
+        """Yield ``(code_hash, matching lines)`` for every stored kernel blob matching ``regex``."""
+        for code_hash in sorted(self.candidates(regex.pattern)):
+            code = self.store.get_blob(code_hash)
+            if code is None:
+                continue
+            lines = match_lines(code, regex)
+            if lines:
+                yield code_hash, lines
+
+
+def match_lines(code: str, regex: "re.Pattern[str]") -> list[LineMatch]:
+    """Lines touched by the matches of ``regex`` in the whole code, matches spanning lines included."""
+    lines = code.splitlines(keepends=True) or [""]
+    starts = [0]
+    for line in lines[:-1]:
+        starts.append(starts[-1] + len(line))
+    texts = [line.splitlines()[0] if line.splitlines() else "" for line in lines]
+
+    spans: dict[int, list[tuple[int, int]]] = {}
+    for match in regex.finditer(code):
+        start, end = match.span()
+        first = bisect.bisect_right(starts, start) - 1
+        last = bisect.bisect_right(starts, max(start, end - 1)) - 1
+        for index in range(first, last + 1):
+            length = len(texts[index])
+            begin = min(max(start - starts[index], 0), length)
+            spans.setdefault(index, []).append((begin, max(min(end - starts[index], length), begin)))
+    return [LineMatch(index + 1, texts[index], spans[index]) for index in sorted(spans)]
@@ -0,0 +1,150 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental synchronization of remote sessions into the local kernel store."""
+
+import asyncio
+import itertools as itr
+from uuid import UUID
+
+from ..web.conn import Connection
+from ..web.auth import service_scope
+from ..web.sessions import (
+    fetch_session_extra,
+    get_kernel_details,
+    get_session_kernel_summaries,
+    get_session_refcode,
+    get_session_kernels,
+)
+from ..models.openapi import AgentSessionSummary
+from ..models.internal import KernelSummary
+from .kernels import KernelStore, SessionRecord, StoredKernel
+
+
+async def fetch_kernel_code(
+    conn: Connection,
+    store: KernelStore,
+    session_id: UUID,
+    kernels: list[KernelSummary],
+    concurrency: int = 8,
+) -> tuple[dict[UUID, str], int]:
+    """Get code of the given kernels, downloading only those missing from the store.
+
+    Returns the code of every kernel together with the number of kernels that had to be downloaded.
+    """
+    codes: dict[UUID, str] = {}
+    missing: list[KernelSummary] = []
+    for kernel in kernels:
+        stored = store.get_kernel(kernel.id)
+        code = store.get_blob(stored.code_hash) if stored is not None and stored.code_hash is not None else None
+        if code is None:
+            missing.append(kernel)
+        else:
+            codes[kernel.id] = code
+
+    if len(missing) > 1 and len(missing) > len(kernels) // 2:
+        # Most of the session is not stored yet - one bulk request is cheaper than many small ones
+        missing_ids = {k.id for k in missing}
+        for krn in itr.chain.from_iterable(await get_session_kernels(conn, str(session_id))):
+            if krn.id in missing_ids:
+                codes[krn.id] = krn.code
+    elif missing:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(kernel: KernelSummary) -> tuple[UUID, str]:
+            async with semaphore:
+                details = await get_kernel_details(conn, str(session_id), str(kernel.id))
+                return kernel.id, details.code
+
+        codes.update(await asyncio.gather(*[fetch(k) for k in missing]))
+
+    return codes, len(missing)
+
+
+async def sync_session(
+    conn: Connection,
+    store: KernelStore,
+    session: AgentSessionSummary,
+    mirror: bool = False,
+    concurrency: int = 8,
+) -> int:
+    """Refresh kernel metadata of a single session, returns the number of downloaded kernel bodies.
+
+    With ``mirror`` the code of all kernels and the session's extra are stored as well,
+    so that the session can later be browsed without access to the service.
+    """
+    record = store.get_session_record(session.id)
+    refcode_hash = record.refcode_hash if record is not None else None
+    if refcode_hash is None:
+        # The problem definition never changes, so it is downloaded only once.
+        refcode = await get_session_refcode(conn, str(session.id))
+        refcode_hash = store.put_blob(refcode) if refcode else None
+
+    kernels = await get_session_kernel_summaries(conn, str(session.id), session.status)
+
+    codes: dict[UUID, str] = {}
+    downloaded = 0
+    extra = record.extra if record is not None else None
+    if mirror:
+        codes, downloaded = await fetch_kernel_code(
+            conn, store, session.id, list(itr.chain.from_iterable(kernels)), concurrency
+        )
+        # Extras are derived from the best attempt only
+        if session.best_attempt_id is not None and (
+            extra is None or record is None or record.best_attempt_id != session.best_attempt_id
+        ):
+            extra = await fetch_session_extra(conn, session.id)
+
+    store.put_kernels(
+        StoredKernel.from_kernel(
+            kernel,
+            session.id,
+            attempt_num + 1,
+            store.put_blob(codes[kernel.id]) if kernel.id in codes else None,
+            session.target_hardware,
+        )
+        for attempt_num, attempt_kernels in enumerate(kernels)
+        for kernel in attempt_kernels
+    )
+    # A plain refresh must not forget that the kernels' code was stored by an earlier mirror
+    mirrored = mirror or (record is not None and record.mirrored)
+    store.put_session_record(
+        SessionRecord.from_summary(session, refcode_hash, extra, mirrored, service_scope(conn.base_url))
+    )
+    return downloaded
+
+
+async def sync_sessions(
+    conn: Connection,
+    store: KernelStore,
+    sessions: list[AgentSessionSummary],
+    concurrency: int = 8,
+    force: bool = False,
+    mirror: bool = False,
+) -> list[AgentSessionSummary]:
+    """Refresh all sessions which might have changed since they were last synced.
+
+    Returns the list of sessions that were refreshed.
+    """
+    records = store.get_session_records(service_scope(conn.base_url))
+    stale = [s for s in sessions if force or (r := records.get(s.id)) is None or not r.is_up_to_date(s, mirror)]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def refresh(session: AgentSessionSummary) -> None:
+        async with semaphore:
+            await sync_session(conn, store, session, mirror, concurrency)
+
+    await asyncio.gather(*[refresh(s) for s in stale])
+    return stale
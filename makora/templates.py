@@ -0,0 +1,136 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Variants of a Python file with different values of its top-level constants.
+
+Problems and kernels commonly define their input shapes and tunables as module level
+assignments such as ``M = 1024`` or ``BLOCK_SIZE: int = 64``. A variant is rendered by
+replacing the source of the assigned values with other Python expressions, which keeps
+the rest of the file, comments included, as it is.
+"""
+
+import ast
+import itertools
+from typing import Iterable
+
+
+def split_values(text: str) -> list[str]:
+    """Split comma separated expressions, except for commas inside brackets or strings."""
+    values: list[str] = []
+    current: list[str] = []
+    depth = 0
+    quote: str | None = None
+    for char in text:
+        if quote is not None:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            values.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    values.append("".join(current).strip())
+    return [value for value in values if value]
+
+
+def check_expression(value: str) -> str:
+    try:
+        ast.parse(value, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"'{value}' is not a Python expression") from e
+    return value
+
+
+def parse_param(spec: str) -> tuple[str, list[str]]:
+    """Parse ``NAME=value,value,...`` into the name and the source of each value."""
+    name, sep, values = spec.partition("=")
+    name = name.strip()
+    if not sep or not name.isidentifier():
+        raise ValueError(f"Expected NAME=VALUE[,VALUE...], got '{spec}'")
+    expressions = [check_expression(value) for value in split_values(values)]
+    if not expressions:
+        raise ValueError(f"No values given for {name}")
+    return name, expressions
+
+
+def parameter_grid(params: dict[str, list[str]]) -> list[dict[str, str]]:
+    """All combinations of the values of every parameter, the last parameter varying fastest."""
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*(params[name] for name in names))]
+
+
+def top_level_assignments(code: str) -> dict[str, ast.expr]:
+    """Values assigned to plain names at the top level of the module, the last assignment of each name."""
+    assignments: dict[str, ast.expr] = {}
+    for node in ast.parse(code).body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            assignments[node.targets[0].id] = node.value
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value is not None:
+            assignments[node.target.id] = node.value
+    return assignments
+
+
+def _offset(lines: list[str], lineno: int, col_offset: int) -> int:
+    # Column offsets of the ast are in UTF-8 bytes
+    before = sum(len(line) for line in lines[: lineno - 1])
+    return before + len(lines[lineno - 1].encode("utf-8")[:col_offset].decode("utf-8"))
+
+
+def render_variant(code: str, values: dict[str, str]) -> str:
+    """Replace the values assigned to the given top-level names with the given expressions."""
+    assignments = top_level_assignments(code)
+    missing = [name for name in values if name not in assignments]
+    if missing:
+        raise ValueError(f"Not assigned at the top level of the file: {', '.join(missing)}")
+
+    lines = code.splitlines(keepends=True)
+    spans = []
+    for name, value in values.items():
+        node = assignments[name]
+        assert node.end_lineno is not None and node.end_col_offset is not None
+        start = _offset(lines, node.lineno, node.col_offset)
+        end = _offset(lines, node.end_lineno, node.end_col_offset)
+        spans.append((start, end, value))
+
+    # Replacing from the end keeps the offsets of earlier values valid
+    for start, end, value in sorted(spans, reverse=True):
+        code = code[:start] + value + code[end:]
+    return code
+
+
+def canonical_code(code: str) -> str:
+    """Representation of the code which ignores formatting and comments, to find equivalent variants."""
+    return ast.dump(ast.parse(code))
+
+
+def format_params(values: dict[str, str]) -> str:
+    return ", ".join(f"{name}={value}" for name, value in values.items())
+
+
+def unique_variants(code: str, combinations: Iterable[dict[str, str]]) -> list[tuple[dict[str, str], str]]:
+    """Render every combination, keeping only the first of those rendering to equivalent code."""
+    seen: set[str] = set()
+    variants = []
+    for values in combinations:
+        rendered = render_variant(code, values)
+        key = canonical_code(rendered)
+        if key not in seen:
+            seen.add(key)
+            variants.append((values, rendered))
+    return variants
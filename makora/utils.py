@@ -16,6 +16,7 @@
 import os
 import sys
 import types
+import subprocess
 from typing import Any, Callable, Iterable, TYPE_CHECKING, Protocol, overload, TypeVar
 from typing_extensions import Self
 from types import TracebackType, EllipsisType
@@ -173,6 +174,29 @@ def get_rich_console() -> Console:
     )
 
 
+def spawn_detached(module: str, env: dict[str, str] | None = None) -> bool:
+    """Run ``python -m <module>`` in a process which outlives this one, returns whether it started."""
+    kwargs: dict[str, Any] = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", module],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            env=env,
+            **kwargs,
+        )
+    except OSError:
+        return False
+    return True
+
+
 class _dummy_context:
     def __init__(self, value: Any = ...) -> None:
         self.value = value
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import hashlib
 from pathlib import Path
 from typing import overload, Literal
 from datetime import datetime
@@ -94,6 +95,13 @@ def get_identity_file(create: bool = False) -> Path | None:
     return file
 
 
+def service_scope(base_url: str) -> str:
+    """Digest of the service and the account, to keep data of other deployments or users apart."""
+    creds = get_current_credentials()
+    account = creds.user if creds is not None and creds.user else ""
+    return hashlib.sha256(f"{base_url.rstrip('/')}\n{account}".encode("utf-8")).hexdigest()[:16]
+
+
 def get_current_credentials() -> Credentials | None:
     file = get_identity_file(create=False)
     if file is None:
@@ -36,6 +36,8 @@ class Connection:
 
         self.base_url = base_url
         self.client: aiohttp.ClientSession | None = None
+        self.requests_made = 0
+        self.bytes_received = 0
 
     async def __aenter__(self) -> Self:
         client = aiohttp.ClientSession(base_url=self.base_url, raise_for_status=False)
@@ -62,6 +64,10 @@ class Connection:
         await client.__aenter__()
         self.client = client
 
+    def _account(self, reply: bytes) -> None:
+        self.requests_made += 1
+        self.bytes_received += len(reply)
+
     async def post(
         self,
         endpoint: str,
@@ -93,7 +99,8 @@ class Connection:
                 **kwargs,  # type: ignore[arg-type,unused-ignore]
             ) as resp:
                 await map_errors(resp)
-                repl = await resp.text()
+                repl = await resp.read()
+                self._account(repl)
                 return reply_format.model_validate_json(repl)
         except aiohttp.ServerDisconnectedError:
             await self._reconnect()
@@ -102,7 +109,8 @@ class Connection:
                 **kwargs,  # type: ignore[arg-type,unused-ignore]
             ) as resp:
                 await map_errors(resp)
-                repl = await resp.text()
+                repl = await resp.read()
+                self._account(repl)
                 return reply_format.model_validate_json(repl)
 
     async def get(self, endpoint: str, reply_format: type[T], token: str | None = None) -> T:
@@ -116,13 +124,15 @@ class Connection:
         try:
             async with self.client.get(endpoint, headers=headers) as resp:
                 await map_errors(resp)
-                repl = await resp.text()
+                repl = await resp.read()
+                self._account(repl)
                 return reply_format.model_validate_json(repl)
         except aiohttp.ServerDisconnectedError:
             await self._reconnect()
             async with self.client.get(endpoint, headers=headers) as resp:
                 await map_errors(resp)
-                repl = await resp.text()
+                repl = await resp.read()
+                self._account(repl)
                 return reply_format.model_validate_json(repl)
 
 
@@ -13,9 +13,10 @@
 # limitations under the License.
 
 
+import asyncio
 from typing import Any
 
-from aiohttp import ClientResponse
+from aiohttp import ClientConnectionError, ClientResponse
 
 
 class HttpError(ValueError):
@@ -44,3 +45,20 @@ async def map_errors(resp: ClientResponse) -> None:
             raise Http404(str(resp.real_url), data)
         case _:
             raise HttpError(resp.status, str(resp.real_url), data)
+
+
+def is_unavailable_error(exc: BaseException) -> bool:
+    """Whether the error means the service could not be reached, as opposed to rejecting the request."""
+    if isinstance(exc, HttpError):
+        return exc.code >= 500
+    return isinstance(exc, (ClientConnectionError, asyncio.TimeoutError))
+
+
+def describe_error(exc: BaseException) -> str:
+    """Short, single line description of an error, e.g. for a table cell."""
+    if isinstance(exc, HttpError):
+        data = exc.args[2] if len(exc.args) > 2 else None
+        if isinstance(data, dict) and "detail" in data:
+            data = data["detail"]
+        return f"HTTP {exc.code}: {data}" if data else f"HTTP {exc.code}"
+    return str(exc) or type(exc).__name__
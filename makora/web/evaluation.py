@@ -0,0 +1,229 @@
+# Copyright 2026 Makora Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+import hashlib
+from typing import NamedTuple
+
+from pydantic import TypeAdapter
+
+from .conn import Connection
+from .auth import get_current_credentials, service_scope
+from ..config import get_generate_base_url
+from ..models.openapi import (
+    BaselineBenchmarkResult,
+    EvalRefMode,
+    EvaluateKernelRequest,
+    KernelEvaluation,
+    KernelEvaluationDetails,
+    KernelEvaluationStatus,
+    KernelProfilingDetails,
+    ProfileKernelRequest,
+    ProfilingMode,
+)
+from ..models.internal import TargetDevice
+from ..store.cache import get_resource_cache
+
+
+#: How long results of evaluating the same code are reused by default
+EVALUATION_CACHE_MAX_AGE = 24 * 3600.0
+
+_baseline_list = TypeAdapter(list[BaselineBenchmarkResult])
+
+
+def normalize_code(code: str) -> str:
+    """Code with its line endings normalized, so that checkouts on different platforms are identical."""
+    return code.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _result_cache_key(
+    base_url: str, reference_code: str, optimized_code: str, target_device: TargetDevice, mode: str
+) -> str:
+    ref_digest = hashlib.sha256(normalize_code(reference_code).encode("utf-8")).hexdigest()
+    opt_digest = hashlib.sha256(normalize_code(optimized_code).encode("utf-8")).hexdigest()
+    return f"{service_scope(base_url)}:{ref_digest}:{opt_digest}:{target_device.to_api_device()}:{mode}"
+
+
+def get_cached_evaluation(
+    reference_code: str,
+    optimized_code: str,
+    target_device: TargetDevice,
+    max_age: float = EVALUATION_CACHE_MAX_AGE,
+    url: str | None = None,
+) -> KernelEvaluationDetails | None:
+    """Get a recent successful evaluation of identical code by the same service, if there was one."""
+    key = _result_cache_key(get_generate_base_url(url), reference_code, optimized_code, target_device, "evaluate")
+    cached = get_resource_cache().namespace("evaluation").get(key, max_age)
+    return KernelEvaluationDetails.model_validate_json(cached) if cached is not None else None
+
+
+def get_cached_profile(
+    reference_code: str,
+    optimized_code: str,
+    target_device: TargetDevice,
+    mode: ProfilingMode,
+    max_age: float = EVALUATION_CACHE_MAX_AGE,
+    url: str | None = None,
+) -> KernelProfilingDetails | None:
+    """Get a recent successful profile of identical code in the same mode by the same service, if there was one."""
+    key = _result_cache_key(get_generate_base_url(url), reference_code, optimized_code, target_device, mode.value)
+    cached = get_resource_cache().namespace("profile").get(key, max_age)
+    return KernelProfilingDetails.model_validate_json(cached) if cached is not None else None
+
+
+def _baseline_cache_key(base_url: str, reference_code: str, target_device: TargetDevice) -> str:
+    digest = hashlib.sha256(normalize_code(reference_code).encode("utf-8")).hexdigest()
+    return f"{service_scope(base_url)}:{digest}:{target_device.to_api_device()}"
+
+
+def get_cached_baselines(
+    reference_code: str,
+    target_device: TargetDevice,
+    max_age: float = EVALUATION_CACHE_MAX_AGE,
+    url: str | None = None,
+) -> dict[EvalRefMode, BaselineBenchmarkResult]:
+    """Timings of the reference in every mode the same service recently benchmarked it in on the device."""
+    key = _baseline_cache_key(get_generate_base_url(url), reference_code, target_device)
+    cached = get_resource_cache().namespace("baselines").get(key, max_age)
+    if cached is None:
+        return {}
+    return {baseline.mode: baseline for baseline in _baseline_list.validate_json(cached)}
+
+
+def _cache_baselines(
+    base_url: str, reference_code: str, target_device: TargetDevice, evaluation: KernelEvaluation
+) -> None:
+    result = evaluation.benchmarking_result
+    if result is None or not result.ref_times:
+        return
+
+    # The service does not necessarily benchmark the same modes every time, keep the ones seen before
+    key = _baseline_cache_key(base_url, reference_code, target_device)
+    cached = get_resource_cache().namespace("baselines").get(key, EVALUATION_CACHE_MAX_AGE)
+    baselines = {baseline.mode: baseline for baseline in _baseline_list.validate_json(cached)} if cached else {}
+    baselines.update({baseline.mode: baseline for baseline in result.ref_times})
+    get_resource_cache().namespace("baselines").put(
+        key,
+        _baseline_list.dump_json(list(baselines.values()), warnings=False),
+    )
+
+
+async def evaluate_kernel(
+    conn: Connection, reference_code: str, optimized_code: str, target_device: TargetDevice, name: str = ""
+) -> KernelEvaluationDetails:
+    creds = get_current_credentials()
+    if creds is None:
+        raise RuntimeError("User needs to be logged in")
+
+    hardware_provider, hardware_model = target_device.to_api_device().split(":")
+    request = EvaluateKernelRequest(
+        reference_code=reference_code,
+        optimized_code=optimized_code,
+        name=name,
+        origin="user",
+        extras={},
+    )
+
+    details = await conn.post(
+        f"kernel-evaluation/evaluation/{hardware_provider}/{hardware_model}",
+        request,
+        reply_format=KernelEvaluationDetails,
+        token=creds.token,
+    )
+    if details.evaluation is not None and details.evaluation.status == KernelEvaluationStatus.COMPLETED:
+        # Failures might be transient, only successful results are worth reusing
+        get_resource_cache().namespace("evaluation").put(
+            _result_cache_key(conn.base_url, reference_code, optimized_code, target_device, "evaluate"),
+            details.model_dump_json(warnings=False).encode("utf-8"),
+        )
+        _cache_baselines(conn.base_url, reference_code, target_device, details.evaluation)
+    return details
+
+
+async def profile_kernel(
+    conn: Connection,
+    reference_code: str,
+    optimized_code: str,
+    target_device: TargetDevice,
+    mode: ProfilingMode = ProfilingMode.full,
+    name: str = "",
+) -> KernelProfilingDetails:
+    creds = get_current_credentials()
+    if creds is None:
+        raise RuntimeError("User needs to be logged in")
+
+    hardware_provider, hardware_model = target_device.to_api_device().split(":")
+    request = ProfileKernelRequest(
+        reference_code=reference_code,
+        optimized_code=optimized_code,
+        name=name,
+        origin="user",
+        extras={},
+        mode=mode,
+    )
+
+    details = await conn.post(
+        f"kernel-evaluation/profile/{hardware_provider}/{hardware_model}",
+        request,
+        reply_format=KernelProfilingDetails,
+        token=creds.token,
+    )
+    run = details.kernel_profiling_run
+    if run is not None and run.status == KernelEvaluationStatus.COMPLETED:
+        get_resource_cache().namespace("profile").put(
+            _result_cache_key(conn.base_url, reference_code, optimized_code, target_device, mode.value),
+            details.model_dump_json(warnings=False).encode("utf-8"),
+        )
+    return details
+
+
+class EvaluationRun(NamedTuple):
+    """One of repeated evaluations of the same code."""
+
+    #: Position in the order of submission
+    order: int
+    evaluation: KernelEvaluation | None = None
+    error: Exception | None = None
+    #: Whether the result was taken from the local cache rather than measured now
+    cached: bool = False
+
+    @property
+    def successful(self) -> bool:
+        return self.evaluation is not None and self.evaluation.status == KernelEvaluationStatus.COMPLETED
+
+
+async def evaluate_repeatedly(
+    conn: Connection,
+    reference_code: str,
+    optimized_code: str,
+    target_device: TargetDevice,
+    repeat: int,
+    semaphore: asyncio.Semaphore,
+    name: str = "",
+) -> list[EvaluationRun]:
+    """Evaluate the same code ``repeat`` times, with at most as many concurrent requests as the semaphore allows.
+
+    Runs are returned in the order they were submitted.
+    """
+
+    async def run(index: int) -> EvaluationRun:
+        async with semaphore:
+            try:
+                details = await evaluate_kernel(conn, reference_code, optimized_code, target_device, name)
+            except Exception as e:
+                return EvaluationRun(index, error=e)
+        return EvaluationRun(index, evaluation=details.evaluation)
+
+    return list(await asyncio.gather(*(run(i) for i in range(repeat))))
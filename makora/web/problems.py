@@ -13,12 +13,14 @@
 # limitations under the License.
 
 
+import hashlib
 from asyncio import sleep
 from datetime import datetime
 from typing import Callable
 
 from .conn import Connection
-from .auth import get_current_credentials
+from .auth import get_current_credentials, service_scope
+from ..config import get_generate_base_url
 from ..models.openapi import (
     ProblemDescriptionCode,
     ProblemCreationRequest,
@@ -27,6 +29,34 @@ from ..models.openapi import (
     StepStatus,
 )
 from ..models.internal import TargetDevice
+from ..store.cache import get_resource_cache
+
+
+#: How long a successful validation of the same code is reused
+VALIDATION_CACHE_MAX_AGE = 24 * 3600.0
+
+
+def _validation_cache_key(base_url: str, code: str, problem_name: str, target_device: TargetDevice, fix: bool) -> str:
+    digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    return f"{service_scope(base_url)}:{digest}:{target_device.to_api_device()}:{int(fix)}:{problem_name}"
+
+
+def get_cached_validation(
+    code: str,
+    problem_name: str,
+    target_device: TargetDevice,
+    fix: bool = False,
+    max_age: float = VALIDATION_CACHE_MAX_AGE,
+    url: str | None = None,
+) -> ProblemValidationTaskStatus | None:
+    """Get the result of a recent successful validation of identical code by the same service, if there was one.
+
+    The problem it created only exists for that service and account.
+    """
+    cache = get_resource_cache().namespace("validation")
+    key = _validation_cache_key(get_generate_base_url(url), code, problem_name, target_device, fix)
+    cached = cache.get(key, max_age)
+    return ProblemValidationTaskStatus.model_validate_json(cached) if cached is not None else None
 
 
 async def submit_custom_problem(
@@ -95,4 +125,10 @@ async def submit_and_poll_validation(
 ) -> ProblemValidationTaskStatus:
     task_id = await submit_custom_problem(conn, code, target_device, problem_name, fix)
     status = await poll_validation_task(conn, task_id, poll_interval, on_progress)
+    if status.status == StepStatus.completed:
+        # Failures might be transient, only successful results are worth reusing
+        get_resource_cache().namespace("validation").put(
+            _validation_cache_key(conn.base_url, code, problem_name, target_device, fix),
+            status.model_dump_json(warnings=False).encode("utf-8"),
+        )
     return status
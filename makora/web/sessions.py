@@ -13,13 +13,17 @@
 # limitations under the License.
 
 
+import hashlib
 import textwrap
 from uuid import UUID
 
+from pydantic import TypeAdapter
+
 from .errors import Http404, HttpError
 from .conn import Connection
-from .auth import get_current_credentials
-from ..models.internal import TargetDevice, SessionExtra
+from .auth import get_current_credentials, service_scope
+from ..models.internal import TargetDevice, SessionExtra, KernelSummary, SessionKernelSummaries, TERMINAL_STATUSES
+from ..store.cache import get_default_ttl, get_resource_cache
 from ..models.openapi import (
     KernelLanguage,
     PredefinedKernelGenerationRequest,
@@ -29,8 +33,12 @@ from ..models.openapi import (
     AgentSessions,
     AgentSessionSummary,
     SessionKernels,
+    StepStatus,
     EvaluatedKernel,
+    KernelEvaluationDetails,
     UserInstruction,
+    ListResultAgentLogEntryOut,
+    ListResultCommandOut,
 )
 
 
@@ -111,12 +119,26 @@ async def resolve_session(sessions: list[AgentSessionSummary], session_id: str)
     return matches[0]
 
 
-async def get_user_sessions(conn: Connection) -> list[AgentSessionSummary]:
-    """Fetch a list of sessions belonging to the current user."""
+_session_list = TypeAdapter(list[AgentSessionSummary])
+_kernel_summaries = TypeAdapter(list[list[KernelSummary]])
+
+
+async def get_user_sessions(conn: Connection, max_age: float | None = None) -> list[AgentSessionSummary]:
+    """Fetch a list of sessions belonging to the current user.
+
+    If ``max_age`` is given, a list fetched at most that many seconds ago may be returned instead.
+    """
     creds = get_current_credentials()
     if creds is None:
         raise RuntimeError("User needs to be logged in")
 
+    cache = get_resource_cache().namespace("sessions")
+    # Sessions of other deployments or accounts must not resolve prefixes given for this one
+    account = creds.user or hashlib.sha256(creds.token.encode("utf-8")).hexdigest()
+    cache_key = f"{service_scope(conn.base_url)}:{account}"
+    if max_age is not None and (cached := cache.get(cache_key, max_age)) is not None:
+        return _session_list.validate_json(cached)
+
     ret: list[AgentSessionSummary] = []
 
     offset = 0
@@ -130,9 +152,22 @@ async def get_user_sessions(conn: Connection) -> list[AgentSessionSummary]:
         if offset >= repl.total:
             break
 
+    cache.put(cache_key, _session_list.dump_json(ret, warnings=False))
     return ret
 
 
+async def find_session(conn: Connection, session_id: str) -> AgentSessionSummary | None:
+    """Resolve a session ID prefix, using a recently fetched session list when available.
+
+    Only the IDs are needed for resolution, so a cached list is good enough unless the
+    session was created after it was fetched - in which case the list is fetched again.
+    """
+    match = await resolve_session(await get_user_sessions(conn, max_age=get_default_ttl()), session_id)
+    if match is None:
+        match = await resolve_session(await get_user_sessions(conn), session_id)
+    return match
+
+
 async def get_session_kernels(conn: Connection, session_id: str) -> list[list[EvaluatedKernel]]:
     creds = get_current_credentials()
     if creds is None:
@@ -156,6 +191,59 @@ async def get_session_kernels(conn: Connection, session_id: str) -> list[list[Ev
     return ret
 
 
+async def get_session_kernel_summaries(
+    conn: Connection,
+    session_id: str,
+    status: StepStatus | None = None,
+    max_age: float | None = None,
+) -> list[list[KernelSummary]]:
+    """Same as :func:`get_session_kernels` but without the kernels' code.
+
+    Kernels of a session in a terminal ``status`` cannot change anymore and are cached
+    indefinitely. Cached kernels are only returned if ``max_age`` is given though, and
+    unless immutable, only if fetched at most ``max_age`` seconds ago.
+    """
+    creds = get_current_credentials()
+    if creds is None:
+        raise RuntimeError("User needs to be logged in")
+
+    cache = get_resource_cache().namespace("kernels")
+    if max_age is not None and (cached := cache.get(session_id, max_age)) is not None:
+        return _kernel_summaries.validate_json(cached)
+
+    ret: list[list[KernelSummary]] = []
+
+    repl = await conn.get(
+        f"agent-session/{session_id}/kernels",
+        reply_format=SessionKernelSummaries,
+        token=creds.token,
+    )
+
+    sorted_attempts = sorted(repl.attempts, key=lambda a: a.attempt_number)
+    for attempt in sorted_attempts:
+        if not attempt.kernels:
+            continue
+
+        ret.append(attempt.kernels)
+
+    cache.put(session_id, _kernel_summaries.dump_json(ret), immutable=status in TERMINAL_STATUSES)
+    return ret
+
+
+async def get_kernel_details(conn: Connection, session_id: str, kernel_id: str) -> KernelEvaluationDetails:
+    """Fetch a single kernel of a session, including its code and evaluation."""
+    creds = get_current_credentials()
+    if creds is None:
+        raise RuntimeError("User needs to be logged in")
+
+    repl = await conn.get(
+        f"agent-session/{session_id}/kernels/{kernel_id}",
+        reply_format=KernelEvaluationDetails,
+        token=creds.token,
+    )
+    return repl
+
+
 async def stop_instruction(conn: Connection, instruction_id: str) -> UserInstruction:
     creds = get_current_credentials()
     if creds is None:
@@ -192,3 +280,82 @@ async def get_session(conn: Connection, session_id: str) -> AgentSession:
         token=creds.token,
     )
     return repl
+
+
+async def refresh_session_summary(conn: Connection, session: AgentSessionSummary) -> AgentSessionSummary:
+    """Update the status and best attempt of a listed session, without listing all sessions again."""
+    full = await get_session(conn, str(session.id))
+    best_attempt_id = full.best_kernel.attempt_id if full.best_kernel is not None else session.best_attempt_id
+    return session.model_copy(
+        update={"status": full.status, "best_attempt_id": best_attempt_id, "deleted_at": full.deleted_at}
+    )
+
+
+async def get_session_refcode(conn: Connection, session_id: str) -> str | None:
+    """Get the reference code of a session, which never changes once the session is created."""
+    cache = get_resource_cache().namespace("refcode")
+    if (cached := cache.get(session_id)) is not None:
+        return cached.decode("utf-8")
+
+    session = await get_session(conn, session_id)
+    code = session.request.problem_description_code.code
+    if code:
+        cache.put(session_id, code.encode("utf-8"), immutable=True)
+    return code
+
+
+def find_cached_refcode(session_id: str) -> str | None:
+    """Get a cached refcode by session ID prefix without contacting the service.
+
+    Prefixes shorter than the 8 characters shown in listings are not resolved locally,
+    as they might as well refer to a session which is not cached.
+    """
+    if len(session_id) < 8:
+        return None
+
+    cache = get_resource_cache().namespace("refcode")
+    keys = cache.find_keys(session_id)
+    if len(keys) != 1:
+        return None
+    cached = cache.get(keys[0])
+    return cached.decode("utf-8") if cached is not None else None
+
+
+async def get_attempt_logs(
+    conn: Connection,
+    session_id: str,
+    attempt_id: str,
+    offset: int = 0,
+    limit: int = 500,
+) -> ListResultAgentLogEntryOut:
+    """Fetch a single page of agent logs for the given attempt, starting at ``offset``."""
+    creds = get_current_credentials()
+    if creds is None:
+        raise RuntimeError("User needs to be logged in")
+
+    repl = await conn.get(
+        f"agent-session/{session_id}/attempt/{attempt_id}/logs?offset={offset}&limit={limit}",
+        reply_format=ListResultAgentLogEntryOut,
+        token=creds.token,
+    )
+    return repl
+
+
+async def get_attempt_commands(
+    conn: Connection,
+    session_id: str,
+    attempt_id: str,
+    offset: int = 0,
+    limit: int = 500,
+) -> ListResultCommandOut:
+    """Fetch a single page of the command log for the given attempt, starting at ``offset``."""
+    creds = get_current_credentials()
+    if creds is None:
+        raise RuntimeError("User needs to be logged in")
+
+    repl = await conn.get(
+        f"agent-session/{session_id}/attempt/{attempt_id}/command-log?offset={offset}&limit={limit}",
+        reply_format=ListResultCommandOut,
+        token=creds.token,
+    )
+    return repl
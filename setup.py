@@ -104,6 +104,7 @@ setup(
         "PyYAML",
         "tabulate",
         "pydantic[email]",
+        "numpy",
     ],
     extras_require={
         "dev": [